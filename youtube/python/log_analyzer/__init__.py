@@ -1,2 +1,12 @@
 # Package initialization file
 __version__ = "1.0.0"
+
+def __getattr__(name):
+    # Submodules are imported on first access, so `import log_analyzer` stays cheap
+    import importlib
+    try:
+        return importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -0,0 +1,4 @@
+# python -m log_analyzer <file_path> [options]
+from .main import main
+
+main()
@@ -0,0 +1,2 @@
+# Throughput benchmarks and a synthetic log generator.
+# Run from the directory above log_analyzer, e.g. python -m log_analyzer.benchmarks.run
@@ -0,0 +1,167 @@
+"""Deterministic generator of log4j-style logs shaped like logs.text.
+
+    python -m log_analyzer.benchmarks.generate bench.log --size 10MB --levels INFO=60,DEBUG=20,WARN=12,ERROR=8 --cardinality 5000 --multiline 0.02
+"""
+import argparse
+import random
+import re
+from datetime import datetime, timedelta
+
+SIZES = {'10MB': 10 * 10**6, '1GB': 10**9, '10GB': 10 * 10**9}  # Standard benchmark sizes
+DEFAULT_LEVELS = {'INFO': 60, 'DEBUG': 20, 'WARN': 12, 'ERROR': 8}
+DEFAULT_CARDINALITY = 5000  # Distinct users, record IDs and cache keys
+DEFAULT_SEED = 42
+DEFAULT_MULTILINE = 0.02  # Fraction of records followed by a stack trace
+START_TIME = datetime(2025, 7, 30, 0, 0, 0)
+WRITE_BATCH = 4096  # Lines joined per write
+
+_SIZE_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*(B|KB|MB|GB)?$', re.IGNORECASE)
+_UNITS = {'B': 1, 'KB': 10**3, 'MB': 10**6, 'GB': 10**9}
+
+# (thread prefix, logger, message template) per level; {v} is a high-cardinality
+# value, {n} a small number, and {r} a reason drawn from REASONS
+TEMPLATES = {
+    'INFO': [
+        ('main', 'com.example.Application', 'Application started successfully.'),
+        ('main', 'com.example.Application', 'Processing complete.'),
+        ('http-worker', 'com.example.UserService', "User 'user{v}' logged in."),
+        ('http-worker', 'com.example.RequestHandler', 'Request {v} completed in {n} ms.'),
+    ],
+    'DEBUG': [
+        ('http-worker', 'com.example.UserService', "User 'user{v}' requested data."),
+        ('http-worker', 'com.example.CacheManager', 'Cache lookup for key session:{v} took {n} ms.'),
+    ],
+    'WARN': [
+        ('scheduler-thread', 'com.example.ResourceMonitor', 'Disk usage exceeding {n}% on /var/log. Consider cleanup.'),
+        ('data-processor', 'com.example.DataProcessor', 'Slow query on table orders: {n} ms.'),
+    ],
+    'ERROR': [
+        ('data-processor', 'com.example.DataProcessor', 'Failed to process record ID: {v}. Reason: {r}.'),
+        ('http-worker', 'com.example.RemoteClient', 'Connection to db-{n}.internal timed out after 3000 ms.'),
+    ],
+}
+REASONS = ('NullPointerException in data parsing', 'timeout', 'invalid checksum', 'connection reset')
+THREADS_PER_POOL = 8
+# Exceptions of the stack traces; frames name the record's logger
+EXCEPTIONS = ('java.lang.NullPointerException', 'java.net.SocketTimeoutException: Read timed out',
+              'java.lang.IllegalStateException: invalid checksum', 'java.io.IOException: Connection reset by peer')
+MAX_FRAMES = 12
+
+def parse_size(value):
+    """Parse '10MB', '1GB' or a byte count into bytes (decimal units)."""
+    match = _SIZE_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid size '{value}', expected e.g. 10MB, 1GB or 10GB")
+    number, unit = match.groups()
+    return int(float(number) * _UNITS[(unit or 'B').upper()])
+
+def parse_levels(value):
+    """Parse 'INFO=60,DEBUG=20,...' into {LEVEL: weight}."""
+    levels = {}
+    for part in value.split(','):
+        level, _, weight = part.partition('=')
+        level = level.strip().upper()
+        if level not in TEMPLATES:
+            raise ValueError(f"Unknown level '{level}', expected one of: {', '.join(TEMPLATES)}")
+        try:
+            levels[level] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {level}: '{weight}'")
+    if not any(weight > 0 for weight in levels.values()):
+        raise ValueError("At least one level needs a positive weight")
+    return levels
+
+def stack_trace(rng, logger):
+    """Return the lines of a Java stack trace thrown in logger's class."""
+    class_name = logger.rsplit('.', 1)[-1]
+    lines = [f"{EXCEPTIONS[rng.randrange(len(EXCEPTIONS))]}\n"]
+    for depth in range(rng.randrange(2, MAX_FRAMES + 1)):
+        lines.append(f"\tat {logger}.step{depth}({class_name}.java:{rng.randrange(20, 400)})\n")
+    lines.append("\tat java.lang.Thread.run(Thread.java:750)\n")
+    return lines
+
+def generate_lines(levels=None, cardinality=DEFAULT_CARDINALITY, seed=DEFAULT_SEED, multiline=DEFAULT_MULTILINE):
+    """Yield log lines (with newlines) forever, in timestamp order.
+
+    A `multiline` fraction of the records is followed by the lines of a
+    stack trace. The same seed, level mix, cardinality and fraction always
+    yield the same lines.
+    """
+    rng = random.Random(seed)
+    levels = levels or DEFAULT_LEVELS
+    choices = []  # (level, thread prefix, logger, template) with their weights
+    weights = []
+    for level, weight in levels.items():
+        templates = TEMPLATES[level]
+        for thread, logger, template in templates:
+            choices.append((f"{level:<5}", thread, logger, template))
+            weights.append(weight / len(templates))
+    cumulative = []
+    total = 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+
+    batch = 1024
+    moment = START_TIME
+    second = moment.strftime('%Y-%m-%d %H:%M:%S')
+    millis = 0
+    while True:
+        picks = rng.choices(choices, cum_weights=cumulative, k=batch)
+        for level, thread, logger, template in picks:
+            millis += rng.randrange(1, 40)
+            if millis >= 1000:
+                moment += timedelta(seconds=millis // 1000)
+                millis %= 1000
+                second = moment.strftime('%Y-%m-%d %H:%M:%S')
+            if thread != 'main':
+                thread = f"{thread}-{rng.randrange(THREADS_PER_POOL)}"
+            message = template.format(v=rng.randrange(cardinality), n=rng.randrange(100),
+                                      r=REASONS[rng.randrange(len(REASONS))])
+            yield f"{second},{millis:03d} {level} [{thread}] {logger} - {message}\n"
+            if multiline and rng.random() < multiline:
+                yield from stack_trace(rng, logger)
+
+def write_log(path, size, levels=None, cardinality=DEFAULT_CARDINALITY, seed=DEFAULT_SEED,
+              multiline=DEFAULT_MULTILINE):
+    """Write whole lines to path until it holds at least `size` bytes; return (bytes, lines)."""
+    written = 0
+    count = 0
+    lines = generate_lines(levels, cardinality, seed, multiline)
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        while written < size:
+            chunk = []
+            for line in lines:
+                chunk.append(line)
+                written += len(line)  # The generated text is ASCII
+                if written >= size or len(chunk) == WRITE_BATCH:
+                    break
+            file.write(''.join(chunk))
+            count += len(chunk)
+    return written, count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic log4j-style log.")
+    parser.add_argument('path', help="output file")
+    parser.add_argument('--size', default='10MB', help="target size, e.g. 10MB, 1GB or 10GB (default 10MB)")
+    parser.add_argument('--levels', help="level mix as LEVEL=WEIGHT pairs (default INFO=60,DEBUG=20,WARN=12,ERROR=8)")
+    parser.add_argument('--cardinality', type=int, default=DEFAULT_CARDINALITY,
+                        help=f"distinct users, record IDs and keys (default {DEFAULT_CARDINALITY})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"random seed (default {DEFAULT_SEED})")
+    parser.add_argument('--multiline', type=float, default=DEFAULT_MULTILINE,
+                        help=f"fraction of records followed by a stack trace (default {DEFAULT_MULTILINE})")
+    args = parser.parse_args(argv)
+    try:
+        size = parse_size(args.size)
+        levels = parse_levels(args.levels) if args.levels else None
+        if args.cardinality < 1:
+            raise ValueError("--cardinality must be a positive integer")
+        if not 0 <= args.multiline <= 1:
+            raise ValueError("--multiline must be a fraction between 0 and 1")
+    except ValueError as e:
+        parser.error(str(e))
+    written, count = write_log(args.path, size, levels, args.cardinality, args.seed, args.multiline)
+    print(f"Wrote {count} lines ({written} bytes) to {args.path}")
+
+if __name__ == "__main__":
+    main()
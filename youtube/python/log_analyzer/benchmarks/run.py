@@ -0,0 +1,207 @@
+"""Measure MB/s, lines/s and peak RSS of every CLI command and parser path.
+
+    python -m log_analyzer.benchmarks.run bench.log --output after.json --compare before.json
+
+Each case runs in a fresh interpreter, so its peak RSS is its own; the best
+of --repeat runs is reported. A missing log file is generated first. The
+startup cases run on a tiny log instead, so they time interpreter start,
+imports and argument handling rather than the scan.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from .generate import parse_size, write_log
+
+# Directory holding the log_analyzer package, so `-m log_analyzer` resolves without installing
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_VERSION = 1
+STARTUP_LOG_BYTES = 4096
+
+# name -> arguments after `-m log_analyzer <file>`; --no-cache is always added
+CLI_CASES = {
+    'count': ['10'],
+    'count_mmap': ['10', '--tokenizer', 'mmap'],
+    'count_workers': ['10', '--workers', '4'],
+    'count_approx': ['10', '--approx'],
+    'count_where': ['10', '--where', 'level = ERROR and msg contains timeout'],
+    'search': ['--search', 'timeout', 'user42'],
+    'search_level': ['--search', 'timeout', 'user42', '--level_log', 'ERROR'],
+    'level_log': ['--level_log', 'ERROR'],
+    'query_json': ['--top', '10', '--search', 'timeout', '--level_log', 'ERROR', '--json'],
+    'distinct': ['--distinct'],
+    'histogram': ['--histogram', '1m', '--by', 'logger'],
+    'templates': ['10', '--templates'],
+    'sample_lines': ['10', '--sample_lines', '10000'],
+}
+
+# name -> statements run with `path` bound to the log file
+PARSER_CASES = {
+    'parser.iter_lines': 'for line in LogParser.iter_lines(path): pass',
+    'parser.read_blocks': 'for block in LogParser.read_blocks(path): pass',
+    'parser.parse_log_entry': 'for line in LogParser.iter_lines(path): LogParser.parse_log_entry(line)',
+    'parser.parse_log_record': 'for line in LogParser.iter_lines(path): LogParser.parse_log_record(line)',
+    'parser.extract_words': 'for block in LogParser.read_blocks(path): LogParser.extract_words(block)',
+    'counter.count_words': 'WordCounter(LogParser.read_blocks(path)).count_words()',
+    'tokenizer.count_words_mmap': 'tokenizer.count_words_mmap(path)',
+    'processor.get_log_table': 'LogProcessor(LogParser.iter_lines(path)).get_log_table()',
+}
+PARSER_PRELUDE = ('import sys\n'
+                  'from log_analyzer.parser import LogParser\n'
+                  'from log_analyzer.counter import WordCounter\n'
+                  'from log_analyzer.processor import LogProcessor\n'
+                  'from log_analyzer import tokenizer\n'
+                  'path = sys.argv[1]\n')
+
+# name -> arguments after `-m log_analyzer <tiny file>`; the cache is kept in a
+# temporary directory, where the cached case is answered after its first run
+STARTUP_CASES = {
+    'startup': ['3', '--no-cache'],
+    'startup_cached': ['3'],
+}
+
+def count_lines(path):
+    lines = 0
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            lines += block.count(b'\n')
+    return lines
+
+def case_command(name, path):
+    """Return the command line of a benchmark case."""
+    if name in CLI_CASES:
+        return [sys.executable, '-m', 'log_analyzer', path] + CLI_CASES[name] + ['--no-cache']
+    if name in STARTUP_CASES:
+        return [sys.executable, '-m', 'log_analyzer', path] + STARTUP_CASES[name]
+    return [sys.executable, '-c', PARSER_PRELUDE + PARSER_CASES[name], path]
+
+def measure(command, env=None):
+    """Run command in PROJECT_DIR and return (seconds, peak_rss_kb) of the process."""
+    with tempfile.TemporaryFile() as errors:
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=PROJECT_DIR, stdout=subprocess.DEVNULL, stderr=errors, env=env)
+        # wait4 reports the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode('utf-8', errors='replace').strip().splitlines()
+            raise RuntimeError(f"exit code {process.returncode}: {message[-1] if message else ''}")
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return seconds, peak_rss_kb
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_cases(path, names, repeat):
+    """Benchmark each named case on path, yielding one result dict per case."""
+    with tempfile.TemporaryDirectory() as scratch:
+        tiny_path = os.path.join(scratch, 'tiny.log')
+        write_log(tiny_path, STARTUP_LOG_BYTES)
+        # The cached startup case must not read or fill the user's cache
+        env = dict(os.environ, XDG_CACHE_HOME=scratch)
+        shapes = {}
+        for name in names:
+            case_path = tiny_path if name in STARTUP_CASES else path
+            if case_path not in shapes:
+                shapes[case_path] = (os.path.getsize(case_path), count_lines(case_path))
+            size, lines = shapes[case_path]
+            command = case_command(name, case_path)
+            result = {'name': name, 'command': command[1:]}
+            try:
+                runs = [measure(command, env) for _ in range(repeat)]
+            except RuntimeError as e:
+                result['error'] = str(e)
+                yield result
+                continue
+            seconds = min(seconds for seconds, _ in runs)
+            result.update({
+                'seconds': round(seconds, 4),
+                'mb_per_s': round(size / 10**6 / seconds, 2),
+                'lines_per_s': round(lines / seconds),
+                'peak_rss_kb': max(rss for _, rss in runs),
+            })
+            yield result
+
+def print_result(result, baseline=None):
+    if 'error' in result:
+        print(f"{result['name']:<28} failed: {result['error']}")
+        return
+    line = (f"{result['name']:<28} {result['seconds']:>9.3f} s {result['mb_per_s']:>9.2f} MB/s "
+            f"{result['lines_per_s']:>11,} lines/s {result['peak_rss_kb'] / 1024:>8.1f} MiB")
+    before = (baseline or {}).get(result['name'])
+    if before and 'seconds' in before:
+        line += f"  {before['seconds'] / result['seconds']:.2f}x vs baseline"
+    print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark log_analyzer commands and parser paths.")
+    parser.add_argument('path', nargs='?', help="log file to benchmark; generated with --size if missing")
+    parser.add_argument('--size', default='10MB', help="size of a generated log, e.g. 10MB, 1GB or 10GB (default 10MB)")
+    parser.add_argument('--cases', help="comma-separated case names (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case, the fastest is kept (default 3)")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--list', action='store_true', help="list the case names and exit")
+    args = parser.parse_args(argv)
+
+    all_cases = list(CLI_CASES) + list(PARSER_CASES) + list(STARTUP_CASES)
+    if args.list:
+        print('\n'.join(all_cases))
+        return
+    if args.path is None:
+        parser.error("the following arguments are required: path")
+    names = args.cases.split(',') if args.cases else all_cases
+    unknown = [name for name in names if name not in all_cases]
+    if unknown:
+        parser.error(f"Unknown case(s): {', '.join(unknown)}; see --list")
+    if args.repeat < 1:
+        parser.error("--repeat must be a positive integer")
+
+    path = os.path.abspath(args.path)
+    if not os.path.exists(path):
+        try:
+            size = parse_size(args.size)
+        except ValueError as e:
+            parser.error(str(e))
+        written, count = write_log(path, size)
+        print(f"Generated {count} lines ({written} bytes) in {path}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = {result['name']: result for result in json.load(file)['results']}
+
+    results = []
+    for result in run_cases(path, names, args.repeat):
+        print_result(result, baseline)
+        results.append(result)
+
+    if args.output:
+        document = {
+            'version': RESULTS_VERSION,
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'file': {'path': path, 'bytes': os.path.getsize(path), 'lines': count_lines(path)},
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+            file.write('\n')
+
+if __name__ == "__main__":
+    main()
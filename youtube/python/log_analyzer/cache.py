@@ -0,0 +1,103 @@
+import hashlib
+import os
+
+CACHE_VERSION = 2  # Bump when the output of a cached command changes
+CACHE_SUFFIX = '.out'
+MAX_CACHE_BYTES = 64 << 20  # Total size of all cached results
+MAX_ENTRIES = 512
+MAX_ENTRY_BYTES = 4 << 20  # Larger outputs (e.g. long --level_log listings) are not cached
+
+def file_identity(file_path):
+    """Return the (size, mtime_ns, inode) triple a cached result or index is valid for."""
+    st = os.stat(file_path)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+def cache_dir():
+    """Return the cache directory: $XDG_CACHE_HOME/log_analyzer, by default ~/.cache/log_analyzer."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'log_analyzer')
+
+class ResultCache:
+    """On-disk cache of command outputs, keyed by the identity of the input files and the query.
+
+    Each result is one file named by a hash of the key. Reading a result
+    refreshes its mtime, and writing one evicts the least recently used
+    results until the cache is within max_bytes and max_entries. Every
+    operation is best effort: a cache that cannot be read or written
+    behaves as if it were empty.
+    """
+
+    def __init__(self, directory=None, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_ENTRIES):
+        self.directory = directory or cache_dir()
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(paths, query):
+        """Hash the (path, size, mtime, inode) of every file together with the query arguments.
+
+        A rotated, appended or rewritten file changes its identity, so its
+        old results are never returned; they simply age out.
+        """
+        files = [[os.path.realpath(path)] + file_identity(path) for path in paths]
+        material = repr([CACHE_VERSION, files, list(query)])  # Lists of str and int repr deterministically
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """Return the cached output for key, or None."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, encoding='utf-8') as file:
+                output = file.read()
+            os.utime(entry_path)  # Mark as recently used
+        except (OSError, UnicodeDecodeError):
+            return None
+        return output
+
+    def put(self, key, output):
+        """Store output under key, then evict old results beyond the size bounds."""
+        data = output.encode('utf-8')
+        if len(data) > MAX_ENTRY_BYTES:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial result
+            import tempfile
+            descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    file.write(data)
+                os.replace(temp_path, self._entry_path(key))
+            except OSError:
+                os.unlink(temp_path)
+                raise
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove least recently used results until within max_bytes and max_entries."""
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.endswith(CACHE_SUFFIX):
+                    try:
+                        st = item.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, item.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            try:
+                os.unlink(entry_path)
+            except OSError:
+                pass  # Already evicted by a concurrent run
+            total -= size
+            count -= 1
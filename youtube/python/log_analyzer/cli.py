@@ -1,52 +1,137 @@
+from __future__ import annotations
+
+import io
+import os
+import re
 import sys
-from typing import List, Tuple, Optional
+import time
+
+from .counter import WordCounter
+from .parser import  LogEntry, LogParser
+from .timerange import find_window, normalize_bound
+from . import sources
+from .filters import all_of, as_predicate, compile_filter
+from .cache import MAX_ENTRY_BYTES, ResultCache
+from .output import OUTPUT_FORMATS, OutputBuffer, write_log_entries, write_results
+from . import tokenizer
+
+# Engines used by only some commands are imported where their command runs,
+# so that a plain count or search starts without loading them. Annotations
+# are not evaluated, so typing is not imported at run time either.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, List, Optional, Tuple
+    from .follow import LogFollower
+    from .query import QueryPlan
+
+TOKENIZERS = ('regex', 'mmap')
+CHECKPOINT_EVERY = 30.0  # Seconds between checkpoint writes in --follow mode
+DEFAULT_CAPACITY = 10000  # Counters kept by --approx
+DEFAULT_PRECISION = 14  # 2**14 HyperLogLog registers for --distinct
+# Options whose output is random or that read or write other files are never cached
+UNCACHED_OPTIONS = ('--follow', '--sample', '--sample_lines', '--save_sketch', '--merge_sketch')
+# Commands whose output has no --format other than text
+TEXT_ONLY_OPTIONS = ('--follow', '--histogram', '--sample', '--sample_lines', '--templates', '--distinct')
+
+
+class _Tee(io.TextIOBase):
+    """Text stream that writes through to another stream and keeps a copy of up to limit characters.
 
-from counter import WordCounter
-from parser import  LogEntry
+    Past the limit the copy is dropped (copy becomes None), so a long
+    output is never held in memory only to be found too large to cache.
+    """
+
+    def __init__(self, stream, limit=MAX_ENTRY_BYTES):
+        self.stream = stream
+        self.copy = io.StringIO()
+        self.limit = limit
+
+    def write(self, text):
+        if self.copy is not None:
+            if self.copy.tell() + len(text) > self.limit:
+                self.copy = None
+            else:
+                self.copy.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
 
 
 class CLIHandler:
     """Command Line Interface handler for the Log Analyzer application."""
-    
+
+    output_format = 'text'  # Set by --format for print_results and print_log_entries
+
     @staticmethod
     def print_results(result: List[Tuple[str, int]], prefix: str = "") -> None:
-        """Print results in a consistent format."""
+        """Print results in a consistent format (or as --format json/ndjson/csv)."""
+        write_results(result, CLIHandler.output_format, prefix)
+
+    @staticmethod
+    def print_log_entries(log_level: str, entries: Iterable[LogEntry]) -> None:
+        """Print log entries with timestamps and log levels (or as --format json/ndjson/csv)."""
+        write_log_entries(log_level, entries, CLIHandler.output_format)
+
+    @staticmethod
+    def print_estimates(result: List[Tuple[str, int, int]], prefix: str = "") -> None:
+        """Print sampled estimates with their 95% confidence margins."""
         if prefix:
             print(prefix)
-        
+
         if result:
-            for word, count in result:
-                print(f"{word} : {count}")
+            for key, estimate, margin in result:
+                print(f"{key} : {estimate} ± {margin}")
         else:
             print("No results found")
 
     @staticmethod
-    def print_log_entries(log_level: str, entries: List[LogEntry]) -> None:
-        """Print log entries with timestamps and log levels."""
-        print(f"Log entries for {log_level.upper()} (Timestamp, Log Level):")
-        if entries:
-            for entry in entries:
-                print(f"{entry.timestamp} : {entry.loglevel}")
+    def print_templates(log_level: str, clusters: list) -> None:
+        """Print message templates of one level with their counts and example variables."""
+        print(f"Top templates for {log_level}:")
+        if not clusters:
+            print("No templates found")
+        for cluster in clusters:
+            print(f"{cluster.level_counts[log_level]} : {cluster.pattern()}")
+            examples = cluster.examples()
+            if examples:
+                print(f"    e.g. {' | '.join(' '.join(values) for values in examples)}")
+
+    @staticmethod
+    def print_level_counts(level_counts: Dict[str, int]) -> None:
+        """Print the number of entries per log level."""
+        print("Entries per log level:")
+        if level_counts:
+            for level, count in sorted(level_counts.items()):
+                print(f"{level} : {count}")
         else:
-            print(f"No log level found for {log_level.upper()}")
+            print("No log levels found")
 
     @staticmethod
     def _parse_search_args(args: List[str]) -> Tuple[List[str], Optional[str]]:
         """Parse search arguments and optional log level."""
         search_words = []
         log_level = None
-        i = 1  # Skip '--search'
-        
+        searching = False  # Words only count once --search has been seen
+        i = 0
+
         while i < len(args):
-            if args[i] == '--level_log':
+            if args[i] == '--search':
+                searching = True
+                i += 1
+            elif args[i] == '--level_log':
                 if i + 1 < len(args):
                     log_level = args[i + 1]
                     i += 2
                 else:
                     raise ValueError("--level_log requires a value")
-            else:
+            elif args[i].startswith('--'):
+                raise ValueError(f"{args[i]} is not supported with --search")
+            elif searching:
                 search_words.append(args[i])
                 i += 1
+            else:
+                raise ValueError(f"Unexpected argument: {args[i]}")
         
         if not search_words:
             raise ValueError("Please provide words to search after --search")
@@ -70,40 +155,721 @@ class CLIHandler:
             raise
 
     @staticmethod
-    def _handle_search_command(args: List[str], lines: List[str]) -> None:
+    def _pop_option(args: List[str], flag: str) -> Tuple[Optional[str], List[str]]:
+        """Remove `flag VALUE` from args, returning the value and the remaining args."""
+        if flag not in args:
+            return None, args
+
+        i = args.index(flag)
+        if i + 1 >= len(args):
+            raise ValueError(f"{flag} requires a value")
+        return args[i + 1], args[:i] + args[i + 2:]
+
+    @staticmethod
+    def _pop_flag(args: List[str], flag: str) -> Tuple[bool, List[str]]:
+        """Remove a boolean flag from args, returning whether it was present."""
+        if flag not in args:
+            return False, args
+        return True, [arg for arg in args if arg != flag]
+
+    @staticmethod
+    def _parse_time_window(args: List[str], file_path: str, index=None) -> Tuple[int, Optional[int], List[str]]:
+        """Pop --since/--until and bisect the file, or the part a LogIndex points at, for the matching byte range."""
+        since, args = CLIHandler._pop_option(args, '--since')
+        until, args = CLIHandler._pop_option(args, '--until')
+        if since is None and until is None:
+            return 0, None, args
+
+        since = normalize_bound(since, file_path) if since else None
+        until = normalize_bound(until, file_path) if until else None
+        start, end = find_window(file_path, since, until, index)
+        return start, end, args
+
+    @staticmethod
+    def _pop_where(args: List[str], file_path: Optional[str] = None) -> Tuple[Optional[Callable[[str], bool]], List[str]]:
+        """Remove --where EXPR from args, returning the compiled filter (or None) and the remaining args."""
+        expression, args = CLIHandler._pop_option(args, '--where')
+        if expression is None:
+            return None, args
+        return compile_filter(expression, file_path), args
+
+    @staticmethod
+    def _parse_workers(value: Optional[str]) -> int:
+        """Parse and validate the --workers argument."""
+        if value is None:
+            return 1
+        try:
+            workers = int(value)
+        except ValueError:
+            raise ValueError("Invalid number provided for --workers")
+        if workers <= 0:
+            raise ValueError("--workers must be a positive integer")
+        return workers
+
+    @staticmethod
+    def _parse_tokenizer(value: Optional[str]) -> str:
+        """Parse and validate the --tokenizer argument."""
+        if value is None:
+            return 'regex'
+        if value not in TOKENIZERS:
+            raise ValueError(f"--tokenizer must be one of: {', '.join(TOKENIZERS)}")
+        return value
+
+    @staticmethod
+    def _parse_capacity(value: Optional[str]) -> int:
+        """Parse and validate the --capacity argument (counters kept by --approx)."""
+        if value is None:
+            return DEFAULT_CAPACITY
+        try:
+            capacity = int(value)
+        except ValueError:
+            raise ValueError("Invalid number provided for --capacity")
+        if capacity <= 0:
+            raise ValueError("--capacity must be a positive integer")
+        return capacity
+
+    @staticmethod
+    def _parse_precision(value: Optional[str]) -> int:
+        """Parse the --precision argument (log2 of the HyperLogLog register count)."""
+        if value is None:
+            return DEFAULT_PRECISION
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError("Invalid number provided for --precision")
+
+    @staticmethod
+    def _parse_sample_size(value: str) -> int:
+        """Parse and validate the --sample_lines argument."""
+        try:
+            size = int(value)
+        except ValueError:
+            raise ValueError("Invalid number provided for --sample_lines")
+        if size <= 0:
+            raise ValueError("--sample_lines must be a positive integer")
+        return size
+
+    @staticmethod
+    def _parse_sample_rate(value: str) -> float:
+        """Parse and validate the --sample argument (fraction of lines kept)."""
+        try:
+            rate = float(value)
+        except ValueError:
+            raise ValueError("Invalid number provided for --sample")
+        if not 0 < rate <= 1:
+            raise ValueError("--sample must be a rate in (0, 1]")
+        return rate
+
+    @staticmethod
+    def _pop_sketch_options(args: List[str]) -> Tuple[Optional[str], List[str], List[str]]:
+        """Remove --save_sketch PATH and any number of --merge_sketch PATH options."""
+        save_path, args = CLIHandler._pop_option(args, '--save_sketch')
+        merge_paths = []
+        while '--merge_sketch' in args:
+            merge_path, args = CLIHandler._pop_option(args, '--merge_sketch')
+            merge_paths.append(merge_path)
+        return save_path, merge_paths, args
+
+    @staticmethod
+    def _merge_sketches(sketch, merge_paths: List[str], save_path: Optional[str]) -> None:
+        """Fold saved sketches of the same kind into sketch, then save it if asked."""
+        for merge_path in merge_paths:
+            try:
+                sketch.merge(type(sketch).load(merge_path))
+            except (OSError, KeyError) as e:
+                raise ValueError(f"Cannot load sketch {merge_path}: {e}")
+        if save_path:
+            sketch.save(save_path)
+
+    @staticmethod
+    def _parse_interval(value: Optional[str]) -> float:
+        """Parse and validate the --interval argument (seconds between polls)."""
+        if value is None:
+            return 1.0
+        try:
+            interval = float(value)
+        except ValueError:
+            raise ValueError("Invalid number provided for --interval")
+        if interval <= 0:
+            raise ValueError("--interval must be a positive number")
+        return interval
+
+    @staticmethod
+    def _pop_word_list(args: List[str], flag: str) -> Tuple[List[str], List[str]]:
+        """Remove `flag word1 word2 ...` (up to the next --option) from args."""
+        if flag not in args:
+            return [], args
+        i = args.index(flag)
+        j = i + 1
+        while j < len(args) and not args[j].startswith('--'):
+            j += 1
+        return args[i + 1:j], args[:i] + args[j:]
+
+    @staticmethod
+    def _parse_level_args(args: List[str]) -> str:
+        """Parse the log level given after --level_log."""
+        if len(args) != 2 or args[0] != '--level_log':
+            raise ValueError("Please provide a single log level after --level_log (e.g: --level_log ERROR)")
+        return args[1]
+
+    @staticmethod
+    def _handle_search_command(args: List[str], file_path: str) -> None:
         """Handle search command with optional log level filtering."""
         try:
+            use_index, args = CLIHandler._pop_flag(args, '--index')
+            start, end, args = CLIHandler._parse_time_window(args, file_path)
+            where, args = CLIHandler._pop_where(args, file_path)
             search_words, log_level = CLIHandler._parse_search_args(args)
-            counter = WordCounter(lines)
-            result = counter.search_specific_words(search_words, log_level)
+            # The word index has no per-line counts, so a time window or filter is scanned instead
+            if use_index and start == 0 and end is None and where is None:
+                # Answer from the .widx inverted index, indexing appended bytes first
+                from .word_index import WordIndex
+                result = WordIndex.open(file_path).search_specific_words(file_path, search_words, log_level)
+            else:
+                matches = all_of(as_predicate(log_level), where)
+                if matches:
+                    lines = LogParser.iter_lines(file_path, start, end)
+                else:
+                    # Unfiltered searches scan whole memory-mapped blocks
+                    lines = tokenizer.iter_blocks(file_path, start, end)
+                result = WordCounter(lines).search_specific_words(search_words, matches)
             CLIHandler.print_results(result)
         except ValueError as e:
             print(f"Error: {e}")
             sys.exit(1)
 
     @staticmethod
-    def _handle_count_command(args: List[str], lines: List[str]) -> None:
+    def _handle_level_command(args: List[str], file_path: str) -> None:
+        """Handle log level filtering command."""
+        try:
+            use_index, args = CLIHandler._pop_flag(args, '--index')
+            index = None
+            if use_index:
+                from .index import LogIndex
+                index = LogIndex.open(file_path)
+            start, end, args = CLIHandler._parse_time_window(args, file_path, index)
+            where, args = CLIHandler._pop_where(args, file_path)
+            log_level = CLIHandler._parse_level_args(args)
+            if index:
+                # Seek straight to the lines of this level via the .idx sidecar,
+                # with their stack traces when a filter may look at them
+                lines = index.iter_level_lines(file_path, log_level, start, end, records=where is not None)
+            else:
+                lines = LogParser.iter_lines(file_path, start, end)
+            from .processor import LogProcessor
+            processor = LogProcessor(lines)
+            matches = all_of(as_predicate(log_level), where)
+            # Machine-readable formats also write the thread and logger
+            full = CLIHandler.output_format != 'text'
+            CLIHandler.print_log_entries(log_level, processor.iter_log_entries_by_level(matches, full))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def _handle_count_command(args: List[str], file_path: str) -> None:
         """Handle word count command."""
         try:
+            workers_arg, args = CLIHandler._pop_option(args, '--workers')
+            workers = CLIHandler._parse_workers(workers_arg)
+            tokenizer_arg, args = CLIHandler._pop_option(args, '--tokenizer')
+            backend = CLIHandler._parse_tokenizer(tokenizer_arg)
+            approx, args = CLIHandler._pop_flag(args, '--approx')
+            capacity_arg, args = CLIHandler._pop_option(args, '--capacity')
+            capacity = CLIHandler._parse_capacity(capacity_arg)
+            save_path, merge_paths, args = CLIHandler._pop_sketch_options(args)
+            if (save_path or merge_paths) and not approx:
+                raise ValueError("--save_sketch and --merge_sketch require --approx")
+            start, end, args = CLIHandler._parse_time_window(args, file_path)
+            where, args = CLIHandler._pop_where(args, file_path)
             top_n = CLIHandler._parse_top_n(args)
-            counter = WordCounter(lines)
-            result = counter.count_top_words(top_n)
-            CLIHandler.print_results(result)
+            if where is not None:
+                if workers > 1 or backend == 'mmap' or approx:
+                    raise ValueError("--where cannot be combined with --workers, --tokenizer mmap or --approx")
+                counter = WordCounter(LogParser.iter_lines(file_path, start, end))
+                CLIHandler.print_results(counter.count_level_words(where).most_common(top_n))
+                return
+            if workers > 1:
+                from .parallel import ParallelWordCounter
+                counter = ParallelWordCounter(file_path, workers, backend, start, end)
+            elif backend == 'mmap':
+                counter = WordCounter(tokenizer.iter_blocks(file_path, start, end))
+            else:
+                counter = WordCounter(LogParser.read_blocks(file_path, start=start, end=end))
+            if not approx:
+                result = counter.count_top_words(top_n)
+                CLIHandler.print_results(result)
+                return
+
+            sketch = counter.count_sketch(capacity)
+            CLIHandler._merge_sketches(sketch, merge_paths, save_path)
+            CLIHandler.print_results(
+                sketch.most_common(top_n),
+                prefix=f"Approximate top {top_n} words (each count overestimates by at most {int(sketch.error_bound())}):")
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def _handle_distinct_command(args: List[str], file_path: str) -> None:
+        """Handle --distinct: estimate the number of distinct words or pattern matches."""
+        try:
+            _, args = CLIHandler._pop_flag(args, '--distinct')
+            pattern, args = CLIHandler._pop_option(args, '--pattern')
+            if pattern is not None:
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid --pattern: {e}")
+            log_level, args = CLIHandler._pop_option(args, '--level_log')
+            precision_arg, args = CLIHandler._pop_option(args, '--precision')
+            precision = CLIHandler._parse_precision(precision_arg)
+            save_path, merge_paths, args = CLIHandler._pop_sketch_options(args)
+            start, end, args = CLIHandler._parse_time_window(args, file_path)
+            where, args = CLIHandler._pop_where(args, file_path)
+            if args:
+                raise ValueError(f"Unexpected argument: {args[0]}")
+
+            matches = all_of(as_predicate(log_level), where)
+            if matches:
+                lines = LogParser.iter_lines(file_path, start, end)
+            else:
+                # Without a filter whole blocks can be deduplicated at once
+                lines = LogParser.read_blocks(file_path, start=start, end=end)
+            sketch = WordCounter(lines).count_distinct(precision, matches, pattern)
+            CLIHandler._merge_sketches(sketch, merge_paths, save_path)
+
+            what = f"values matching {pattern}" if pattern else "words"
+            scope = f" in {log_level.upper()} entries" if log_level else ""
+            print(f"Distinct {what}{scope}: ~{sketch.count()} (standard error {sketch.relative_error():.2%})")
         except ValueError as e:
             print(f"Error: {e}")
             sys.exit(1)
 
     @staticmethod
-    def parse_args_and_run(lines: List[str]) -> None:
+    def print_histogram(levels: List[str], rows: List[Tuple[int, Optional[str], List[int]]], by: Optional[str]) -> None:
+        """Print histogram rows as aligned columns, one per log level."""
+        from .table import ms_to_timestamp
+        if not rows:
+            print("No log entries found")
+            return
+        labels = [ms_to_timestamp(bucket)[:19] if bucket % 1000 == 0 else ms_to_timestamp(bucket)
+                  for bucket, _, _ in rows]
+        header = ['bucket'] + ([by] if by else []) + levels
+        table = [[label] + ([group or '-'] if by else []) + [str(count) for count in counts]
+                 for label, (_, group, counts) in zip(labels, rows)]
+        widths = [max(len(row[i]) for row in [header] + table) for i in range(len(header))]
+        for row in [header] + table:
+            print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+    @staticmethod
+    def _run_histogram(args: List[str], lines: Iterable[str], file_path: Optional[str] = None) -> None:
+        """Parse --histogram SIZE [--by logger|thread] [--level_log LEVEL] [--where EXPR], then aggregate and print lines."""
+        from .histogram import GROUP_BY, histogram, parse_bucket
+        bucket_arg, args = CLIHandler._pop_option(args, '--histogram')
+        bucket_ms = parse_bucket(bucket_arg)
+        by, args = CLIHandler._pop_option(args, '--by')
+        if by is not None and by not in GROUP_BY:
+            raise ValueError(f"Invalid --by '{by}', expected one of: {', '.join(GROUP_BY)}")
+        log_level, args = CLIHandler._pop_option(args, '--level_log')
+        where, args = CLIHandler._pop_where(args, file_path)
+        if args:
+            raise ValueError(f"Unexpected argument: {args[0]}")
+
+        from .processor import LogProcessor
+        table = LogProcessor(lines).get_log_table(all_of(as_predicate(log_level), where))
+        levels, rows = histogram(table, bucket_ms, by)
+        CLIHandler.print_histogram(levels, rows, by)
+
+    @staticmethod
+    def _handle_histogram_command(args: List[str], file_path: str) -> None:
+        """Handle --histogram: entry counts per time bucket and log level."""
+        try:
+            start, end, args = CLIHandler._parse_time_window(args, file_path)
+            CLIHandler._run_histogram(args, LogParser.iter_lines(file_path, start, end), file_path)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def _handle_sample_command(args: List[str], file_path: str) -> None:
+        """Handle --sample/--sample_lines: estimate top words and level counts from a sample."""
+        try:
+            rate_arg, args = CLIHandler._pop_option(args, '--sample')
+            size_arg, args = CLIHandler._pop_option(args, '--sample_lines')
+            seek, args = CLIHandler._pop_flag(args, '--seek')
+            if (rate_arg is None) == (size_arg is None):
+                raise ValueError("Use exactly one of --sample RATE and --sample_lines N")
+            if seek and size_arg is None:
+                raise ValueError("--seek requires --sample_lines N")
+            start, end, args = CLIHandler._parse_time_window(args, file_path)
+            top_n = CLIHandler._parse_top_n(args)
+
+            from .sampling import rate_sample, reservoir_sample, seek_sample
+            if seek:
+                sample = seek_sample(file_path, CLIHandler._parse_sample_size(size_arg), start, end)
+                method = "random seeks"
+            elif size_arg is not None:
+                lines = LogParser.iter_lines(file_path, start, end)
+                sample = reservoir_sample(lines, CLIHandler._parse_sample_size(size_arg))
+                method = "a reservoir sample"
+            else:
+                lines = LogParser.iter_lines(file_path, start, end)
+                sample = rate_sample(lines, CLIHandler._parse_sample_rate(rate_arg))
+                method = "a rate sample"
+
+            print(f"Estimated from {len(sample.lines)} lines taken by {method} (95% confidence):")
+            CLIHandler.print_estimates(sample.top_words(top_n), prefix=f"Top {top_n} words:")
+            levels = [(level, estimate, margin) for level, (estimate, margin) in sample.level_counts().items()]
+            CLIHandler.print_estimates(levels, prefix="Entries per log level:")
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def _run_stream_command(args: List[str], lines: Iterable[str]) -> None:
+        """Run a histogram, search, level listing or word count over one stream of lines."""
+        if '--histogram' in args:
+            CLIHandler._run_histogram(args, lines)
+            return
+        where, args = CLIHandler._pop_where(args)
+        if '--search' in args:
+            search_words, log_level = CLIHandler._parse_search_args(args)
+            matches = all_of(as_predicate(log_level), where)
+            CLIHandler.print_results(WordCounter(lines).search_specific_words(search_words, matches))
+        elif '--level_log' in args:
+            log_level = CLIHandler._parse_level_args(args)
+            matches = all_of(as_predicate(log_level), where)
+            from .processor import LogProcessor
+            full = CLIHandler.output_format != 'text'
+            CLIHandler.print_log_entries(log_level, LogProcessor(lines).iter_log_entries_by_level(matches, full))
+        else:
+            top_n = CLIHandler._parse_top_n(args)
+            CLIHandler.print_results(WordCounter(lines).count_level_words(where).most_common(top_n))
+
+    @staticmethod
+    def _handle_templates_command(args: List[str], file_path: str) -> None:
+        """Handle --templates: the top N message templates per log level."""
+        try:
+            _, args = CLIHandler._pop_flag(args, '--templates')
+            log_level, args = CLIHandler._pop_option(args, '--level_log')
+            start, end, args = CLIHandler._parse_time_window(args, file_path)
+            where, args = CLIHandler._pop_where(args, file_path)
+            top_n = CLIHandler._parse_top_n(args)
+
+            lines = LogParser.iter_lines(file_path, start, end)
+            from .templates import TemplateMiner
+            miner = TemplateMiner().add_lines(lines, all_of(as_predicate(log_level), where) if where else log_level)
+            levels = [log_level.upper()] if log_level else miner.levels()
+            if not levels:
+                print("No log entries found")
+            for level in levels:
+                CLIHandler.print_templates(level, miner.top_templates(top_n, level))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def _handle_files_command(args: List[str], paths: List[str]) -> None:
+        """Handle word counts, searches, level listings and histograms over several or compressed files."""
+        try:
+            workers_arg, args = CLIHandler._pop_option(args, '--workers')
+            # One file per worker process unless told otherwise
+            workers = CLIHandler._parse_workers(workers_arg) if workers_arg else min(len(paths), os.cpu_count() or 1)
+            ordered, args = CLIHandler._pop_flag(args, '--ordered')
+            if ordered:
+                paths = sources.order_by_time(paths)
+            merged, args = CLIHandler._pop_flag(args, '--merge')
+            for arg in args:
+                if arg.startswith('--') and arg not in ('--search', '--level_log', '--histogram', '--by', '--where'):
+                    raise ValueError(f"{arg} is not supported with compressed or multiple input files")
+
+            if merged or '--histogram' in args or '--where' in args:
+                # One stream of lines, interleaved by timestamp with --merge
+                from .merge import merge_lines
+                lines = merge_lines(paths) if merged else (line for path in paths for line in LogParser.iter_lines(path))
+                CLIHandler._run_stream_command(args, lines)
+            elif '--search' in args:
+                search_words, log_level = CLIHandler._parse_search_args(args)
+                CLIHandler.print_results(sources.search_specific_words(paths, search_words, log_level, workers))
+            elif '--level_log' in args:
+                log_level = CLIHandler._parse_level_args(args)
+                tables = sources.iter_log_tables(paths, log_level, workers)
+                CLIHandler.print_log_entries(log_level, (entry for table in tables for entry in table))
+            else:
+                top_n = CLIHandler._parse_top_n(args)
+                CLIHandler.print_results(sources.count_words(paths, workers).most_common(top_n))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def _parse_query_args(args: List[str], file_path: str) -> Tuple[QueryPlan, int, Optional[int], bool]:
+        """Build a QueryPlan from --top/--search/--search_level/--level_log options."""
+        json_output, args = CLIHandler._pop_flag(args, '--json')
+        if CLIHandler.output_format in ('ndjson', 'csv'):
+            raise ValueError(f"--format {CLIHandler.output_format} needs a single result; use --format json with --top")
+        json_output = json_output or CLIHandler.output_format == 'json'
+        top_arg, args = CLIHandler._pop_option(args, '--top')
+        search_level, args = CLIHandler._pop_option(args, '--search_level')
+        start, end, args = CLIHandler._parse_time_window(args, file_path)
+        levels = []
+        while '--level_log' in args:
+            level, args = CLIHandler._pop_option(args, '--level_log')
+            levels.append(level)
+        search_words, args = CLIHandler._pop_word_list(args, '--search')
+        if '--search' in args and not search_words:
+            raise ValueError("Please provide words to search after --search")
+        if args:
+            raise ValueError(f"Unexpected argument: {args[0]}")
+
+        top_n = CLIHandler._parse_top_n([top_arg]) if top_arg is not None else None
+        if top_n is None and not search_words and not levels:
+            # --json alone: the default top-N count
+            top_n = CLIHandler._parse_top_n([])
+        from .query import QueryPlan
+        return QueryPlan(top_n, search_words, search_level, levels), start, end, json_output
+
+    @staticmethod
+    def _print_query_json(results: dict) -> None:
+        """Print query results as one JSON document."""
+        document = {}
+        if results['top_words'] is not None:
+            document['top_words'] = [{'word': word, 'count': count} for word, count in results['top_words']]
+        if results['search'] is not None:
+            document['search'] = [{'word': word, 'count': count} for word, count in results['search']]
+        if results['log_entries']:
+            document['log_entries'] = {
+                level: [{'timestamp': entry.timestamp, 'loglevel': entry.loglevel,
+                         'thread': entry.thread, 'logger': entry.logger} for entry in table]
+                for level, table in results['log_entries'].items()
+            }
+        import json
+        with OutputBuffer() as out:
+            for chunk in json.JSONEncoder(indent=2).iterencode(document):
+                out.write(chunk)
+            out.write('\n')
+
+    @staticmethod
+    def _handle_query_command(args: List[str], file_path: str) -> None:
+        """Handle several outputs (--top, --search, --level_log) in a single scan."""
+        try:
+            plan, start, end, json_output = CLIHandler._parse_query_args(args, file_path)
+            results = plan.execute(LogParser.read_blocks(file_path, start=start, end=end))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        if json_output:
+            CLIHandler._print_query_json(results)
+            return
+        if results['top_words'] is not None:
+            CLIHandler.print_results(results['top_words'], prefix=f"Top {plan.top_n} words:")
+        if results['search'] is not None:
+            CLIHandler.print_results(results['search'], prefix="Search results:")
+        for level, table in results['log_entries'].items():
+            CLIHandler.print_log_entries(level, table)
+
+    @staticmethod
+    def _print_follow_update(follower: LogFollower, top_n: int) -> None:
+        """Print the current counters of a followed log."""
+        print(f"--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---")
+        CLIHandler.print_results(follower.top_words(top_n), prefix=f"Top {top_n} words:")
+        if follower.search_words:
+            CLIHandler.print_results(follower.search_results(), prefix="Search results:")
+        CLIHandler.print_level_counts(follower.level_counts)
+        sys.stdout.flush()
+
+    @staticmethod
+    def _handle_follow_command(args: List[str], file_path: str) -> None:
+        """Handle --follow: keep counts updated as lines are appended to the file."""
+        try:
+            _, args = CLIHandler._pop_flag(args, '--follow')
+            interval_arg, args = CLIHandler._pop_option(args, '--interval')
+            interval = CLIHandler._parse_interval(interval_arg)
+            checkpoint_path, args = CLIHandler._pop_option(args, '--checkpoint')
+            search_words, log_level = [], None
+            if '--search' in args:
+                # Optional top_n comes before --search
+                i = args.index('--search')
+                search_words, log_level = CLIHandler._parse_search_args(args[i:])
+                args = args[:i]
+            top_n = CLIHandler._parse_top_n(args)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        import signal
+        from .follow import LogFollower
+        follower = LogFollower(file_path, search_words, log_level, checkpoint_path)
+        if follower.load_checkpoint():
+            print(f"Resuming {file_path} at byte {follower.offset}")
+            CLIHandler._print_follow_update(follower, top_n)
+        last_checkpoint = time.monotonic()
+        # A supervisor's SIGTERM stops following like Ctrl+C, saving the checkpoint
+        previous_handler = signal.signal(signal.SIGTERM, CLIHandler._interrupt)
+        try:
+            while True:
+                if follower.poll():
+                    CLIHandler._print_follow_update(follower, top_n)
+                    if time.monotonic() - last_checkpoint >= CHECKPOINT_EVERY:
+                        follower.save_checkpoint()
+                        last_checkpoint = time.monotonic()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            follower.save_checkpoint()
+            follower.close()
+
+    @staticmethod
+    def _interrupt(signum, frame) -> None:
+        """Signal handler that stops the running command like Ctrl+C."""
+        raise KeyboardInterrupt
+
+    @staticmethod
+    def parse_args_and_run(file_path: str) -> None:
         """Parse command line arguments and execute appropriate action."""
         args = sys.argv[2:]  # Skip script name and file_path
         
         if len(sys.argv) < 2:
-            print("Usage: python3 main.py <file_path> [top_n | --search word1 word2 ... | --level_log LEVEL]")
+            print("Usage: python3 main.py <file_path> [top_n [--workers N] [--tokenizer regex|mmap] [--approx [--capacity N] [--save_sketch PATH] [--merge_sketch PATH ...]] | --search word1 word2 ... [--level_log LEVEL] [--index] | --level_log LEVEL [--index]] [--since TIME] [--until TIME] [--where EXPR] [--format text|json|ndjson|csv] [--no-cache] [--profile [--profile_stats PATH] [--profile_memory]] [--follow [--interval S] [--checkpoint PATH]]")
+            print("       python3 main.py <file_path> --distinct [--pattern REGEX] [--level_log LEVEL] [--precision P] [--save_sketch PATH] [--merge_sketch PATH ...] [--since TIME] [--until TIME] [--where EXPR]")
+            print("       python3 main.py <file_path> [top_n] --sample RATE | --sample_lines N [--seek] [--since TIME] [--until TIME]")
+            print("       python3 main.py <file|dir|glob> [top_n | --search word1 ... [--level_log LEVEL] | --level_log LEVEL | --histogram SIZE [--by logger|thread]] [--workers N] [--ordered] [--merge]")
+            print("       python3 main.py <file_path> [top_n] --templates [--level_log LEVEL] [--since TIME] [--until TIME] [--where EXPR]")
+            print("       python3 main.py <file_path> --histogram SIZE [--by logger|thread] [--level_log LEVEL] [--since TIME] [--until TIME] [--where EXPR]")
+            print("       python3 main.py <file_path> [--top N] [--search word1 ...] [--search_level LEVEL] [--level_log LEVEL ...] [--json | --format json]")
+            sys.exit(1)
+
+        no_cache, args = CLIHandler._pop_flag(args, '--no-cache')
+        profile, args = CLIHandler._pop_flag(args, '--profile')
+        memory, args = CLIHandler._pop_flag(args, '--profile_memory')
+        try:
+            stats_path, args = CLIHandler._pop_option(args, '--profile_stats')
+            format_arg, args = CLIHandler._pop_option(args, '--format')
+            CLIHandler.output_format = CLIHandler._parse_output_format(format_arg, args)
+        except ValueError as e:
+            print(f"Error: {e}")
             sys.exit(1)
+        if profile or memory or stats_path:
+            # A profile of a cached result would only measure the cache
+            from .profiling import run_profiled
+            run_profiled(lambda: CLIHandler._run(args, file_path, no_cache=True), stats_path, memory)
+        else:
+            CLIHandler._run(args, file_path, no_cache)
+
+    @staticmethod
+    def _parse_output_format(value: Optional[str], args: List[str]) -> str:
+        """Validate --format; formats other than text apply to word counts, searches and entry listings."""
+        if value is None:
+            return 'text'
+        output_format = value.lower()
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Invalid --format '{value}', expected one of: {', '.join(OUTPUT_FORMATS)}")
+        if output_format != 'text':
+            for option in TEXT_ONLY_OPTIONS:
+                if option in args:
+                    raise ValueError(f"--format {output_format} is not supported with {option}")
+        return output_format
+
+    @staticmethod
+    def _run(args: List[str], file_path: str, no_cache: bool) -> None:
+        """Expand file_path and run the command, through the result cache unless no_cache."""
+        try:
+            paths = sources.expand_paths(file_path)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        if no_cache or any(option in args for option in UNCACHED_OPTIONS):
+            CLIHandler._dispatch(args, file_path, paths)
+        else:
+            CLIHandler._run_cached(args, file_path, paths)
+
+    @staticmethod
+    def _cache_query(args: List[str], paths: List[str]) -> List[str]:
+        """Normalize args into a cache key: options that cannot change the output are dropped.
+
+        --workers and --tokenizer are dropped only where they are read and
+        cannot change the output: exact word counts, and --workers for several
+        or compressed files. Elsewhere they stay in the key, so a command that
+        rejects them, or whose output they change, is never answered for another.
+        --format was popped from args before this point, so the chosen format is added back.
+        """
+        query = list(args) + ['--format', CLIHandler.output_format]
+        handler = CLIHandler._route(args, paths)
+        if handler is CLIHandler._handle_files_command:
+            unused = ('--workers',)
+        elif handler is CLIHandler._handle_count_command and '--approx' not in args:
+            # An --approx sketch depends on how the counts were split, so it keeps both
+            unused = ('--workers', '--tokenizer')
+        else:
+            unused = ()
+        for flag, valid in (('--workers', lambda value: value.isdigit() and int(value) > 0),
+                            ('--tokenizer', lambda value: value in TOKENIZERS)):
+            if flag in unused and flag in query:
+                i = query.index(flag)
+                # Invalid values are kept so that they still report their error
+                if i + 1 < len(query) and valid(query[i + 1]):
+                    del query[i:i + 2]
+        return query
+
+    @staticmethod
+    def _run_cached(args: List[str], file_path: str, paths: List[str]) -> None:
+        """Print a cached result for an unchanged file and query, or run the command and cache its output."""
+        cache = ResultCache()
+        try:
+            key = cache.key(paths, CLIHandler._cache_query(args, paths))
+        except OSError:
+            # Missing or unreadable file: let the command report it
+            CLIHandler._dispatch(args, file_path, paths)
+            return
+        output = cache.get(key)
+        if output is not None:
+            sys.stdout.write(output)
+            return
 
-        # Route to appropriate handler based on command
-        if args and args[0] == '--search':
-            CLIHandler._handle_search_command(args, lines)
+        stdout = sys.stdout
+        sys.stdout = tee = _Tee(stdout)
+        try:
+            CLIHandler._dispatch(args, file_path, paths)
+        finally:
+            sys.stdout = stdout
+        # Commands that fail exit before this point, so only complete results are stored
+        if tee.copy is not None:
+            cache.put(key, tee.copy.getvalue())
+
+    @staticmethod
+    def _route(args: List[str], paths: List[str]) -> Callable:
+        """Return the handler of the command in args; the files handler takes all paths, the others one file."""
+        if len(paths) > 1 or (os.path.isfile(paths[0]) and LogParser.is_compressed(paths[0])):
+            # Globs, directories and compressed files are streamed file by file
+            return CLIHandler._handle_files_command
+        if '--follow' in args:
+            return CLIHandler._handle_follow_command
+        if '--histogram' in args:
+            return CLIHandler._handle_histogram_command
+        if '--sample' in args or '--sample_lines' in args:
+            return CLIHandler._handle_sample_command
+        if '--templates' in args:
+            return CLIHandler._handle_templates_command
+        if '--distinct' in args:
+            return CLIHandler._handle_distinct_command
+        if '--top' in args or '--json' in args:
+            return CLIHandler._handle_query_command
+        if '--search' in args:
+            return CLIHandler._handle_search_command
+        if '--level_log' in args:
+            return CLIHandler._handle_level_command
+        return CLIHandler._handle_count_command
+
+    @staticmethod
+    def _dispatch(args: List[str], file_path: str, paths: List[str]) -> None:
+        """Route args to the handler of their command."""
+        handler = CLIHandler._route(args, paths)
+        if handler is CLIHandler._handle_files_command:
+            handler(args, paths)
         else:
-            CLIHandler._handle_count_command(args, lines)
\ No newline at end of file
+            # A directory or glob matching a single file names that file
+            handler(args, paths[0])
\ No newline at end of file
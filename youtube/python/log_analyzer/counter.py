@@ -1,29 +1,116 @@
-from parser import LogParser
+import re
+from .parser import LogParser
 from collections import Counter
+from . import tokenizer
+from .filters import as_predicate
 
 class WordCounter:
     def __init__(self, lines):
+        # Any iterable of text works: a list of lines, a lazy line
+        # iterator or a block reader. It is consumed only once.
+        # count_top_words also accepts bytes blocks from tokenizer.iter_blocks.
         self.lines = lines
 
+    def count_words(self, word_counts=None):
+        """Add every word to a Counter (a new one by default) and return it."""
+        if word_counts is None:
+            word_counts = Counter()
+        for text in self.lines:
+            if isinstance(text, bytes):
+                tokenizer.count_block(text, word_counts)
+            else:
+                word_counts.update(LogParser.extract_words(text))
+        return word_counts
+
     def count_top_words(self, top_n):
         """Count top N most common words in the entire text file."""
-        text = ' '.join(self.lines).lower()
-        words = LogParser.extract_words(text)
-        word_counts = Counter(words)
-        return word_counts.most_common(top_n)
+        return self.count_words().most_common(top_n)
 
-    def search_specific_words(self, search_words, log_level=None):
-        """Search and count specific words, optionally filtered by log level."""
-        word_counts = Counter()
+    def count_sketch(self, capacity, sketch=None):
+        """Summarize word counts in a Space-Saving sketch of at most `capacity` counters.
+
+        Exact counts are kept only for a batch of text at a time, so memory
+        stays bounded however many distinct words the file has.
+        """
+        if sketch is None:
+            from .sketch import SpaceSaving
+            sketch = SpaceSaving(capacity)
+        batch = Counter()
+        for text in self.lines:
+            if isinstance(text, bytes):
+                tokenizer.count_block(text, batch)
+            else:
+                batch.update(LogParser.extract_words(text))
+            if len(batch) >= capacity:
+                sketch.update(batch)
+                batch = Counter()
+        if batch:
+            sketch.update(batch)
+        return sketch
+
+    def count_distinct(self, precision=14, log_level=None, pattern=None, sketch=None):
+        """Estimate the number of distinct words (or `pattern` matches) in a HyperLogLog.
+
+        With a capture group in `pattern` its first group is counted, otherwise
+        the whole match. Values are deduplicated per line (or block) before hashing.
+        log_level may also be a predicate from filters.compile_filter; when
+        filtering, continuation lines count with the entry before them.
+        """
+        if sketch is None:
+            from .sketch import HyperLogLog
+            sketch = HyperLogLog(precision)
+        regex = re.compile(pattern) if pattern else None
+        matches = as_predicate(log_level)
+        lines = LogParser.iter_records(self.lines) if matches else self.lines
+        for line in lines:
+            if matches and not matches(line):
+                continue
+            if regex is None:
+                values = LogParser.extract_words(line)
+            elif regex.groups:
+                values = [match.group(1) for match in regex.finditer(line) if match.group(1) is not None]
+            else:
+                values = regex.findall(line)
+            sketch.update(set(values))
+        return sketch
+
+    def count_level_words(self, log_level=None, word_counts=None):
+        """Add the words of the lines of one log level (all lines by default) to a Counter.
+
+        log_level may also be a predicate from filters.compile_filter. Stack
+        traces and other continuation lines belong to the entry before them.
+        """
+        if word_counts is None:
+            word_counts = Counter()
         
-        for line in self.lines:
-            entry = LogParser.parse_log_entry(line)
-            if log_level and (not entry or entry.loglevel.lower() != log_level.lower()):
+        matches = as_predicate(log_level)
+        lines = LogParser.iter_records(self.lines) if matches else self.lines
+        for line in lines:
+            if matches and not matches(line):
                 continue
             
             words = LogParser.extract_words(line)
             word_counts.update(words)
         
+        return word_counts
+
+    def search_specific_words(self, search_words, log_level=None):
+        """Search and count specific words, optionally filtered by log level.
+
+        Only the search words are matched (see tokenizer.TermMatcher), so the
+        other words of a line are never extracted or counted. Lines may also
+        be str or bytes blocks when there is no log level; with one, the words
+        of continuation lines count toward the level of the entry before them.
+        """
+        matcher = tokenizer.TermMatcher(search_words)
+        matches = as_predicate(log_level)
+        lines = LogParser.iter_records(self.lines) if matches else self.lines
+        word_counts = Counter()
+        for text in lines:
+            if matches and not matches(text):
+                continue
+            matcher.count(text, word_counts)
+
         # Return counts for the requested search words
         return [(word.lower(), word_counts.get(word.lower(), 0)) for word in search_words]
 
@@ -0,0 +1,270 @@
+import re
+
+from .parser import ENTRY_RE, LAYOUT_RE, RECORD_RE, record_message
+from .timerange import normalize_bound
+
+# Expression tokens: quoted strings, operators and punctuation, or bare words
+_TOKEN_RE = re.compile(r'''\s*(?:("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')|(!=|>=|<=|=|<|>|~|\(|\)|,)|([^\s()"',=!<>~]+))''')
+_KEYWORDS = ('and', 'or', 'not', 'in', 'contains')
+
+# Evaluation cost of each field: the raw line is free, level and time need
+# only the timestamp/level prefix, and the rest need a full record parse
+FIELD_COSTS = {'line': 0, 'level': 1, 'time': 1, 'thread': 2, 'logger': 2, 'msg': 2}
+FIELD_ALIASES = {'message': 'msg', 'timestamp': 'time'}
+RECORD_GROUPS = {'thread': 3, 'logger': 4, 'msg': 5}  # Groups of LAYOUT_RE / RECORD_RE
+FIELD_OPERATORS = {
+    'line': ('contains', '~'),
+    'level': ('=', '!=', 'in'),
+    'time': ('=', '!=', '<', '<=', '>', '>='),
+    'thread': ('=', '!=', 'in', 'contains', '~'),
+    'logger': ('=', '!=', 'in', 'contains', '~'),
+    'msg': ('=', '!=', 'in', 'contains', '~'),
+}
+
+_MISSING = object()
+
+def _record_match(line, memo):
+    """The parse_log_record match of the line, computed at most once per line."""
+    match = memo[0]
+    if match is _MISSING:
+        match = memo[0] = LAYOUT_RE.match(line) or RECORD_RE.match(line)
+    return match
+
+def _unquote(token):
+    """Strip a token's quotes, unescaping only quotes and backslashes so regexes keep \\d, \\s, ..."""
+    if token[0] in '"\'':
+        return re.sub(r'\\(["\'\\\\])', r'\1', token[1:-1])
+    return token
+
+class _Parser:
+    """Recursive-descent parser producing (cost, test) pairs, test(line, memo) -> bool."""
+
+    def __init__(self, expression, file_path):
+        self.expression = expression
+        self.file_path = file_path
+        self.tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = _TOKEN_RE.match(expression, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Invalid filter near: {expression[position:]}")
+            quoted, symbol, word = match.groups()
+            if quoted:
+                self.tokens.append(('value', _unquote(quoted)))
+            elif symbol:
+                self.tokens.append((symbol, symbol))
+            elif word.lower() in _KEYWORDS:
+                self.tokens.append((word.lower(), word))
+            else:
+                self.tokens.append(('value', word))
+            position = match.end()
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def _take(self, kind=None):
+        if self.position >= len(self.tokens):
+            raise ValueError(f"Unexpected end of filter: {self.expression}")
+        token_kind, text = self.tokens[self.position]
+        if kind is not None and token_kind != kind:
+            raise ValueError(f"Expected {kind} but found '{text}' in filter: {self.expression}")
+        self.position += 1
+        return text
+
+    def parse(self):
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.position][1]}' in filter: {self.expression}")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._peek() == 'or':
+            self._take()
+            nodes.append(self._and())
+        return _combine(nodes, any_of=True)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._peek() == 'and':
+            self._take()
+            nodes.append(self._not())
+        return _combine(nodes, any_of=False)
+
+    def _not(self):
+        if self._peek() == 'not':
+            self._take()
+            cost, test = self._not()
+            return cost, lambda line, memo: not test(line, memo)
+        if self._peek() == '(':
+            self._take()
+            node = self._or()
+            self._take(')')
+            return node
+        return self._comparison()
+
+    def _values(self):
+        """Parse the '(a, b, ...)' list after 'in'."""
+        self._take('(')
+        values = [self._take('value')]
+        while self._peek() == ',':
+            self._take()
+            values.append(self._take('value'))
+        self._take(')')
+        return values
+
+    def _comparison(self):
+        name = self._take('value').lower()
+        field = FIELD_ALIASES.get(name, name)
+        if field not in FIELD_COSTS:
+            raise ValueError(f"Unknown filter field '{name}', expected one of: {', '.join(FIELD_COSTS)}")
+        operator = self._peek()
+        if operator not in FIELD_OPERATORS[field]:
+            found = f"'{self.tokens[self.position][1]}'" if operator else "nothing"
+            raise ValueError(f"Expected one of {', '.join(FIELD_OPERATORS[field])} after {field}, found {found}")
+        self._take()
+        value = self._values() if operator == 'in' else self._take('value')
+        return FIELD_COSTS[field], _compile_comparison(field, operator, value, self.file_path)
+
+def _combine(nodes, any_of):
+    """Join children of 'and'/'or', cheapest first so expensive tests run only when needed."""
+    if len(nodes) == 1:
+        return nodes[0]
+    nodes = sorted(nodes, key=lambda node: node[0])
+    test = nodes[-1][1]
+    for _, first in reversed(nodes[:-1]):
+        if any_of:
+            test = (lambda a, b: lambda line, memo: a(line, memo) or b(line, memo))(first, test)
+        else:
+            test = (lambda a, b: lambda line, memo: a(line, memo) and b(line, memo))(first, test)
+    # A later test may be skipped, so the whole node costs as much as its dearest part
+    return nodes[-1][0], test
+
+def _string_test(operator, value):
+    """Build a test on a string that may be None (a field missing from the record)."""
+    if operator == '=':
+        return lambda text: text == value
+    if operator == '!=':
+        return lambda text: text != value
+    if operator == 'in':
+        values = frozenset(value)
+        return lambda text: text in values
+    if operator == 'contains':
+        return lambda text: text is not None and value in text
+    try:
+        search = re.compile(value).search
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression '{value}' in filter: {e}")
+    return lambda text: text is not None and search(text) is not None
+
+def _time_test(operator, bound):
+    """Compare a timestamp with a timestamp prefix, with the same prefix rules as --since/--until."""
+    size = len(bound)
+    if operator == '=':
+        return lambda timestamp: timestamp[:size] == bound
+    if operator == '!=':
+        return lambda timestamp: timestamp[:size] != bound
+    if operator == '<':
+        return lambda timestamp: timestamp[:size] < bound
+    if operator == '<=':
+        return lambda timestamp: timestamp[:size] <= bound
+    if operator == '>':
+        return lambda timestamp: timestamp[:size] > bound
+    return lambda timestamp: timestamp[:size] >= bound
+
+def _compile_comparison(field, operator, value, file_path):
+    if field == 'line':
+        check = _string_test(operator, value)
+        return lambda line, memo: check(line)
+
+    if field == 'level':
+        if operator == 'in':
+            levels = frozenset(level.upper() for level in value)
+        else:
+            levels = frozenset([value.upper()])
+        wanted = operator != '!='
+
+        def test(line, memo):
+            match = ENTRY_RE.match(line)
+            return match is not None and (match.group(2).upper() in levels) == wanted
+        return test
+
+    if field == 'time':
+        if file_path is None and not value[:4].isdigit():
+            raise ValueError(f"Time '{value}' needs a date in this context")
+        check = _time_test(operator, normalize_bound(value, file_path))
+
+        def test(line, memo):
+            match = ENTRY_RE.match(line)
+            return match is not None and check(match.group(1))
+        return test
+
+    check = _string_test(operator, value)
+    group = RECORD_GROUPS[field]
+
+    if field == 'msg':
+        def test(line, memo):
+            match = _record_match(line, memo)
+            return match is not None and check(record_message(match, line))
+    else:
+        def test(line, memo):
+            match = _record_match(line, memo)
+            return match is not None and check(match.group(group))
+
+    # Fields are substrings of the line, so when none of the wanted values
+    # occurs in the raw line the record is ruled out without parsing it
+    if operator in ('=', 'contains'):
+        needles = [value]
+    elif operator == 'in':
+        needles = value
+    else:
+        return test
+    if not all(needles):
+        return test
+    if len(needles) == 1:
+        needle = needles[0]
+        return lambda line, memo: needle in line and test(line, memo)
+    search = re.compile('|'.join(map(re.escape, needles))).search
+    return lambda line, memo: search(line) is not None and test(line, memo)
+
+def compile_filter(expression, file_path=None):
+    """Compile a filter expression into a predicate(line) -> bool.
+
+    Example: level in (ERROR, WARN) and logger ~ DataProcessor and msg contains "timeout".
+    Fields are level, time, thread, logger, msg and line (the raw line, or
+    record with its continuation lines when the caller assembles them);
+    comparisons combine with and, or, not and parentheses. Each line is
+    parsed at most once, and only when a cheaper test has not already
+    decided the result. file_path resolves time-of-day values to a date.
+    """
+    _, test = _Parser(expression, file_path).parse()
+
+    def predicate(line):
+        return test(line, [_MISSING])
+    return predicate
+
+def level_filter(log_level):
+    """Predicate for entries of one log level (case-insensitive)."""
+    level = log_level.lower()
+
+    def predicate(line):
+        match = ENTRY_RE.match(line)
+        return match is not None and match.group(2).lower() == level
+    return predicate
+
+def as_predicate(log_level):
+    """Accept a level name, a compiled predicate or None (no filtering), returning a predicate or None."""
+    if log_level is None or callable(log_level):
+        return log_level
+    return level_filter(log_level)
+
+def all_of(*predicates):
+    """Combine predicates (None meaning no filter) into one that requires all of them."""
+    predicates = [predicate for predicate in predicates if predicate is not None]
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda line: all(predicate(line) for predicate in predicates)
@@ -0,0 +1,172 @@
+import json
+import os
+from collections import Counter
+
+from .counter import WordCounter
+from .parser import MAX_RECORD_LINES, LogParser
+from .processor import LogProcessor
+
+READ_SIZE = 1 << 20  # Bytes read per batch while catching up
+
+class LogFollower:
+    """Keep word, search and level counts of a growing log up to date.
+
+    Only complete lines are consumed, so a line still being written is
+    picked up on the next poll. Rotation is detected by an inode change
+    (the path now names a new file) or by truncation. A stack trace counts
+    toward the level of its entry even when it arrives in a later poll.
+    """
+
+    def __init__(self, file_path, search_words=None, log_level=None, checkpoint_path=None):
+        self.file_path = file_path
+        self.search_words = [word.lower() for word in search_words or []]
+        self.log_level = log_level
+        self.checkpoint_path = checkpoint_path
+        self.file = None
+        self.inode = None
+        self.offset = 0
+        self.word_counts = Counter()
+        self.search_counts = Counter()
+        self.level_counts = Counter()
+        self.record_level = None  # Level of the entry that continuation lines belong to
+        self.continuation_lines = 0
+
+    def _query(self):
+        """The options the counters were computed for; a checkpoint only resumes the same query."""
+        return {'search_words': self.search_words, 'log_level': self.log_level}
+
+    def load_checkpoint(self):
+        """Resume offset and counters from the checkpoint file. Returns True if resumed."""
+        if not self.checkpoint_path:
+            return False
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if state.get('query') != self._query():
+            return False
+
+        self.inode = state['inode']
+        self.offset = state['offset']
+        self.word_counts = Counter(state['word_counts'])
+        self.search_counts = Counter(state['search_counts'])
+        self.level_counts = Counter(state['level_counts'])
+        self.record_level = state.get('record_level')
+        self.continuation_lines = state.get('continuation_lines', 0)
+        return True
+
+    def save_checkpoint(self):
+        """Write offset and counters atomically to the checkpoint file."""
+        if not self.checkpoint_path:
+            return
+        state = {
+            'query': self._query(),
+            'inode': self.inode,
+            'offset': self.offset,
+            'word_counts': self.word_counts,
+            'search_counts': self.search_counts,
+            'level_counts': self.level_counts,
+            'record_level': self.record_level,
+            'continuation_lines': self.continuation_lines,
+        }
+        tmp_path = f"{self.checkpoint_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _open(self):
+        """Open the file at the path, resuming at the saved offset if it is the same file."""
+        file = open(self.file_path, 'rb')
+        st = os.fstat(file.fileno())
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.offset = 0  # A different (rotated) or truncated file
+            self.record_level = None
+        self.inode = st.st_ino
+        file.seek(self.offset)
+        self.file = file
+
+    def _rotated(self):
+        """Check whether the path now names another file, or the file was truncated."""
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return False  # Between rename and re-create: keep reading the old file
+        return st.st_ino != self.inode or st.st_size < self.offset
+
+    def _level_lines(self, lines):
+        """Yield the lines of log_level's records, continuing the last record of the previous batch.
+
+        Records are cut after MAX_RECORD_LINES continuation lines, as by
+        LogParser.iter_records, but nothing needs buffering: a continuation
+        line only needs the level of its entry.
+        """
+        level = self.log_level.upper()
+        for line in lines:
+            entry = LogParser.parse_log_entry(line)
+            if entry:
+                self.record_level = entry.loglevel
+                self.continuation_lines = 0
+            elif self.record_level is not None:
+                self.continuation_lines += 1
+                if self.continuation_lines > MAX_RECORD_LINES:
+                    self.record_level = None
+            if self.record_level == level:
+                yield line
+
+    def _consume(self, lines):
+        """Update every counter with a batch of complete lines."""
+        WordCounter(lines).count_words(self.word_counts)
+        if self.search_words and self.log_level:
+            # Unfiltered searches are answered from word_counts directly
+            level_word_counts = WordCounter(self._level_lines(lines)).count_words()
+            for word in self.search_words:
+                self.search_counts[word] += level_word_counts[word]
+        LogProcessor(lines).count_log_levels(self.level_counts)
+
+    def _read_new_lines(self):
+        """Consume the complete lines appended since the last read. Returns True if any."""
+        changed = False
+        while True:
+            self.file.seek(self.offset)
+            data = self.file.read(READ_SIZE)
+            end = data.rfind(b'\n') + 1
+            if end == 0:
+                # No complete line yet (or one longer than READ_SIZE: read it whole)
+                if len(data) < READ_SIZE:
+                    return changed
+                self.file.seek(self.offset)
+                data = self.file.readline()
+                if not data.endswith(b'\n'):
+                    return changed
+                end = len(data)
+            self._consume([line.decode('utf-8') for line in data[:end].splitlines(keepends=True)])
+            self.offset += end
+            changed = True
+
+    def poll(self):
+        """Process new bytes, following rotation. Returns True if the counters changed."""
+        if self.file is None:
+            self._open()
+        changed = self._read_new_lines()
+        if self._rotated():
+            # Drain what was written to the old file before switching
+            changed = self._read_new_lines() or changed
+            self.file.close()
+            self._open()
+            changed = self._read_new_lines() or changed
+        return changed
+
+    def top_words(self, top_n):
+        """Return the top N words so far, like WordCounter.count_top_words."""
+        return self.word_counts.most_common(top_n)
+
+    def search_results(self):
+        """Return the search counts so far, like WordCounter.search_specific_words."""
+        counts = self.search_counts if self.log_level else self.word_counts
+        return [(word, counts.get(word, 0)) for word in self.search_words]
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,91 @@
+import re
+from array import array
+
+_BUCKET_RE = re.compile(r'^(\d+)(ms|s|m|h|d)$')
+_UNIT_MS = {'ms': 1, 's': 1000, 'm': 60000, 'h': 3600000, 'd': 86400000}
+GROUP_BY = ('logger', 'thread')
+
+def parse_bucket(value):
+    """Convert a bucket size such as '30s', '1m' or '1h' to milliseconds."""
+    match = _BUCKET_RE.match(value or '')
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid bucket size '{value}', expected e.g. 500ms, 30s, 1m, 1h or 1d")
+    return int(match.group(1)) * _UNIT_MS[match.group(2)]
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
+
+def bucket_counts(timestamps, keys, bucket_ms, num_keys):
+    """Count rows per (time bucket, key) from integer columns.
+
+    Buckets are epoch milliseconds // bucket_ms. Returns (buckets, keys,
+    counts), three equal-length lists sorted by bucket and then key, with
+    only the pairs that occur, so memory follows the rows rather than the
+    time span. With NumPy this is one integer division and one np.unique.
+    """
+    if not len(timestamps):
+        return [], [], []
+    np = _numpy()
+    if np is not None:
+        buckets = np.frombuffer(timestamps, dtype=np.int64) // bucket_ms
+        first = int(buckets.min())
+        flat = (buckets - first) * num_keys + np.asarray(keys, dtype=np.int64)
+        pairs, counts = np.unique(flat, return_counts=True)
+        return (pairs // num_keys + first).tolist(), (pairs % num_keys).tolist(), counts.tolist()
+
+    pair_counts = {}
+    for timestamp, key in zip(timestamps, keys):
+        pair = (timestamp // bucket_ms, key)
+        pair_counts[pair] = pair_counts.get(pair, 0) + 1
+    pairs = sorted(pair_counts)
+    return [bucket for bucket, _ in pairs], [key for _, key in pairs], [pair_counts[pair] for pair in pairs]
+
+def _group_keys(table, by):
+    """Return (group_names, keys) with keys = group_index * num_levels + level_code."""
+    num_levels = len(table.level_names)
+    ids = table.loggers if by == 'logger' else table.threads
+    np = _numpy()
+    if np is not None:
+        unique, inverse = np.unique(np.frombuffer(ids, dtype=np.uint32), return_inverse=True)
+        keys = inverse.astype(np.int64) * num_levels + np.frombuffer(table.levels, dtype=np.uint8)
+        return [table.names[name_id] for name_id in unique.tolist()], keys
+
+    # Sorted ids, as np.unique returns them, so both paths order groups alike
+    dense = {name_id: index for index, name_id in enumerate(sorted(set(ids)))}
+    keys = array('q', (dense[name_id] * num_levels + level for name_id, level in zip(ids, table.levels)))
+    return [table.names[name_id] for name_id in dense], keys
+
+def histogram(table, bucket_ms, by=None):
+    """Aggregate a LogTable into per-bucket counts by level, optionally split by logger or thread.
+
+    Returns (levels, rows): levels are the column names in sorted order, and
+    each row is (bucket_start_ms, group, counts) with one count per level.
+    Without `by`, group is None. Buckets (and groups) with no entries are
+    left out, so a tiny bucket over a long span costs nothing extra.
+    """
+    num_levels = len(table.level_names)
+    order = sorted(range(num_levels), key=table.level_names.__getitem__)
+    if by is None:
+        groups = [None]
+        keys = table.levels
+    elif by in GROUP_BY:
+        groups, keys = _group_keys(table, by)
+    else:
+        raise ValueError(f"Cannot group a histogram by '{by}', expected one of: {', '.join(GROUP_BY)}")
+
+    buckets, keys, counts = bucket_counts(table.timestamps, keys, bucket_ms, len(groups) * num_levels)
+    rows = []
+    current = None
+    for bucket, key, count in zip(buckets, keys, counts):
+        group_index, code = divmod(key, num_levels)
+        if (bucket, group_index) != current:
+            current = (bucket, group_index)
+            row = [0] * num_levels
+            rows.append((bucket * bucket_ms, groups[group_index], row))
+        row[code] = count
+    return ([table.level_names[code] for code in order],
+            [(start, group, [row[code] for code in order]) for start, group, row in rows])
@@ -0,0 +1,156 @@
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+from .cache import file_identity
+from .parser import ENTRY_RE, MAX_RECORD_LINES, LogParser
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'LOGIDX1\n'
+TIME_STEP = 1024  # Keep one timestamp -> offset pair per TIME_STEP entries
+TIMESTAMP_WIDTH = 23  # len('YYYY-MM-DD HH:MM:SS,mmm')
+
+class LogIndex:
+    """Sidecar index of line byte offsets grouped by log level,
+    plus a sparse timestamp -> offset table."""
+
+    def __init__(self, identity, level_offsets, time_stamps, time_offsets):
+        self.identity = identity
+        self.level_offsets = level_offsets  # level -> array('Q') of line offsets
+        self.time_stamps = time_stamps      # sorted sample of timestamps
+        self.time_offsets = time_offsets    # array('Q') of their line offsets
+
+    @staticmethod
+    def index_path(file_path):
+        return file_path + INDEX_SUFFIX
+
+    @classmethod
+    def build(cls, file_path):
+        """Build an index in a single pass over the file."""
+        identity = file_identity(file_path)
+        level_offsets = {}
+        time_stamps = []
+        time_offsets = array('Q')
+        entries = 0
+
+        with open(file_path, 'rb') as file:
+            offset = 0
+            for raw in file:
+                entry = LogParser.parse_log_entry(raw.decode('utf-8'))
+                if entry:
+                    if entry.loglevel not in level_offsets:
+                        level_offsets[entry.loglevel] = array('Q')
+                    level_offsets[entry.loglevel].append(offset)
+                    if entries % TIME_STEP == 0 and entry.timestamp.isascii():
+                        time_stamps.append(entry.timestamp)
+                        time_offsets.append(offset)
+                    entries += 1
+                offset += len(raw)
+
+        return cls(identity, level_offsets, time_stamps, time_offsets)
+
+    @classmethod
+    def load(cls, index_path):
+        """Load an index written by save()."""
+        import json
+        with open(index_path, 'rb') as file:
+            if file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"Not a log index: {index_path}")
+            header = json.loads(file.readline().decode('utf-8'))
+            if header['byteorder'] != sys.byteorder:
+                raise ValueError(f"Index written on a different byte order: {index_path}")
+
+            level_offsets = {}
+            for level, count in header['levels']:
+                offsets = array('Q')
+                offsets.fromfile(file, count)
+                level_offsets[level] = offsets
+
+            time_count = header['time_count']
+            stamps = file.read(time_count * TIMESTAMP_WIDTH).decode('ascii')
+            time_stamps = [stamps[i:i + TIMESTAMP_WIDTH] for i in range(0, len(stamps), TIMESTAMP_WIDTH)]
+            time_offsets = array('Q')
+            time_offsets.fromfile(file, time_count)
+
+        return cls(header['identity'], level_offsets, time_stamps, time_offsets)
+
+    def save(self, index_path):
+        """Write the index atomically next to the log file."""
+        header = {
+            'identity': self.identity,
+            'byteorder': sys.byteorder,
+            'levels': [[level, len(offsets)] for level, offsets in self.level_offsets.items()],
+            'time_count': len(self.time_offsets),
+        }
+        import json
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(INDEX_MAGIC)
+            file.write(json.dumps(header).encode('utf-8') + b'\n')
+            for offsets in self.level_offsets.values():
+                offsets.tofile(file)
+            file.write(''.join(self.time_stamps).encode('ascii'))
+            self.time_offsets.tofile(file)
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def open(cls, file_path):
+        """Load the sidecar index of a file, rebuilding it when the file changed."""
+        index_path = cls.index_path(file_path)
+        identity = file_identity(file_path)
+        try:
+            index = cls.load(index_path)
+            if index.identity == identity:
+                return index
+        except (OSError, EOFError, ValueError, KeyError):
+            pass  # Missing, stale or corrupt: rebuild below
+
+        index = cls.build(file_path)
+        try:
+            index.save(index_path)
+        except OSError:
+            pass  # Read-only location: use the index for this run only
+        return index
+
+    def offset_range(self, is_past, size):
+        """Return a byte range [lo, hi] holding the first entry for which is_past(timestamp) holds.
+
+        is_past must flip from False to True once over the ascending timestamps;
+        the range runs from the last sample before the flip to the first one after it.
+        """
+        lo, hi = 0, len(self.time_stamps)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if is_past(self.time_stamps[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        start = self.time_offsets[lo - 1] if lo > 0 else 0
+        end = self.time_offsets[lo] if lo < len(self.time_offsets) else size
+        return start, end
+
+    def iter_level_lines(self, file_path, log_level, start=0, end=None, records=False):
+        """Yield the lines of one log level by seeking straight to them,
+        optionally only those starting in the byte range [start, end).
+
+        With records=True each entry comes with its continuation lines,
+        up to MAX_RECORD_LINES of them, as LogParser.iter_records joins them.
+        """
+        offsets = self.level_offsets.get(log_level.upper(), array('Q'))
+        first = bisect_left(offsets, start)
+        last = len(offsets) if end is None else bisect_left(offsets, end)
+        with open(file_path, 'rb') as file:
+            for offset in offsets[first:last]:
+                file.seek(offset)
+                line = file.readline().decode('utf-8')
+                if not records:
+                    yield line
+                    continue
+                record = [line]
+                while len(record) <= MAX_RECORD_LINES:
+                    line = file.readline().decode('utf-8')
+                    if not line or ENTRY_RE.match(line):
+                        break
+                    record.append(line)
+                yield ''.join(record)
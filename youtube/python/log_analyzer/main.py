@@ -1,21 +1,29 @@
 import sys
 
-# Import from the parser
-from parser import LogParser
-from cli import CLIHandler
+if __package__:
+    from .cli import CLIHandler
+else:
+    # Run as a script (python3 main.py): import the package from the directory above
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from log_analyzer.cli import CLIHandler
 
-# Driver code
-if __name__ == "__main__":
+def main():
+    """Console entry point: log-analyzer <file_path> [options]."""
     # Passing the file path in the terminal when exucting the program/script
     if len(sys.argv) < 2:
-        print("Usage: python3 main.py <file_path> [top_n | --search word1 word2 ... [--level_log LEVEL]")
+        print("Usage: python3 main.py <file_path> [top_n [--workers N] [--tokenizer regex|mmap] [--approx [--capacity N] [--save_sketch PATH] [--merge_sketch PATH ...]] | --search word1 word2 ... [--level_log LEVEL] [--index] | --level_log LEVEL [--index]] [--since TIME] [--until TIME] [--where EXPR] [--format text|json|ndjson|csv] [--no-cache] [--profile [--profile_stats PATH] [--profile_memory]] [--follow [--interval S] [--checkpoint PATH]]")
         sys.exit(1)
 
     # Get the file path
     file_path = sys.argv[1]
     try:
-        lines = LogParser.read_file(file_path)
-        CLIHandler.parse_args_and_run(lines)
+        # Lines are streamed lazily by the command handlers
+        CLIHandler.parse_args_and_run(file_path)
     except Exception as e:
         print(f"Unexpected error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+# Driver code
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import heapq
+import re
+from operator import itemgetter
+
+from .parser import ENTRY_RE, MAX_RECORD_LINES, LogParser
+
+READ_AHEAD = 1024  # Lines buffered per source
+_LINE_RE = re.compile(r'[^\n]*\n|[^\n]+')
+
+def iter_records(lines, read_ahead=READ_AHEAD):
+    """Key the records LogParser.iter_records assembles by the timestamp of their first line.
+
+    Lines that stand alone without a timestamp (before the first entry, or past
+    MAX_RECORD_LINES) take the timestamp of the record before them, or ''.
+    """
+    timestamp = ''
+    for record in LogParser.iter_records(lines, batch_size=read_ahead):
+        match = ENTRY_RE.match(record)
+        if match:
+            timestamp = match.group(1)
+        yield timestamp, record
+
+def merge_records(sources, read_ahead=READ_AHEAD):
+    """Merge line iterables that are each in timestamp order into one ordered record stream.
+
+    A heap holds one pending record per source, so memory is bounded by
+    len(sources) * (read_ahead + MAX_RECORD_LINES) lines however long the
+    sources are. Records with equal timestamps keep the order of their sources.
+    """
+    return heapq.merge(*(iter_records(lines, read_ahead) for lines in sources), key=itemgetter(0))
+
+def merge_lines(paths, read_ahead=READ_AHEAD):
+    """Yield the lines of several sorted (possibly compressed) log files interleaved by timestamp."""
+    for _, record in merge_records([LogParser.iter_lines(path) for path in paths], read_ahead):
+        yield from _LINE_RE.findall(record)
@@ -0,0 +1,120 @@
+import sys
+
+OUTPUT_FORMATS = ('text', 'json', 'ndjson', 'csv')
+WRITE_BUFFER = 1 << 16  # Characters collected per write to stdout
+ENTRY_FIELDS = ('timestamp', 'loglevel', 'thread', 'logger')  # As in the --json query document
+
+class OutputBuffer:
+    """Collect text and write it to a stream in large chunks.
+
+    Writes go straight to the binary buffer under a text stream when it has
+    one, skipping the per-call overhead of the text layer.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.binary = getattr(self.stream, 'buffer', None)
+        self.encoding = getattr(self.stream, 'encoding', None) or 'utf-8'
+        self.errors = getattr(self.stream, 'errors', None) or 'strict'
+        self.parts = []
+        self.size = 0
+
+    def __enter__(self):
+        # Text printed earlier must come out before the chunks written below it
+        self.stream.flush()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+        if self.binary is not None:
+            self.binary.flush()
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= WRITE_BUFFER:
+            self.flush()
+
+    def flush(self):
+        if not self.parts:
+            return
+        chunk = ''.join(self.parts)
+        self.parts = []
+        self.size = 0
+        if self.binary is not None:
+            self.binary.write(chunk.encode(self.encoding, self.errors))
+        else:
+            self.stream.write(chunk)
+
+def _json_formatters():
+    """Return (result_json, entry_json) functions, importing the C string encoder on first use."""
+    from json.encoder import encode_basestring
+
+    def string(value):
+        return 'null' if value is None else encode_basestring(value)
+
+    def result_json(word, count):
+        return f'{{"word": {encode_basestring(word)}, "count": {count}}}'
+
+    def entry_json(entry):
+        # Timestamps and levels are matched by [\d :,-] and \w, so they never need escaping
+        return (f'{{"timestamp": "{entry.timestamp}", "loglevel": "{entry.loglevel}", '
+                f'"thread": {string(entry.thread)}, "logger": {string(entry.logger)}}}')
+    return result_json, entry_json
+
+def _write_json_array(out, items):
+    """Write items (JSON texts) as an array, one element per line."""
+    out.write('[')
+    separator = '\n  '
+    for item in items:
+        out.write(separator)
+        out.write(item)
+        separator = ',\n  '
+    out.write('\n]\n' if separator != '\n  ' else ']\n')
+
+def write_results(result, output_format, prefix="", stream=None):
+    """Write (word, count) rows as text lines, a JSON array, NDJSON or CSV."""
+    with OutputBuffer(stream) as out:
+        if output_format == 'text':
+            if prefix:
+                out.write(f"{prefix}\n")
+            if not result:
+                out.write("No results found\n")
+            for word, count in result:
+                out.write(f"{word} : {count}\n")
+        elif output_format == 'json':
+            result_json, _ = _json_formatters()
+            _write_json_array(out, (result_json(word, count) for word, count in result))
+        elif output_format == 'ndjson':
+            result_json, _ = _json_formatters()
+            for word, count in result:
+                out.write(result_json(word, count) + '\n')
+        else:
+            import csv
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(('word', 'count'))
+            writer.writerows(result)
+
+def write_log_entries(log_level, entries, output_format, stream=None):
+    """Write LogEntry rows as text lines, a JSON array, NDJSON or CSV, streaming them as they come."""
+    with OutputBuffer(stream) as out:
+        if output_format == 'text':
+            out.write(f"Log entries for {log_level.upper()} (Timestamp, Log Level):\n")
+            found = False
+            for entry in entries:
+                out.write(f"{entry.timestamp} : {entry.loglevel}\n")
+                found = True
+            if not found:
+                out.write(f"No log level found for {log_level.upper()}\n")
+        elif output_format == 'json':
+            _, entry_json = _json_formatters()
+            _write_json_array(out, map(entry_json, entries))
+        elif output_format == 'ndjson':
+            _, entry_json = _json_formatters()
+            for entry in entries:
+                out.write(entry_json(entry) + '\n')
+        else:
+            import csv
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(ENTRY_FIELDS)
+            writer.writerows((entry.timestamp, entry.loglevel, entry.thread, entry.logger) for entry in entries)
@@ -0,0 +1,85 @@
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+from .parser import LogParser, BLOCK_SIZE
+from .counter import WordCounter
+from .sketch import SpaceSaving
+from . import tokenizer
+
+# Ranges handed out per worker, so one slow range doesn't stall the pool
+RANGES_PER_WORKER = 4
+
+def split_ranges(file_path, parts, start=0, end=None):
+    """Split a file (or the byte range [start, end) of it) into at most
+    `parts` byte ranges that start on line boundaries."""
+    end = os.path.getsize(file_path) if end is None else end
+    if end <= start:
+        return []
+
+    boundaries = [start]
+    with open(file_path, 'rb') as file:
+        for i in range(1, parts):
+            file.seek(max(start + (end - start) * i // parts, boundaries[-1]))
+            # Move to the start of the next line
+            file.readline()
+            offset = file.tell()
+            if offset >= end:
+                break
+            if offset > boundaries[-1]:
+                boundaries.append(offset)
+    boundaries.append(end)
+    return list(zip(boundaries, boundaries[1:]))
+
+def count_range(task):
+    """Count words in one byte range of a file. Runs inside a worker process.
+
+    Returns a Counter, or a SpaceSaving sketch when a capacity is given.
+    """
+    file_path, start, end, backend, capacity = task
+    if backend == 'mmap':
+        blocks = tokenizer.iter_blocks(file_path, start, end)
+    else:
+        blocks = LogParser.read_blocks(file_path, BLOCK_SIZE, start, end)
+    counter = WordCounter(blocks)
+    return counter.count_sketch(capacity) if capacity else counter.count_words()
+
+class ParallelWordCounter:
+    def __init__(self, file_path, workers, backend='regex', start=0, end=None):
+        self.file_path = file_path
+        self.workers = workers
+        self.backend = backend
+        self.start = start
+        self.end = end
+
+    def _map_ranges(self, capacity=None):
+        """Yield the partial result of every byte range, in file order."""
+        ranges = split_ranges(self.file_path, self.workers * RANGES_PER_WORKER, self.start, self.end)
+        tasks = [(self.file_path, start, end, self.backend, capacity) for start, end in ranges]
+
+        if self.workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield count_range(task)
+            return
+
+        with Pool(min(self.workers, len(tasks))) as pool:
+            yield from pool.imap(count_range, tasks)
+
+    def count_words(self):
+        """Count every word of the file across worker processes."""
+        word_counts = Counter()
+        # Merge in file order so ties rank exactly as in a single pass
+        for partial in self._map_ranges():
+            word_counts.update(partial)
+        return word_counts
+
+    def count_top_words(self, top_n):
+        """Count top N most common words, matching WordCounter.count_top_words."""
+        return self.count_words().most_common(top_n)
+
+    def count_sketch(self, capacity):
+        """Merge per-range Space-Saving sketches into one bounded-memory summary."""
+        sketch = SpaceSaving(capacity)
+        for partial in self._map_ranges(capacity):
+            sketch.merge(partial)
+        return sketch
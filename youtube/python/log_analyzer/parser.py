@@ -1,29 +1,251 @@
+import importlib
 import re
-from dataclasses import dataclass
+from itertools import islice
+
+BLOCK_SIZE = 1 << 20  # 1 MiB of text per block
+MAX_RECORD_LINES = 1000  # Continuation lines joined to one entry; any further ones are passed on alone
+RECORD_BATCH = 1024  # Lines read at a time while assembling records
+
+# Compressed formats recognized by their leading magic bytes, with the module
+# that opens them (imported only when such a file is read)
+COMPRESSION_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'lzma'),
+)
+
+ENTRY_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\s+(\w+)')
+# General record pattern: thread and logger are optional, separators any whitespace
+RECORD_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\s+(\w+)'
+                       r'(?:\s+\[([^\]]*)\]\s+(\S+)(?:\s+-)?)?\s*(.*)')
+# Fixed log4j-style layout 'ts LEVEL [thread] logger - message': single-space
+# separators and no optional groups, so it matches without backtracking.
+# Whenever it matches, its groups equal RECORD_RE's.
+LAYOUT_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) (\w+) +\[([^\]]*)\] (\S+) - \s*(.*)')
+# A newline followed by a line that ENTRY_RE does not match, in text of several
+# lines (whose whitespace after the timestamp must not run into the next line)
+CONTINUATION_RE = re.compile(r'\n(?!\Z|\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}[^\S\n]+\w)')
+
+def record_message(match, text):
+    """The message of a LAYOUT_RE or RECORD_RE match, with the continuation lines of a multiline record."""
+    # The message group stops at the first newline; only a record has more after it
+    if len(text) - match.end() > 1:
+        return text[match.start(5):].rstrip('\n')
+    return match.group(5)
 
-@dataclass
 class LogEntry:
-    timestamp: str
-    loglevel: str
+    """One parsed log line or multiline record, with the constructor, repr and equality of a dataclass.
+
+    Written out by hand because importing dataclasses would take longer than
+    the rest of the CLI's startup.
+    """
+
+    __slots__ = ('timestamp', 'loglevel', 'thread', 'logger', 'message')
+    __hash__ = None  # Mutable and compared by value, like a dataclass
+
+    def __init__(self, timestamp, loglevel, thread=None, logger=None, message=None):
+        self.timestamp = timestamp
+        self.loglevel = loglevel
+        self.thread = thread
+        self.logger = logger
+        self.message = message
+
+    def _fields(self):
+        return (self.timestamp, self.loglevel, self.thread, self.logger, self.message)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    def __repr__(self):
+        return (f"LogEntry(timestamp={self.timestamp!r}, loglevel={self.loglevel!r}, thread={self.thread!r}, "
+                f"logger={self.logger!r}, message={self.message!r})")
 
 class LogParser:
+    def _compressed_opener(file_path):
+        """Return gzip.open, bz2.open or lzma.open if the file starts with their magic bytes."""
+        with open(file_path, 'rb') as file:
+            head = file.read(6)
+        for magic, module in COMPRESSION_MAGIC:
+            if head.startswith(magic):
+                return importlib.import_module(module).open
+        return None
+
+    def is_compressed(file_path):
+        """Check whether a file is gzip, bz2 or xz compressed."""
+        return LogParser._compressed_opener(file_path) is not None
+
+    def open_text(file_path):
+        """Open a plain or compressed file for reading UTF-8 text, decompressing as it is read."""
+        opener = LogParser._compressed_opener(file_path)
+        if opener is None:
+            return open(file_path, 'r', encoding='utf-8')
+        return opener(file_path, 'rt', encoding='utf-8')
+
     def read_file(file_path):
         """Define how to read a file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with LogParser.open_text(file_path) as file:
                 return file.readlines()
         except (FileNotFoundError, PermissionError) as err:
             print(f"Error accessing file: {err}")
             raise # Raise to handle in caller
 
+    def iter_lines(file_path, start=0, end=None):
+        """Lazily yield the lines of a file, one at a time.
+
+        start and end restrict reading to a byte range aligned to line starts.
+        """
+        try:
+            if start == 0 and end is None:
+                with LogParser.open_text(file_path) as file:
+                    yield from file
+                return
+            with open(file_path, 'rb') as file:
+                file.seek(start)
+                offset = start
+                for raw in file:
+                    if end is not None and offset >= end:
+                        break
+                    offset += len(raw)
+                    yield raw.decode('utf-8')
+        except (FileNotFoundError, PermissionError) as err:
+            print(f"Error accessing file: {err}")
+            raise # Raise to handle in caller
+
+    def read_blocks(file_path, block_size=BLOCK_SIZE, start=0, end=None):
+        """Lazily yield blocks of whole lines, roughly block_size characters each.
+
+        start and end restrict reading to a byte range aligned to line starts.
+        """
+        try:
+            if start != 0 or end is not None:
+                for block in LogParser._read_byte_blocks(file_path, block_size, start, end):
+                    yield block.decode('utf-8')
+                return
+            with LogParser.open_text(file_path) as file:
+                while True:
+                    block = file.read(block_size)
+                    if not block:
+                        break
+                    # Complete the last line so no word is split across blocks
+                    if not block.endswith('\n'):
+                        block += file.readline()
+                    yield block
+        except (FileNotFoundError, PermissionError) as err:
+            print(f"Error accessing file: {err}")
+            raise # Raise to handle in caller
+
+    def _read_byte_blocks(file_path, block_size, start, end):
+        """Yield bytes blocks of whole lines from the range [start, end)."""
+        with open(file_path, 'rb') as file:
+            file.seek(0, 2)
+            end = file.tell() if end is None else end
+            file.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                block = file.read(min(block_size, remaining))
+                if not block:
+                    break
+                # Complete the last line; the range ends on a line boundary
+                if not block.endswith(b'\n') and len(block) < remaining:
+                    block += file.readline(remaining - len(block))
+                remaining -= len(block)
+                yield block
+
+    def iter_records(lines, max_lines=MAX_RECORD_LINES, batch_size=RECORD_BATCH):
+        """Lazily join continuation lines (stack trace frames and other lines
+        without a timestamp) to the entry before them, yielding one string per record.
+
+        Lines are read batch_size at a time and only the record being
+        assembled is kept beyond that, so memory stays bounded: after
+        max_lines continuation lines a record is cut, and the rest of its
+        lines are yielded one by one, as are lines before the first entry.
+        """
+        lines = iter(lines)
+        entry = None  # First line of the record being assembled
+        continuation = None  # Its continuation lines, if any
+        while True:
+            batch = list(islice(lines, batch_size))
+            if not batch:
+                break
+            # One regex scan over the batch finds where continuation lines start
+            text = ''.join(batch)
+            starts = {match.end() for match in CONTINUATION_RE.finditer(text)}
+            if not ENTRY_RE.match(batch[0]):
+                starts.add(0)
+            if not starts:
+                # Every line starts an entry: only the last can still grow
+                if entry is not None:
+                    yield entry if continuation is None else entry + ''.join(continuation)
+                yield from islice(batch, len(batch) - 1)
+                entry = batch[-1]
+                continuation = None
+                continue
+
+            offset = 0
+            for line in batch:
+                if offset not in starts:
+                    if entry is not None:
+                        yield entry if continuation is None else entry + ''.join(continuation)
+                    entry = line
+                    continuation = None
+                elif entry is None:
+                    yield line
+                else:
+                    if continuation is None:
+                        continuation = [line]
+                    else:
+                        continuation.append(line)
+                    if len(continuation) >= max_lines:
+                        yield entry + ''.join(continuation)
+                        entry = None
+                offset += len(line)
+        if entry is not None:
+            yield entry if continuation is None else entry + ''.join(continuation)
+
     def extract_words(text):
         """Extract words from text using regex"""
         return re.findall(r'\b\w+\b', text.lower())
 
     def parse_log_entry(line):
         """Parse timestamp and log level from a log line."""
-        match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})\s+(\w+)', line)
+        match = ENTRY_RE.match(line)
         if match:
             return LogEntry(timestamp=match.group(1), loglevel=match.group(2).upper())
         else:
             return None
+
+    def parse_log_record(line):
+        """Parse timestamp, log level, [thread], logger and message from a log line or record."""
+        match = LAYOUT_RE.match(line) or RECORD_RE.match(line)
+        if match:
+            timestamp, loglevel, thread, logger, message = match.groups()
+            if len(line) - match.end() > 1:
+                message = record_message(match, line)
+            return LogEntry(timestamp, loglevel.upper(), thread, logger, message)
+        else:
+            return None
+
+    def parse_many(lines):
+        """Parse a batch of lines (or records) into columns, skipping lines without a timestamp.
+
+        Returns a dict of equal-length lists keyed by timestamp, loglevel,
+        thread, logger and message.
+        """
+        timestamps, levels, threads, loggers, messages = [], [], [], [], []
+        layout_match = LAYOUT_RE.match
+        record_match = RECORD_RE.match
+        for line in lines:
+            match = layout_match(line) or record_match(line)
+            if match is None:
+                continue
+            fields = match.groups()
+            timestamps.append(fields[0])
+            levels.append(fields[1].upper())
+            threads.append(fields[2])
+            loggers.append(fields[3])
+            messages.append(fields[4] if len(line) - match.end() <= 1 else record_message(match, line))
+        return {'timestamp': timestamps, 'loglevel': levels, 'thread': threads,
+                'logger': loggers, 'message': messages}
@@ -1,16 +1,62 @@
-from parser import LogParser, LogEntry
+from collections import Counter
+
+from .parser import LogParser, LogEntry
+from .table import LogTable
+from .filters import as_predicate
 
 class LogProcessor:
     def __init__(self, lines):
         self.lines = lines
 
-    def get_log_entries_by_level(self, log_level):
-        """Get log entries for a specific log level."""
-        log_entries = []
+    def get_log_entries_by_level(self, log_level, as_table=False):
+        """Get log entries for a specific log level.
+
+        With as_table=True a columnar LogTable (which also keeps the thread
+        and logger of each entry) is returned instead of a list.
+        """
+        if as_table:
+            return self.get_log_table(log_level)
+        return list(self.iter_log_entries_by_level(log_level))
+
+    def get_log_table(self, log_level=None):
+        """Collect the entries of one log level (all levels by default) into a LogTable.
+
+        log_level may also be a predicate from filters.compile_filter. Stack
+        traces and other continuation lines are part of their entry's message.
+        """
+        table = LogTable()
+        matches = as_predicate(log_level)
+        for line in LogParser.iter_records(self.lines):
+            if matches and not matches(line):
+                continue
+            entry = LogParser.parse_log_record(line)
+            if entry:
+                table.append(entry)
+        return table
+
+    def iter_log_entries_by_level(self, log_level, full=False):
+        """Lazily yield log entries for a specific log level (or matching a compiled filter).
+
+        The filter sees whole records: an entry with its continuation lines.
+        Entries carry only timestamp and level unless full=True, which also
+        parses thread, logger and message (see LogParser.parse_log_record).
+        """
+        matches = as_predicate(log_level)
+        parse = LogParser.parse_log_record if full else LogParser.parse_log_entry
+        for line in LogParser.iter_records(self.lines):
+            if not matches(line):
+                continue
+            entry = parse(line)
+            if entry:
+                yield entry
+
+    def count_log_levels(self, level_counts=None):
+        """Add the number of entries per log level to a Counter (a new one by default)."""
+        if level_counts is None:
+            level_counts = Counter()
         for line in self.lines:
             entry = LogParser.parse_log_entry(line)
-            if entry and entry.loglevel.lower() == log_level.lower():
-                log_entries.append(entry)
-
-        return log_entries
+            if entry:
+                level_counts[entry.loglevel] += 1
+        return level_counts
 
@@ -0,0 +1,241 @@
+import cProfile
+import functools
+import inspect
+import sys
+import time
+import tracemalloc
+
+from .parser import LogParser
+from .counter import WordCounter
+from .processor import LogProcessor
+from . import tokenizer
+
+OUTSIDE = 'other'  # Time outside every hooked stage: startup, argument parsing, caching
+STAGE_ORDER = ('read', 'parse', 'tokenize', 'count', 'process', 'command', 'print', OUTSIDE)
+TOP_ALLOCATIONS = 10  # Lines listed by --profile_memory
+MEMORY_GROWTH = 1.1  # Growth over the last snapshot that triggers a new one
+MIN_SNAPSHOT = 1 << 20  # Growth over the baseline before the first peak snapshot
+
+def _public_methods(cls):
+    return tuple(name for name, value in vars(cls).items()
+                 if not name.startswith('_') and inspect.isfunction(value))
+
+def _stage_hooks():
+    """Return (stage, owner, names, text_arg) for every hooked function.
+
+    text_arg is the position of the text argument whose size is recorded,
+    or None; generators record the size of what they yield instead.
+    """
+    from .cli import CLIHandler
+    return (
+        ('read', LogParser, ('read_file', 'iter_lines', 'read_blocks'), None),
+        ('read', tokenizer, ('iter_blocks',), None),
+        ('parse', LogParser, ('iter_records', 'parse_log_entry', 'parse_log_record', 'parse_many'), 0),
+        ('tokenize', LogParser, ('extract_words',), 0),
+        ('tokenize', tokenizer, ('count_block',), 0),
+        ('tokenize', tokenizer.TermMatcher, ('count',), 1),
+        ('count', WordCounter, _public_methods(WordCounter), None),
+        ('process', LogProcessor, _public_methods(LogProcessor), None),
+        ('command', CLIHandler, tuple(name for name in vars(CLIHandler) if name.startswith('_handle_')), None),
+        ('print', CLIHandler, tuple(name for name in vars(CLIHandler) if name.startswith(('print_', '_print_'))), None),
+    )
+
+class StageStats:
+    __slots__ = ('calls', 'wall', 'cpu', 'lines', 'size')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.lines = 0
+        self.size = 0
+
+    def add_text(self, text):
+        self.size += len(text)
+        self.lines += text.count('\n' if isinstance(text, str) else b'\n') or 1
+
+    def add_item(self, item):
+        """Record one yielded item: text, or a parsed entry counted as one line."""
+        if isinstance(item, (str, bytes)):
+            self.add_text(item)
+        else:
+            self.lines += 1
+
+class StageProfiler:
+    """Exclusive wall and CPU time per pipeline stage.
+
+    Hooks wrap the functions of each stage while the profiler is installed;
+    every call into a stage, and every item pulled from a stage's generator,
+    switches the current stage, charging the time since the last switch to
+    the stage being left. Nested stages are therefore not double counted:
+    a WordCounter pulling lines from LogParser.iter_lines is charged only
+    for counting. Nothing is wrapped, so nothing costs, unless installed.
+    """
+
+    def __init__(self, memory=False):
+        self.stages = {stage: StageStats() for stage in STAGE_ORDER}
+        self.stack = [OUTSIDE]
+        self.switches = 0
+        self.memory = memory
+        self.baseline = None  # tracemalloc snapshot when the first stage starts, after startup
+        self.peak_snapshot = None  # tracemalloc snapshot near the memory high-water mark
+        self._baseline_size = 0
+        self._snapshot_size = 0
+        self._originals = []
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def _switch(self):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        stats = self.stages[self.stack[-1]]
+        stats.wall += wall - self._wall
+        stats.cpu += cpu - self._cpu
+        self._wall = wall
+        self._cpu = cpu
+        self.switches += 1
+        if self.memory:
+            self.check_memory()
+
+    def check_memory(self):
+        """Snapshot allocations when traced memory has grown, so the report shows the peak rather than the leftovers.
+
+        The first call takes the baseline that later snapshots are compared
+        against, so allocations made during startup are not attributed to a stage.
+        """
+        current, _ = tracemalloc.get_traced_memory()
+        if self.baseline is None:
+            self.baseline = tracemalloc.take_snapshot()
+            self._baseline_size = current
+        elif current > max(self._snapshot_size * MEMORY_GROWTH, self._baseline_size + MIN_SNAPSHOT):
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = current
+
+    def enter(self, stage):
+        self._switch()
+        self.stack.append(stage)
+
+    def leave(self):
+        self._switch()
+        self.stack.pop()
+
+    def _wrap(self, stage, function, text_arg):
+        stats = self.stages[stage]
+        enter = self.enter
+        leave = self.leave
+
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                stats.calls += 1
+                iterator = function(*args, **kwargs)
+                while True:
+                    enter(stage)
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        return
+                    finally:
+                        leave()
+                    stats.add_item(item)
+                    yield item
+            return wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            stats.calls += 1
+            if text_arg is not None:
+                stats.add_text(args[text_arg])
+            enter(stage)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                leave()
+        return wrapper
+
+    def install(self):
+        """Wrap every hooked function with the timing hooks."""
+        for stage, owner, names, text_arg in _stage_hooks():
+            for name in names:
+                original = vars(owner)[name]
+                self._originals.append((owner, name, original))
+                if isinstance(original, staticmethod):
+                    setattr(owner, name, staticmethod(self._wrap(stage, original.__func__, text_arg)))
+                else:
+                    setattr(owner, name, self._wrap(stage, original, text_arg))
+
+    def uninstall(self):
+        """Restore the original functions, closing the stage that is still open."""
+        self._switch()
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+    def overhead(self):
+        """Estimated seconds spent in the hooks themselves, by timing switches in a loop."""
+        probe = StageProfiler()
+        rounds = 10000
+        started = time.perf_counter()
+        for _ in range(rounds):
+            probe._switch()
+        return (time.perf_counter() - started) / rounds * self.switches
+
+    def report(self, file=sys.stderr):
+        """Print the per-stage breakdown table."""
+        total_wall = sum(stats.wall for stats in self.stages.values()) or 1e-9
+        print(f"{'Stage':<10} {'Calls':>9} {'Wall s':>9} {'Wall %':>7} {'CPU s':>9} "
+              f"{'Lines':>11} {'Bytes':>13} {'MB/s':>9}", file=file)
+        for stage in STAGE_ORDER:
+            stats = self.stages[stage]
+            if not stats.calls and stats.wall < 0.0005:
+                continue
+            rate = f"{stats.size / 10**6 / stats.wall:9.1f}" if stats.size and stats.wall else f"{'-':>9}"
+            print(f"{stage:<10} {stats.calls:>9} {stats.wall:>9.3f} {100 * stats.wall / total_wall:>6.1f}% "
+                  f"{stats.cpu:>9.3f} {stats.lines or '-':>11} {stats.size or '-':>13} {rate}", file=file)
+        total_cpu = sum(stats.cpu for stats in self.stages.values())
+        print(f"{'total':<10} {'':>9} {total_wall:>9.3f} {100.0:>6.1f}% {total_cpu:>9.3f}", file=file)
+        print(f"(includes about {self.overhead():.3f} s of profiling overhead over {self.switches} stage switches;"
+              f" bytes of decoded text are counted as characters)", file=file)
+
+def _report_allocations(baseline, snapshot, size, file=sys.stderr):
+    _, peak = tracemalloc.get_traced_memory()
+    if snapshot is None:
+        print(f"\nTraced memory: {peak / 2**20:.1f} MiB peak; the stages never grew it by"
+              f" {MIN_SNAPSHOT / 2**20:.0f} MiB, too little to attribute to allocation sites", file=file)
+        return
+    print(f"\nTraced memory: {peak / 2**20:.1f} MiB peak; top {TOP_ALLOCATIONS} allocation sites"
+          f" by growth since the first stage, when {size / 2**20:.1f} MiB was in use:", file=file)
+    filters = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+    statistics = snapshot.filter_traces(filters).compare_to(baseline.filter_traces(filters), 'lineno')
+    for statistic in [statistic for statistic in statistics if statistic.size_diff > 0][:TOP_ALLOCATIONS]:
+        print(f"  {statistic}", file=file)
+
+def run_profiled(function, stats_path=None, memory=False):
+    """Run function() under the stage profiler and print its report to stderr.
+
+    stats_path additionally dumps cProfile statistics for pstats/snakeviz,
+    and memory lists the top allocation sites recorded by tracemalloc.
+    """
+    profiler = StageProfiler(memory)
+    profile = cProfile.Profile() if stats_path else None
+    if memory:
+        tracemalloc.start()
+    profiler.install()
+    if profile:
+        profile.enable()
+    try:
+        function()
+    finally:
+        if profile:
+            profile.disable()
+        profiler.uninstall()
+        sys.stdout.flush()
+        print("\nProfile (exclusive time per stage):", file=sys.stderr)
+        profiler.report()
+        if memory:
+            profiler.check_memory()
+            _report_allocations(profiler.baseline, profiler.peak_snapshot, profiler._snapshot_size)
+            tracemalloc.stop()
+        if profile:
+            profile.dump_stats(stats_path)
+            print(f"cProfile statistics written to {stats_path}", file=sys.stderr)
@@ -0,0 +1,72 @@
+import io
+from collections import Counter
+from itertools import chain
+
+from .parser import ENTRY_RE, LogParser
+from .table import LogTable
+from .tokenizer import TermMatcher
+
+class QueryPlan:
+    """Answer several CLI outputs in one scan of the log.
+
+    Words are counted per block, as the word count command does, and search
+    terms are matched without tokenizing the rest of the text. When levels
+    are needed, each record's level is read off the cheap ENTRY_RE prefix
+    and only the records of a listed level are fully parsed.
+    """
+
+    def __init__(self, top_n=None, search_words=None, search_level=None, levels=None):
+        self.top_n = top_n
+        self.search_words = [word.lower() for word in search_words or []]
+        self.search_level = search_level.upper() if search_level else None
+        self.levels = [level.upper() for level in levels or []]
+
+    def execute(self, blocks):
+        """Run the plan over an iterable of text made of whole lines, such as
+        the blocks of LogParser.read_blocks or single lines.
+
+        Returns a dict with 'top_words' and 'search' as [(word, count)] lists
+        (None when not requested) and 'log_entries' mapping each requested
+        level to a LogTable of its entries. When levels are needed the lines
+        are read as records, so stack traces count toward their entry's level.
+        """
+        count_all = self.top_n is not None
+        # Unfiltered searches can be read off the full counts when they exist
+        search_from_all = count_all and not self.search_level
+        matcher = TermMatcher(self.search_words) if self.search_words and not search_from_all else None
+        tables = {level: LogTable() for level in self.levels}
+        word_counts = Counter()
+        search_counts = Counter()
+
+        def scan(blocks):
+            """Count the words of each block as it is read."""
+            for block in blocks:
+                if count_all:
+                    word_counts.update(LogParser.extract_words(block))
+                if matcher and not self.search_level:
+                    matcher.count(block, search_counts)
+                yield block
+
+        blocks = scan(blocks)
+        if tables or self.search_level:
+            lines = chain.from_iterable(map(io.StringIO, blocks))
+            for record in LogParser.iter_records(lines):
+                match = ENTRY_RE.match(record)
+                if match is None:
+                    continue
+                level = match.group(2).upper()
+                if level in tables:
+                    tables[level].append(LogParser.parse_log_record(record))
+                if matcher and level == self.search_level:
+                    matcher.count(record, search_counts)
+        else:
+            for _ in blocks:
+                pass  # Blocks are counted as they are read
+
+        if search_from_all:
+            search_counts = word_counts
+        return {
+            'top_words': word_counts.most_common(self.top_n) if count_all else None,
+            'search': [(word, search_counts.get(word, 0)) for word in self.search_words] if self.search_words else None,
+            'log_entries': tables,
+        }
@@ -0,0 +1,148 @@
+import math
+import os
+import random
+from collections import Counter
+from itertools import count, islice
+
+from .parser import LogParser
+
+Z_95 = 1.96  # Normal quantile for 95% confidence intervals
+SEEK_BACK = 4096  # Bytes read per step when looking back for a line start
+
+class LineSample:
+    """A sample of lines that estimates totals over the whole population.
+
+    Line i stands for scales[i] lines' worth of the population, so any
+    per-line quantity x is estimated as mean(scales[i] * x_i), with a 95%
+    confidence margin of Z_95 * sqrt(finite_correction * variance / n).
+    """
+
+    def __init__(self, lines, scales, finite_correction=1.0):
+        self.lines = lines
+        self.scales = scales
+        self.finite_correction = finite_correction
+
+    def _estimate(self, per_line_counts):
+        """Return {key: (estimate, margin)} from one Counter per sampled line."""
+        n = len(self.lines)
+        sums = Counter()
+        squares = Counter()
+        for scale, counts in zip(self.scales, per_line_counts):
+            for key, value in counts.items():
+                scaled = scale * value
+                sums[key] += scaled
+                squares[key] += scaled * scaled
+
+        estimates = {}
+        for key, total in sums.items():
+            mean = total / n
+            variance = (squares[key] - total * mean) / (n - 1) if n > 1 else 0.0
+            margin = Z_95 * math.sqrt(max(variance, 0.0) * self.finite_correction / n)
+            estimates[key] = (round(mean), round(margin))
+        return estimates
+
+    def top_words(self, top_n):
+        """Return the top N [(word, estimated_count, margin)] by estimated count."""
+        estimates = self._estimate(Counter(LogParser.extract_words(line)) for line in self.lines)
+        ranked = sorted(estimates.items(), key=lambda item: item[1][0], reverse=True)
+        return [(word, estimate, margin) for word, (estimate, margin) in ranked[:top_n]]
+
+    def level_counts(self):
+        """Return {LEVEL: (estimated_count, margin)} for the sampled log entries."""
+        levels = []
+        for line in self.lines:
+            entry = LogParser.parse_log_entry(line)
+            levels.append({entry.loglevel.upper(): 1} if entry else {})
+        return dict(sorted(self._estimate(levels).items()))
+
+def _open_unit(rng):
+    """Draw from the open interval (0, 1), so its logarithm is finite and non-zero."""
+    while True:
+        value = rng.random()
+        if value > 0.0:
+            return value
+
+def _uniform(sample, population):
+    """Wrap a simple random sample of a known population of lines."""
+    if not sample:
+        return LineSample([], [])
+    correction = (population - len(sample)) / (population - 1) if population > 1 else 0.0
+    return LineSample(sample, [population] * len(sample), correction)
+
+def reservoir_sample(lines, size, rng=random):
+    """Keep a uniform sample of `size` lines in one pass (reservoir Algorithm L).
+
+    Skipped lines are consumed with islice, so only about
+    size * log(N / size) random numbers are drawn for N lines.
+    """
+    if size <= 0:
+        raise ValueError("Sample size must be a positive integer")
+    counter = count()
+    numbered = zip(counter, lines)  # next(counter) - 1 is the number of lines read
+    reservoir = [line for _, line in islice(numbered, size)]
+    if len(reservoir) == size:
+        weight = math.exp(math.log(_open_unit(rng)) / size)
+        while True:
+            skip = math.floor(math.log(_open_unit(rng)) / math.log(1 - weight))
+            item = next(islice(numbered, skip, None), None)
+            if item is None:
+                break
+            reservoir[rng.randrange(size)] = item[1]
+            weight *= math.exp(math.log(_open_unit(rng)) / size)
+    return _uniform(reservoir, next(counter) - 1)
+
+def rate_sample(lines, rate, rng=random):
+    """Keep each line with probability `rate` in one pass, jumping over geometric gaps."""
+    if not 0 < rate <= 1:
+        raise ValueError("Sample rate must be in (0, 1]")
+    counter = count()
+    numbered = zip(counter, lines)
+    if rate == 1:
+        return _uniform([line for _, line in numbered], next(counter) - 1)
+    sample = []
+    log_keep = math.log(1 - rate)
+    while True:
+        skip = math.floor(math.log(_open_unit(rng)) / log_keep)
+        item = next(islice(numbered, skip, None), None)
+        if item is None:
+            break
+        sample.append(item[1])
+    return _uniform(sample, next(counter) - 1)
+
+def _line_at(file, offset, start):
+    """Return (line_start, raw_line) of the line containing byte offset."""
+    position = offset
+    while position > start:
+        step = max(start, position - SEEK_BACK)
+        file.seek(step)
+        newline = file.read(position - step).rfind(b'\n')
+        if newline >= 0:
+            position = step + newline + 1
+            break
+        position = step
+    file.seek(position)
+    return position, file.readline()
+
+def seek_sample(file_path, size, start=0, end=None, rng=random):
+    """Sample `size` lines by seeking to random byte offsets, without reading the whole file.
+
+    A line is hit with probability proportional to its length in bytes, so
+    each hit is scaled by (bytes in range) / (line length) to stay unbiased.
+    """
+    if size <= 0:
+        raise ValueError("Sample size must be a positive integer")
+    if end is None:
+        end = os.path.getsize(file_path)
+    span = end - start
+    if span <= 0:
+        return LineSample([], [])
+
+    lines = []
+    scales = []
+    with open(file_path, 'rb') as file:
+        for offset in sorted(start + rng.randrange(span) for _ in range(size)):
+            line_start, raw = _line_at(file, offset, start)
+            length = min(len(raw), end - line_start)
+            lines.append(raw[:length].decode('utf-8', errors='replace'))
+            scales.append(span / length)
+    return LineSample(lines, scales)
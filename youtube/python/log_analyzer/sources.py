@@ -0,0 +1,81 @@
+import glob
+import os
+from collections import Counter
+
+from .parser import LogParser
+from .counter import WordCounter
+
+SIDECAR_SUFFIXES = ('.idx', '.widx')  # Index files kept next to logs, never logs themselves
+
+def expand_paths(spec):
+    """Expand a file, directory or glob pattern into a sorted list of log files."""
+    if os.path.isdir(spec):
+        candidates = [os.path.join(spec, name) for name in os.listdir(spec) if not name.startswith('.')]
+    elif glob.has_magic(spec):
+        candidates = glob.glob(spec)
+    else:
+        return [spec]
+    paths = sorted(path for path in candidates
+                   if os.path.isfile(path) and not path.endswith(SIDECAR_SUFFIXES))
+    if not paths:
+        raise ValueError(f"No log files match {spec}")
+    return paths
+
+def first_timestamp(file_path):
+    """Return the timestamp of the first entry of a (possibly compressed) file, or None."""
+    for line in LogParser.iter_lines(file_path):
+        entry = LogParser.parse_log_entry(line)
+        if entry:
+            return entry.timestamp
+    return None
+
+def order_by_time(paths):
+    """Sort files by their first entry, e.g. app.log.2.gz, app.log.1.gz, app.log; files without entries go last."""
+    keyed = [(first_timestamp(path), path) for path in paths]
+    return [path for timestamp, path in sorted(keyed, key=lambda item: (item[0] is None, item[0] or ''))]
+
+def count_file_words(file_path):
+    """Count every word of one file. Runs inside a worker process."""
+    return WordCounter(LogParser.read_blocks(file_path)).count_words()
+
+def search_file(task):
+    """Search one file for words, optionally within the entries of a level."""
+    file_path, search_words, log_level = task
+    lines = LogParser.iter_lines(file_path) if log_level else LogParser.read_blocks(file_path)
+    return WordCounter(lines).search_specific_words(search_words, log_level)
+
+def collect_file_entries(task):
+    """Collect one file's entries of a level into a LogTable."""
+    file_path, log_level = task
+    from .processor import LogProcessor
+    return LogProcessor(LogParser.iter_lines(file_path)).get_log_table(log_level)
+
+def map_files(function, tasks, workers):
+    """Yield function(task) for every task, in order, using up to `workers` processes."""
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield function(task)
+        return
+    from multiprocessing import Pool
+    with Pool(min(workers, len(tasks))) as pool:
+        # chunksize 1: files differ widely in size, so hand them out one at a time
+        yield from pool.imap(function, tasks, chunksize=1)
+
+def count_words(paths, workers):
+    """Count every word across files, decompressing each in its own worker process."""
+    word_counts = Counter()
+    for partial in map_files(count_file_words, paths, workers):
+        word_counts.update(partial)
+    return word_counts
+
+def search_specific_words(paths, search_words, log_level, workers):
+    """Count search words across files, like WordCounter.search_specific_words."""
+    word_counts = Counter()
+    tasks = [(path, search_words, log_level) for path in paths]
+    for partial in map_files(search_file, tasks, workers):
+        word_counts.update(dict(partial))
+    return [(word.lower(), word_counts.get(word.lower(), 0)) for word in search_words]
+
+def iter_log_tables(paths, log_level, workers):
+    """Yield one LogTable of the level's entries per file, in the order of paths."""
+    return map_files(collect_file_entries, [(path, log_level) for path in paths], workers)
@@ -0,0 +1,102 @@
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
+
+from .parser import LogEntry
+
+@lru_cache(maxsize=4096)
+def _day_epoch_ms(date):
+    """Epoch milliseconds of midnight UTC for a 'YYYY-MM-DD' date."""
+    import calendar
+    return calendar.timegm((int(date[0:4]), int(date[5:7]), int(date[8:10]), 0, 0, 0)) * 1000
+
+def timestamp_to_ms(timestamp):
+    """Convert a 'YYYY-MM-DD HH:MM:SS,mmm' timestamp (taken as UTC) to epoch milliseconds."""
+    return (_day_epoch_ms(timestamp[0:10])
+            + int(timestamp[11:13]) * 3600000
+            + int(timestamp[14:16]) * 60000
+            + int(timestamp[17:19]) * 1000
+            + int(timestamp[20:23]))
+
+def ms_to_timestamp(ms):
+    """Format epoch milliseconds back into the 'YYYY-MM-DD HH:MM:SS,mmm' log layout."""
+    seconds, millis = divmod(ms, 1000)
+    return f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(seconds))},{millis:03d}"
+
+class LogTable:
+    """Columnar storage for parsed log entries.
+
+    Timestamps are int64 epoch milliseconds, levels uint8 codes, and thread
+    and logger names uint32 ids into one interned string list (id 0 means
+    missing). That is 17 bytes per row; LogEntry objects are only created
+    when rows are read.
+    """
+
+    __slots__ = ('timestamps', 'levels', 'threads', 'loggers',
+                 'level_names', '_level_codes', 'names', '_name_ids')
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.levels = array('B')
+        self.threads = array('I')
+        self.loggers = array('I')
+        self.level_names = []
+        self._level_codes = {}
+        self.names = [None]
+        self._name_ids = {None: 0}
+
+    def _level_code(self, level):
+        code = self._level_codes.get(level)
+        if code is None:
+            if len(self.level_names) > 255:
+                raise ValueError("LogTable supports at most 256 distinct log levels")
+            code = self._level_codes[level] = len(self.level_names)
+            self.level_names.append(level)
+        return code
+
+    def _name_id(self, name):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def append(self, entry):
+        """Add a parsed LogEntry as a new row."""
+        self.timestamps.append(timestamp_to_ms(entry.timestamp))
+        self.levels.append(self._level_code(entry.loglevel))
+        self.threads.append(self._name_id(entry.thread))
+        self.loggers.append(self._name_id(entry.logger))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def row(self, i):
+        """Materialize row i as a LogEntry."""
+        return LogEntry(timestamp=ms_to_timestamp(self.timestamps[i]),
+                        loglevel=self.level_names[self.levels[i]],
+                        thread=self.names[self.threads[i]],
+                        logger=self.names[self.loggers[i]])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def level_counts(self):
+        """Return the number of rows per log level."""
+        counts = Counter(self.levels)
+        return {self.level_names[code]: count for code, count in sorted(counts.items())}
+
+    def to_numpy(self):
+        """Return the columns as NumPy arrays (zero-copy). Requires NumPy."""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("LogTable.to_numpy() requires NumPy: pip install numpy")
+        return {
+            'timestamps': np.frombuffer(self.timestamps, dtype=np.int64),
+            'levels': np.frombuffer(self.levels, dtype=np.uint8),
+            'threads': np.frombuffer(self.threads, dtype=np.uint32),
+            'loggers': np.frombuffer(self.loggers, dtype=np.uint32),
+        }
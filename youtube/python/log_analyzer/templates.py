@@ -0,0 +1,157 @@
+import heapq
+import re
+from collections import Counter
+
+from .parser import LAYOUT_RE, RECORD_RE, LogParser
+
+WILDCARD = '<*>'
+# Tokens containing a digit are variables (IDs, numbers, hosts) from the start.
+# Anchored at token starts so a digit-free token is scanned only once.
+VARIABLE_RE = re.compile(r'(?<!\S)[^\s\d]*\d\S*')
+MAX_CACHE = 1 << 16  # Distinct masked messages remembered for the fast path
+
+class LogCluster:
+    """One message template with its counts and the tokens of a few of its messages."""
+
+    __slots__ = ('template', 'count', 'level_counts', 'samples')
+
+    def __init__(self, tokens):
+        self.template = tokens
+        self.count = 0
+        self.level_counts = Counter()
+        self.samples = []
+
+    def pattern(self):
+        return ' '.join(self.template)
+
+    def examples(self):
+        """Return the variable values of the sampled messages under the current template.
+
+        Values are read when asked for, not when a message is added, so they
+        line up with wildcards that appeared after the message was sampled.
+        """
+        examples = []
+        for tokens in self.samples:
+            values = [token for template_token, token in zip(self.template, tokens) if template_token == WILDCARD]
+            if values and values not in examples:
+                examples.append(values)
+        return examples
+
+class _Node:
+    __slots__ = ('children', 'clusters')
+
+    def __init__(self):
+        self.children = {}
+        self.clusters = []
+
+class TemplateMiner:
+    """Drain-style online template miner.
+
+    Messages are routed through a fixed-depth prefix tree keyed by token
+    count and the first `depth - 2` tokens, then matched against the few
+    clusters in that leaf; a match turns the differing tokens into
+    wildcards. Messages whose digit-masked text was seen before skip the
+    tree entirely with one dict lookup.
+    """
+
+    def __init__(self, depth=4, similarity=0.4, max_children=100, max_examples=3):
+        if depth < 3:
+            raise ValueError("Template tree depth must be at least 3")
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_examples = max_examples
+        self.root = {}  # token count -> _Node
+        self.clusters = []
+        self._cache = {}
+
+    def _leaf(self, tokens):
+        node = self.root.get(len(tokens))
+        if node is None:
+            node = self.root[len(tokens)] = _Node()
+        for token in tokens[:self.depth - 2]:
+            child = node.children.get(token)
+            if child is None:
+                # Once a node is full, new tokens share its wildcard branch
+                if len(node.children) >= self.max_children:
+                    token = WILDCARD
+                child = node.children.get(token)
+                if child is None:
+                    child = node.children[token] = _Node()
+            node = child
+        return node
+
+    def _match(self, tokens):
+        """Find the most similar cluster in the leaf for tokens, or create one."""
+        leaf = self._leaf(tokens)
+        best = None
+        best_similarity = -1.0
+        for cluster in leaf.clusters:
+            same = sum(1 for expected, token in zip(cluster.template, tokens)
+                       if expected == token and expected != WILDCARD)
+            similarity = same / len(tokens) if tokens else 1.0
+            if similarity > best_similarity:
+                best, best_similarity = cluster, similarity
+
+        if best is not None and best_similarity >= self.similarity:
+            best.template = [expected if expected == token else WILDCARD
+                             for expected, token in zip(best.template, tokens)]
+            return best
+        cluster = LogCluster(tokens)
+        leaf.clusters.append(cluster)
+        self.clusters.append(cluster)
+        return cluster
+
+    def add(self, message, log_level=None):
+        """Add one message and return its cluster."""
+        masked = VARIABLE_RE.sub(WILDCARD, message)
+        cluster = self._cache.get(masked)
+        if cluster is None:
+            cluster = self._match(masked.split())
+            if len(self._cache) < MAX_CACHE:
+                self._cache[masked] = cluster
+        cluster.count += 1
+        cluster.level_counts[log_level] += 1
+        if len(cluster.samples) < self.max_examples:
+            tokens = message.split()
+            if tokens not in cluster.samples:
+                cluster.samples.append(tokens)
+        return cluster
+
+    def add_lines(self, lines, log_level=None):
+        """Mine the messages of the log entries in lines, optionally of one level only.
+
+        log_level may also be a predicate from filters.compile_filter, which
+        sees whole records; the template is mined from the first line of each.
+        """
+        matches = log_level if callable(log_level) else None
+        level = log_level.upper() if log_level and not matches else None
+        add = self.add
+        layout_match = LAYOUT_RE.match
+        record_match = RECORD_RE.match
+        if matches:
+            lines = LogParser.iter_records(lines)
+        for line in lines:
+            if matches and not matches(line):
+                continue
+            # The groups of LogParser.parse_log_record, without building a LogEntry
+            match = layout_match(line) or record_match(line)
+            if match is None:
+                continue
+            entry_level = match.group(2).upper()
+            if level and entry_level != level:
+                continue
+            add(match.group(5), entry_level)
+        return self
+
+    def top_templates(self, top_n, log_level=None):
+        """Return the top N clusters by count, overall or within one level."""
+        if log_level is None:
+            return heapq.nlargest(top_n, self.clusters, key=lambda cluster: cluster.count)
+        level = log_level.upper()
+        ranked = [cluster for cluster in self.clusters if cluster.level_counts[level]]
+        return heapq.nlargest(top_n, ranked, key=lambda cluster: cluster.level_counts[level])
+
+    def levels(self):
+        """Return the log levels seen, sorted."""
+        return sorted({level for cluster in self.clusters for level in cluster.level_counts})
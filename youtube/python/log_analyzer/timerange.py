@@ -0,0 +1,79 @@
+import os
+import re
+
+from .parser import LogParser
+
+# Accepted --since/--until values: a prefix of the log timestamp layout,
+# or a time of day that takes its date from the first entry of the file
+_DATETIME_RE = re.compile(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2}(,\d{3})?)?)?$')
+_TIME_RE = re.compile(r'^\d{2}:\d{2}(:\d{2}(,\d{3})?)?$')
+
+def _first_timestamp_from(file, offset, size):
+    """Return (line_offset, timestamp) of the first timestamped line starting at or after offset."""
+    if offset > 0:
+        # Realign to a line start: a line starting exactly at offset is kept
+        file.seek(offset - 1)
+        file.readline()
+    else:
+        file.seek(0)
+    line_offset = file.tell()
+    while line_offset < size:
+        raw = file.readline()
+        entry = LogParser.parse_log_entry(raw.decode('utf-8', errors='replace'))
+        if entry:
+            return line_offset, entry.timestamp
+        line_offset += len(raw)
+    return size, None
+
+def _bisect(file, size, is_past, lo=0, hi=None):
+    """Return the offset of the first timestamped line for which is_past(timestamp) holds,
+    searching only the byte range [lo, hi] when it is known to hold that line.
+
+    Timestamps must be in ascending order, so is_past flips from False to True once.
+    """
+    hi = size if hi is None else hi
+    while lo < hi:
+        mid = (lo + hi) // 2
+        _, timestamp = _first_timestamp_from(file, mid, size)
+        if timestamp is None or is_past(timestamp):
+            hi = mid
+        else:
+            lo = mid + 1
+    return _first_timestamp_from(file, lo, size)[0]
+
+def _search(file, size, is_past, index=None):
+    """Bisect the whole file, or only between the index samples around the flip."""
+    if index is None:
+        return _bisect(file, size, is_past)
+    return _bisect(file, size, is_past, *index.offset_range(is_past, size))
+
+def normalize_bound(value, file_path):
+    """Turn a --since/--until value into a timestamp prefix comparable with log timestamps."""
+    value = value.replace('T', ' ').replace('.', ',')
+    if _DATETIME_RE.match(value):
+        return value
+    if _TIME_RE.match(value):
+        with open(file_path, 'rb') as file:
+            _, first = _first_timestamp_from(file, 0, os.path.getsize(file_path))
+        if first is None:
+            raise ValueError(f"No timestamped entries in {file_path} to take the date from")
+        return f"{first[:10]} {value}"
+    raise ValueError(f"Invalid time '{value}', expected YYYY-MM-DD HH:MM[:SS[,mmm]] or HH:MM[:SS[,mmm]]")
+
+def find_window(file_path, since=None, until=None, index=None):
+    """Return the byte range [start, end) of the entries logged between since and until.
+
+    Both bounds are timestamp prefixes; until is inclusive of everything it prefixes,
+    so '21:20' keeps entries up to 21:20:59,999. Untimestamped lines (e.g. stack
+    traces) stay with the entry before them. A LogIndex of the file narrows
+    each bisection to the bytes between two of its timestamp samples.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        start = 0
+        end = size
+        if since:
+            start = _search(file, size, lambda timestamp: timestamp >= since, index)
+        if until:
+            end = _search(file, size, lambda timestamp: timestamp[:len(until)] > until, index)
+    return start, max(start, end)
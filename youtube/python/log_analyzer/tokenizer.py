@@ -0,0 +1,133 @@
+import mmap
+import re
+from collections import Counter
+
+BLOCK_SIZE = 1 << 20  # 1 MiB of the mapping per block
+
+# On bytes patterns \w is ASCII-only, which matches the str pattern on ASCII input
+_BYTES_WORD_RE = re.compile(rb'\b\w+\b')
+_STR_WORD_RE = re.compile(r'\b\w+\b')
+_MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)  # Not on every platform
+_ASCII_LOWER = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ', b'abcdefghijklmnopqrstuvwxyz')
+
+def iter_blocks(file_path, start=0, end=None, block_size=BLOCK_SIZE):
+    """Yield newline-aligned bytes blocks of a memory-mapped file between start and end.
+
+    Pages already consumed are released as the scan moves on, so the
+    resident size stays around one block however large the file is.
+    """
+    with open(file_path, 'rb') as file:
+        file.seek(0, 2)
+        size = file.tell()
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            released = start - start % mmap.PAGESIZE
+            while pos < end:
+                stop = min(pos + block_size, end)
+                if stop < end:
+                    # Cut after the last newline so no word is split across blocks
+                    newline = mm.rfind(b'\n', pos, stop)
+                    if newline == -1:
+                        newline = mm.find(b'\n', stop, end)
+                    stop = end if newline == -1 else newline + 1
+                yield mm[pos:stop]
+                pos = stop
+                done = pos - pos % mmap.PAGESIZE
+                if _MADV_DONTNEED is not None and done > released:
+                    mm.madvise(_MADV_DONTNEED, released, done - released)
+                    released = done
+
+def count_block(block, word_counts):
+    """Add the words of a bytes block to a str-keyed Counter."""
+    if block.isascii():
+        block_counts = Counter(_BYTES_WORD_RE.findall(block.translate(_ASCII_LOWER)))
+        # Only the distinct tokens are decoded
+        for word, count in block_counts.items():
+            word_counts[word.decode('ascii')] += count
+    else:
+        # Non-ASCII text needs Unicode lowercasing and \w, so decode the block
+        word_counts.update(_STR_WORD_RE.findall(block.decode('utf-8').lower()))
+    return word_counts
+
+# ASCII word characters (\w on bytes patterns), indexed by byte value
+_ASCII_WORD = bytes(1 if chr(byte).isalnum() or byte == ord('_') else 0 for byte in range(128)) + bytes(128)
+FIND_TERMS = 16  # Up to this many terms are scanned for one by one; more use one regex
+
+def _is_word_char(char):
+    r"""The str \w test: alphanumeric (str.isalnum) or underscore."""
+    return char.isalnum() or char == '_'
+
+def _count_whole(text, term, is_word):
+    """Count the occurrences of term in text that are not flanked by word characters."""
+    count = 0
+    size = len(term)
+    length = len(text)
+    find = text.find
+    pos = find(term)
+    while pos != -1:
+        end = pos + size
+        if (pos == 0 or not is_word(text[pos - 1])) and (end == length or not is_word(text[end])):
+            count += 1
+        # Whole-word occurrences of a word never overlap, so resume after this one
+        pos = find(term, end)
+    return count
+
+class TermMatcher:
+    """Count whole-word occurrences of a fixed set of search terms.
+
+    Each term is located with the C substring search of str/bytes.find and
+    kept only where it is not flanked by word characters, so a scan costs
+    time in the length of the text rather than in its number of words, and
+    no other word is ever extracted. Past FIND_TERMS terms, one compiled
+    alternation with word-character lookarounds replaces the per-term
+    passes. Counts equal those of LogParser.extract_words: a term is
+    counted where it is an entire word of the lowercased text.
+    """
+
+    def __init__(self, terms):
+        # Terms that are not a single word can never equal an extracted word
+        self.words = sorted({term.lower() for term in terms if _STR_WORD_RE.fullmatch(term.lower())})
+        self.ascii_words = [(word.encode('ascii'), word) for word in self.words if word.isascii()]
+        self._str_findall = None
+        self._bytes_findall = None
+        if len(self.words) > FIND_TERMS:
+            self._str_findall = re.compile(
+                r'(?<!\w)(?:%s)(?!\w)' % '|'.join(map(re.escape, self.words))).findall
+            if self.ascii_words:
+                self._bytes_findall = re.compile(
+                    rb'(?<!\w)(?:%s)(?!\w)' % b'|'.join(re.escape(term) for term, _ in self.ascii_words)).findall
+
+    def count(self, text, term_counts):
+        """Add the occurrences of the terms in a str or bytes text to a str-keyed Counter."""
+        if isinstance(text, bytes):
+            if text.isascii():
+                text = text.translate(_ASCII_LOWER)
+                if self._bytes_findall:
+                    for term, count in Counter(self._bytes_findall(text)).items():
+                        term_counts[term.decode('ascii')] += count
+                    return term_counts
+                for term, word in self.ascii_words:
+                    count = _count_whole(text, term, _ASCII_WORD.__getitem__)
+                    if count:
+                        term_counts[word] += count
+                return term_counts
+            # Non-ASCII text needs Unicode lowercasing and \w, so decode it
+            text = text.decode('utf-8')
+        text = text.lower()
+        if self._str_findall:
+            term_counts.update(self._str_findall(text))
+            return term_counts
+        for word in self.words:
+            if word in text:
+                term_counts[word] += _count_whole(text, word, _is_word_char)
+        return term_counts
+
+def count_words_mmap(file_path, start=0, end=None):
+    """Count every word of a file (or a byte range of it) through a memory map."""
+    word_counts = Counter()
+    for block in iter_blocks(file_path, start, end):
+        count_block(block, word_counts)
+    return word_counts
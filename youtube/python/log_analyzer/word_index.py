@@ -0,0 +1,224 @@
+import hashlib
+import marshal
+import os
+import sys
+from collections import Counter
+
+from .parser import MAX_RECORD_LINES, LogParser
+from .filters import as_predicate
+from . import tokenizer
+
+WORD_INDEX_SUFFIX = '.widx'
+WORD_INDEX_VERSION = 3
+TAIL_CHECK_BYTES = 4096  # Bytes before the indexed end that must be unchanged to append
+
+def encode_varint(value, out):
+    """Append an unsigned LEB128 varint to a bytearray."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_deltas(data):
+    """Decode delta-encoded varints back into absolute values."""
+    values = []
+    value = shift = total = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            total += value
+            values.append(total)
+            value = shift = 0
+    return values
+
+def _tail_digest(file, end):
+    """Hash the bytes just before `end`, to detect a rewritten (not appended) file."""
+    start = max(0, end - TAIL_CHECK_BYTES)
+    file.seek(start)
+    return hashlib.sha1(file.read(end - start)).hexdigest()
+
+class WordIndex:
+    """Persistent inverted index: for each token, per-level counts and
+    delta-encoded postings of the byte offsets of the lines it occurs in.
+
+    Continuation lines (stack traces) are counted under the level of the
+    entry before them, as LogParser.iter_records would group them."""
+
+    def __init__(self):
+        self.inode = None
+        self.indexed_bytes = 0  # Index covers complete lines in [0, indexed_bytes)
+        self.tail_digest = None
+        self.levels = []        # Level names; level id = position + 1, 0 = no level
+        self.record_level_id = 0  # Level of the last indexed entry, for lines appended after it
+        self.record_start = 0     # Offset of that entry's line
+        self.continuation_lines = 0
+        # token -> [{level_id: count}, postings bytearray, last line offset]
+        self.tokens = {}
+
+    @staticmethod
+    def index_path(file_path):
+        return file_path + WORD_INDEX_SUFFIX
+
+    @classmethod
+    def load(cls, index_path):
+        """Load an index written by save()."""
+        with open(index_path, 'rb') as file:
+            data = marshal.load(file)
+        if data.get('version') != WORD_INDEX_VERSION or data.get('python') != list(sys.version_info[:2]):
+            raise ValueError(f"Incompatible word index: {index_path}")
+
+        index = cls()
+        index.inode = data['inode']
+        index.indexed_bytes = data['indexed_bytes']
+        index.tail_digest = data['tail_digest']
+        index.levels = data['levels']
+        index.record_level_id = data['record_level_id']
+        index.record_start = data['record_start']
+        index.continuation_lines = data['continuation_lines']
+        index.tokens = {token: [counts, bytearray(postings), last]
+                        for token, (counts, postings, last) in data['tokens'].items()}
+        return index
+
+    def save(self, index_path):
+        """Write the index atomically next to the log file."""
+        data = {
+            'version': WORD_INDEX_VERSION,
+            # marshal's format is only stable within one Python version
+            'python': list(sys.version_info[:2]),
+            'inode': self.inode,
+            'indexed_bytes': self.indexed_bytes,
+            'tail_digest': self.tail_digest,
+            'levels': self.levels,
+            'record_level_id': self.record_level_id,
+            'record_start': self.record_start,
+            'continuation_lines': self.continuation_lines,
+            'tokens': {token: (counts, bytes(postings), last)
+                       for token, (counts, postings, last) in self.tokens.items()},
+        }
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            marshal.dump(data, file)
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def open(cls, file_path):
+        """Load the sidecar word index of a file and index any appended bytes."""
+        index_path = cls.index_path(file_path)
+        try:
+            index = cls.load(index_path)
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            index = cls()  # Missing, corrupt or incompatible: rebuild
+
+        if index.update(file_path):
+            try:
+                index.save(index_path)
+            except OSError:
+                pass  # Read-only location: use the index for this run only
+        return index
+
+    def _is_prefix_of(self, file, st):
+        """Check that the file is the indexed file, possibly with bytes appended."""
+        return (self.inode == st.st_ino
+                and st.st_size >= self.indexed_bytes
+                and _tail_digest(file, self.indexed_bytes) == self.tail_digest)
+
+    def update(self, file_path):
+        """Index the complete lines added since the last update. Returns True if anything changed."""
+        st = os.stat(file_path)
+        with open(file_path, 'rb') as file:
+            if not self._is_prefix_of(file, st):
+                self.__init__()  # Rotated or rewritten: start over
+                self.inode = st.st_ino
+            elif st.st_size == self.indexed_bytes:
+                return False
+
+            file.seek(self.indexed_bytes)
+            offset = self.indexed_bytes
+            level_ids = {level: i + 1 for i, level in enumerate(self.levels)}
+            for raw in file:
+                if not raw.endswith(b'\n'):
+                    break  # Partial last line: left for a later update
+                line = raw.decode('utf-8')
+                entry = LogParser.parse_log_entry(line)
+                if entry:
+                    level_id = level_ids.get(entry.loglevel)
+                    if level_id is None:
+                        self.levels.append(entry.loglevel)
+                        level_id = level_ids[entry.loglevel] = len(self.levels)
+                    self.record_level_id = level_id
+                    self.record_start = offset
+                    self.continuation_lines = 0
+                elif self.record_level_id:
+                    self.continuation_lines += 1
+                    if self.continuation_lines > MAX_RECORD_LINES:
+                        self.record_level_id = 0
+                self._add_line(offset, self.record_level_id, LogParser.extract_words(line))
+                offset += len(raw)
+
+            changed = offset != self.indexed_bytes or self.tail_digest is None
+            self.indexed_bytes = offset
+            self.tail_digest = _tail_digest(file, offset)
+        return changed
+
+    def _add_line(self, offset, level_id, words):
+        """Record the words of the line starting at `offset`."""
+        for word, count in Counter(words).items():
+            posting = self.tokens.get(word)
+            if posting is None:
+                posting = self.tokens[word] = [{}, bytearray(), 0]
+            counts = posting[0]
+            counts[level_id] = counts.get(level_id, 0) + count
+            encode_varint(offset - posting[2], posting[1])
+            posting[2] = offset
+
+    def _level_ids(self, log_level):
+        """Return the ids of the levels matching log_level, case-insensitively."""
+        return {i + 1 for i, level in enumerate(self.levels) if level.lower() == log_level.lower()}
+
+    def count(self, word, log_level=None):
+        """Return how often a word occurs, optionally only in lines of one level."""
+        posting = self.tokens.get(word.lower())
+        if posting is None:
+            return 0
+        if not log_level:
+            return sum(posting[0].values())
+        level_ids = self._level_ids(log_level)
+        return sum(count for level_id, count in posting[0].items() if level_id in level_ids)
+
+    def postings(self, word):
+        """Return the byte offsets of the lines a word occurs in."""
+        posting = self.tokens.get(word.lower())
+        return decode_deltas(posting[1]) if posting else []
+
+    def iter_unindexed_lines(self, file_path, start=None):
+        """Yield the lines past the indexed range (a partial last line, or lines
+        appended since the last update), or from `start` when given."""
+        with open(file_path, 'rb') as file:
+            file.seek(self.indexed_bytes if start is None else start)
+            for raw in file:
+                yield raw.decode('utf-8')
+
+    def search_specific_words(self, file_path, search_words, log_level=None):
+        """Answer WordCounter.search_specific_words from the index.
+
+        The unindexed lines are scanned from the start of the record they may
+        continue, so a level filter sees that record whole; only the words
+        past the indexed range are counted.
+        """
+        # Lines after a cut or before the first entry have no record to continue
+        start = self.record_start if self.record_level_id else self.indexed_bytes
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            indexed = file.read(self.indexed_bytes - start).decode('utf-8')
+
+        matcher = tokenizer.TermMatcher(search_words)
+        matches = as_predicate(log_level)
+        tail_counts = Counter()
+        for record in LogParser.iter_records(self.iter_unindexed_lines(file_path, start)):
+            if not matches or matches(record):
+                matcher.count(record[len(indexed):], tail_counts)
+            indexed = ''  # Only the first record holds indexed lines
+        return [(word.lower(), self.count(word, log_level) + tail_counts[word.lower()])
+                for word in search_words]
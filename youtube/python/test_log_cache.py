@@ -0,0 +1,88 @@
+import gzip
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from log_analyzer.cli import CLIHandler
+from log_analyzer.cache import ResultCache # Import the result cache to test
+
+TEXT = ("2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query timeout\n"
+        "2025-07-30 21:00:01,000 INFO [worker-2] com.example.App - Retry of query\n")
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(TEXT * 10)
+        self.cache = ResultCache(os.path.join(self.directory, 'cache'), max_bytes=1000, max_entries=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def key(self, *args, paths=None):
+        paths = paths or [self.path]
+        return ResultCache.key(paths, CLIHandler._cache_query(list(args), paths))
+
+    """Test stored outputs come back, and a changed file changes the key"""
+    def test_put_get(self):
+        key = self.key('10')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "timeout : 10\n")
+        self.assertEqual(self.cache.get(key), "timeout : 10\n")
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(TEXT)
+        self.assertNotEqual(self.key('10'), key)
+
+    """Test the least recently used results are evicted beyond the bounds"""
+    def test_eviction(self):
+        keys = [self.key(str(top_n)) for top_n in range(1, 6)]
+        for i, key in enumerate(keys[:3]):
+            self.cache.put(key, 'x' * 100)
+            os.utime(self.cache._entry_path(key), ns=(i, i))
+        self.cache.get(keys[0])  # Now the most recently used
+        self.cache.put(keys[3], 'x' * 100)
+        self.assertEqual([self.cache.get(key) is not None for key in keys[:4]], [True, False, True, True])
+        self.cache.put(keys[4], 'x' * 950)
+        self.assertIsNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[4]))
+
+    """Test --workers and --tokenizer are left out only where they cannot change the output"""
+    def test_key_options(self):
+        # Exact counts: neither option changes the output
+        self.assertEqual(self.key('10', '--workers', '4', '--tokenizer', 'mmap'), self.key('10'))
+        # Other commands keep them, whether they reject them or their output depends on them
+        self.assertNotEqual(self.key('--search', 'query', '--workers', '2'), self.key('--search', 'query'))
+        self.assertNotEqual(self.key('--level_log', 'ERROR', '--tokenizer', 'mmap'), self.key('--level_log', 'ERROR'))
+        self.assertNotEqual(self.key('10', '--approx', '--workers', '2'), self.key('10', '--approx'))
+        self.assertNotEqual(self.key('10', '--approx', '--tokenizer', 'mmap'), self.key('10', '--approx'))
+        # Invalid values still report their error
+        self.assertNotEqual(self.key('10', '--workers', '0'), self.key('10'))
+        # Several or compressed files take --workers only
+        compressed = self.path + '.1.gz'
+        with gzip.open(compressed, 'wt', encoding='utf-8') as file:
+            file.write(TEXT)
+        paths = [compressed]
+        self.assertEqual(self.key('--search', 'query', '--workers', '2', paths=paths),
+                         self.key('--search', 'query', paths=paths))
+        self.assertNotEqual(self.key('10', '--tokenizer', 'mmap', paths=paths), self.key('10', paths=paths))
+
+    """Test a command whose options differ is run, not answered from the cache"""
+    def test_cli(self):
+        environment = dict(os.environ, XDG_CACHE_HOME=os.path.join(self.directory, 'xdg'))
+
+        def run(*args):
+            return subprocess.run([sys.executable, '-m', 'log_analyzer', self.path, *args], capture_output=True,
+                                  text=True, env=environment, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+
+        self.assertEqual(run('--search', 'query'), "query : 20\n")
+        self.assertEqual(run('--search', 'query', '--workers', '2'), "Error: --workers is not supported with --search\n")
+        # The second count is answered with the first one's cached result
+        self.assertEqual(run('2', '--workers', '2'), run('2'))
+        self.assertEqual(len(os.listdir(os.path.join(self.directory, 'xdg', 'log_analyzer'))), 2)
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from log_analyzer.filters import compile_filter # Import the --where parser to test
+
+LINE = "2025-07-30 21:00:05,120 ERROR [worker-3] com.example.Db - Query timeout after 30s\n"
+RECORD = LINE + "java.sql.SQLTimeoutException: deadline\n"
+
+class TestCompileFilter(unittest.TestCase):
+    """Test each field against a log line"""
+    def test_fields(self):
+        self.assertTrue(compile_filter("level in (ERROR, WARN)")(LINE))
+        self.assertTrue(compile_filter("level = error")(LINE))
+        self.assertTrue(compile_filter("thread = worker-3")(LINE))
+        self.assertTrue(compile_filter("logger ~ 'Db$'")(LINE))
+        self.assertTrue(compile_filter('msg contains "timeout"')(LINE))
+        self.assertTrue(compile_filter("line contains Query")(LINE))
+        self.assertFalse(compile_filter("level != ERROR")(LINE))
+
+    """Test time comparisons with timestamp prefixes"""
+    def test_time(self):
+        self.assertTrue(compile_filter("time >= '2025-07-30 21:00' and time < '2025-07-30 21:01'")(LINE))
+        self.assertFalse(compile_filter("time > 2025-07-31")(LINE))
+
+    """Test and, or, not and parentheses"""
+    def test_boolean_operators(self):
+        self.assertTrue(compile_filter("not level = INFO and (thread = main or msg contains timeout)")(LINE))
+        self.assertFalse(compile_filter("(level = INFO or level = WARN) and msg contains timeout")(LINE))
+        self.assertTrue(compile_filter("level = INFO or not thread = main")(LINE))
+
+    """Test msg and line cover the continuation lines of a record"""
+    def test_record(self):
+        self.assertTrue(compile_filter("msg contains SQLTimeoutException")(RECORD))
+        self.assertTrue(compile_filter("line contains deadline")(RECORD))
+        self.assertTrue(compile_filter("thread = worker-3")(RECORD))
+
+    """Test lines without a timestamp match no field test"""
+    def test_untimestamped_line(self):
+        self.assertFalse(compile_filter("level = ERROR")("\tat com.example.Db.query(Db.java:42)\n"))
+        self.assertTrue(compile_filter("line contains Db.java")("\tat com.example.Db.query(Db.java:42)\n"))
+
+    """Test quoted regexes keep their escapes, while quotes and backslashes can be escaped"""
+    def test_quoted_escapes(self):
+        self.assertTrue(compile_filter(r'msg ~ "after \d+s$"')(LINE))
+        self.assertTrue(compile_filter(r"msg ~ 'Query\stimeout'")(LINE))
+        self.assertFalse(compile_filter(r'msg ~ "after \d+ms"')(LINE))
+        quoted = LINE.replace('Query', 'Query "slow" C:\\db')
+        self.assertTrue(compile_filter(r'msg contains "\"slow\" C:\\db"')(quoted))
+        self.assertTrue(compile_filter(r"msg contains 'Query \"slow\"'")(quoted))
+
+    """Test invalid expressions raise ValueError"""
+    def test_invalid(self):
+        for expression in ("foo = 1", "level ~ x", "level =", "(level = ERROR", "msg contains 'x"):
+            with self.assertRaises(ValueError):
+                compile_filter(expression)
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from log_analyzer.follow import LogFollower # Import the follower to test
+
+def entry(second, level, message):
+    return f"2025-07-30 21:00:{second:02d},000 {level} [main] com.example.App - {message}\n"
+
+class TestLogFollower(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        self.checkpoint = os.path.join(self.directory, 'app.ckpt')
+        self.append(entry(0, 'INFO', 'started worker'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def append(self, text):
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write(text)
+
+    """Test only complete lines are consumed, a partial one on a later poll"""
+    def test_partial_line(self):
+        follower = LogFollower(self.path, ['timeout'], 'ERROR')
+        self.assertTrue(follower.poll())
+        self.append("2025-07-30 21:00:01,000 ERROR [main] com.example.App - time")
+        self.assertFalse(follower.poll())
+        self.append("out\n")
+        self.assertTrue(follower.poll())
+        self.assertEqual(follower.search_results(), [('timeout', 1)])
+        self.assertEqual(follower.level_counts, {'INFO': 1, 'ERROR': 1})
+        follower.close()
+
+    """Test a stack trace appended in a later poll counts toward its entry's level"""
+    def test_trace_in_later_poll(self):
+        follower = LogFollower(self.path, ['timeout'], 'ERROR')
+        self.append(entry(1, 'ERROR', 'failed'))
+        follower.poll()
+        self.append("java.lang.Exception: timeout\n")
+        follower.poll()
+        self.assertEqual(follower.search_results(), [('timeout', 1)])
+        follower.close()
+
+    """Test rotation drains the old file and starts the new one from the beginning"""
+    def test_rotation(self):
+        follower = LogFollower(self.path)
+        follower.poll()
+        self.append(entry(1, 'WARN', 'rotating'))
+        os.rename(self.path, self.path + '.1')
+        self.append(entry(2, 'ERROR', 'fresh'))
+        self.assertTrue(follower.poll())
+        self.assertEqual(follower.level_counts, {'INFO': 1, 'WARN': 1, 'ERROR': 1})
+        follower.close()
+
+    """Test a checkpoint resumes offset and counters, but only for the same query"""
+    def test_checkpoint(self):
+        follower = LogFollower(self.path, ['worker'], None, self.checkpoint)
+        follower.poll()
+        follower.save_checkpoint()
+        follower.close()
+        self.append(entry(1, 'INFO', 'worker stopped'))
+
+        resumed = LogFollower(self.path, ['worker'], None, self.checkpoint)
+        self.assertTrue(resumed.load_checkpoint())
+        self.assertEqual(resumed.search_results(), [('worker', 1)])
+        resumed.poll()
+        self.assertEqual(resumed.search_results(), [('worker', 2)])
+        resumed.close()
+        self.assertFalse(LogFollower(self.path, ['other'], None, self.checkpoint).load_checkpoint())
+
+    """Test SIGTERM saves the checkpoint and a restart prints the restored counts at once"""
+    def test_cli_resume(self):
+        command = [sys.executable, '-m', 'log_analyzer', self.path, '3', '--follow',
+                   '--interval', '0.05', '--checkpoint', self.checkpoint]
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, text=True)
+        self.assertIn('Top 3 words:', process.stdout.readline() + process.stdout.readline())
+        process.send_signal(signal.SIGTERM)
+        process.communicate(timeout=10)
+        with open(self.checkpoint, 'r', encoding='utf-8') as file:
+            self.assertEqual(json.load(file)['offset'], os.path.getsize(self.path))
+
+        process = subprocess.Popen(command, cwd=cwd, stdout=subprocess.PIPE, text=True)
+        self.assertTrue(process.stdout.readline().startswith(f"Resuming {self.path} at byte"))
+        # The restored counts come before any new line is read
+        lines = [process.stdout.readline() for _ in range(2)]
+        self.assertIn('Top 3 words:', ''.join(lines))
+        self.append(entry(1, 'ERROR', 'worker worker worker'))
+        deadline = time.monotonic() + 10
+        output = ''
+        while 'worker : 4' not in output and time.monotonic() < deadline:
+            output += process.stdout.readline()
+        process.send_signal(signal.SIGTERM)
+        process.communicate(timeout=10)
+        self.assertIn('worker : 4', output)
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from array import array
+from unittest.mock import patch
+from log_analyzer.parser import LogEntry
+from log_analyzer.processor import LogProcessor
+from log_analyzer.table import LogTable, timestamp_to_ms
+from log_analyzer.histogram import bucket_counts, histogram, parse_bucket # Import the histogram to test
+
+LINES = ["2025-07-30 21:00:00,000 INFO [main] com.example.App - started\n",
+         "2025-07-30 21:00:30,000 ERROR [worker-1] com.example.Db - failed\n",
+         "java.lang.Exception: boom\n",
+         "2025-07-30 21:01:10,000 ERROR [main] com.example.App - failed\n",
+         "2025-07-30 21:03:00,000 WARN [worker-1] com.example.Db - slow\n"]
+MINUTE = timestamp_to_ms('2025-07-30 21:00:00,000')
+
+def without_numpy():
+    """Force the pure-Python fallback"""
+    return patch('log_analyzer.histogram._numpy', return_value=None)
+
+def random_table(rows, seed):
+    rng = random.Random(seed)
+    table = LogTable()
+    for _ in range(rows):
+        second = rng.randrange(7200)
+        table.append(LogEntry(f"2025-07-30 {20 + second // 3600}:{second // 60 % 60:02d}:{second % 60:02d},000",
+                              rng.choice(['INFO', 'WARN', 'ERROR', 'DEBUG']),
+                              rng.choice(['main', 'worker-1', 'worker-2', None]),
+                              rng.choice(['com.example.App', 'com.example.Db'])))
+    return table
+
+class TestHistogram(unittest.TestCase):
+    """Test bucket sizes in each unit, and invalid sizes"""
+    def test_parse_bucket(self):
+        self.assertEqual([parse_bucket(value) for value in ('500ms', '30s', '1m', '2h', '1d')],
+                         [500, 30000, 60000, 7200000, 86400000])
+        for value in ('0s', '1w', '1.5m', '', None):
+            with self.assertRaises(ValueError):
+                parse_bucket(value)
+
+    """Test counts per level, and per logger, with empty buckets left out"""
+    def test_histogram(self):
+        table = LogProcessor(iter(LINES)).get_log_table()
+        levels, rows = histogram(table, 60000)
+        self.assertEqual(levels, ['ERROR', 'INFO', 'WARN'])
+        self.assertEqual(rows, [(MINUTE, None, [1, 1, 0]), (MINUTE + 60000, None, [1, 0, 0]),
+                                (MINUTE + 180000, None, [0, 0, 1])])
+        _, rows = histogram(table, 60000, 'logger')
+        self.assertEqual([(start - MINUTE, group, counts) for start, group, counts in rows],
+                         [(0, 'com.example.App', [0, 1, 0]), (0, 'com.example.Db', [1, 0, 0]),
+                          (60000, 'com.example.App', [1, 0, 0]), (180000, 'com.example.Db', [0, 0, 1])])
+        with self.assertRaises(ValueError):
+            histogram(table, 60000, 'level')
+
+    """Test the NumPy path and the pure-Python fallback give the same result"""
+    def test_numpy_matches_fallback(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        table = random_table(3000, seed=5)
+        for bucket_ms in (1000, 60000, 3600000):
+            for by in (None, 'logger', 'thread'):
+                expected = histogram(table, bucket_ms, by)
+                with without_numpy():
+                    self.assertEqual(histogram(table, bucket_ms, by), expected)
+        timestamps = array('q', [5, 1, 1999, 1000, 5])
+        keys = array('q', [1, 0, 1, 1, 1])
+        self.assertEqual(bucket_counts(timestamps, keys, 1000, 2), ([0, 0, 1], [0, 1, 1], [1, 2, 2]))
+        with without_numpy():
+            self.assertEqual(bucket_counts(timestamps, keys, 1000, 2), ([0, 0, 1], [0, 1, 1], [1, 2, 2]))
+        self.assertEqual(bucket_counts(array('q'), array('q'), 1000, 1), ([], [], []))
+
+    """Test the CLI prints one aligned row per bucket"""
+    def test_cli(self):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.log', delete=False) as tmp:
+            tmp.writelines(LINES)
+        try:
+            output = subprocess.run([sys.executable, '-m', 'log_analyzer', tmp.name, '--histogram', '1m', '--no-cache'],
+                                    capture_output=True, text=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        finally:
+            os.unlink(tmp.name)
+        self.assertEqual(output.splitlines(), ["bucket               ERROR  INFO  WARN",
+                                               "2025-07-30 21:00:00  1      1     0",
+                                               "2025-07-30 21:01:00  1      0     0",
+                                               "2025-07-30 21:03:00  0      0     1"])
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+from log_analyzer.parser import LogParser
+from log_analyzer.index import LogIndex, INDEX_MAGIC, TIME_STEP # Import the .idx index to test
+from log_analyzer.timerange import find_window
+
+LEVELS = ['INFO', 'DEBUG', 'ERROR', 'WARN']
+
+def write_log(path, entries, first=0):
+    """Write entries one second apart, every ERROR followed by a two-line stack trace"""
+    with open(path, 'a', encoding='utf-8') as file:
+        for i in range(first, first + entries):
+            level = LEVELS[i % len(LEVELS)]
+            hours, rest = divmod(i, 3600)
+            file.write(f"2025-07-30 {hours:02d}:{rest // 60:02d}:{rest % 60:02d},000 {level} [worker-{i % 3}] "
+                       f"com.example.Service - Handled request {i} for user{i % 7}\n")
+            if level == 'ERROR':
+                file.write(f"java.lang.RuntimeException: request {i} failed\n\tat com.example.Service.handle\n")
+
+class TestLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        write_log(self.path, 3 * TIME_STEP)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test a saved index loads back with the same offsets and timestamp samples"""
+    def test_save_load(self):
+        index = LogIndex.build(self.path)
+        index.save(LogIndex.index_path(self.path))
+        with open(LogIndex.index_path(self.path), 'rb') as file:
+            self.assertEqual(file.read(len(INDEX_MAGIC)), INDEX_MAGIC)
+        loaded = LogIndex.load(LogIndex.index_path(self.path))
+        self.assertEqual(loaded.identity, index.identity)
+        self.assertEqual(loaded.level_offsets, index.level_offsets)
+        self.assertEqual(loaded.time_stamps, index.time_stamps)
+        self.assertEqual(loaded.time_offsets, index.time_offsets)
+        self.assertEqual(len(loaded.time_stamps), 3)
+
+    """Test level lookups return the lines and records a full scan finds"""
+    def test_iter_level_lines(self):
+        index = LogIndex.open(self.path)
+        for level in LEVELS:
+            lines = [line for line in LogParser.iter_lines(self.path) if f",000 {level} " in line]
+            self.assertEqual(list(index.iter_level_lines(self.path, level)), lines)
+        records = [record for record in LogParser.iter_records(LogParser.iter_lines(self.path)) if ",000 ERROR " in record]
+        self.assertEqual(list(index.iter_level_lines(self.path, 'error', records=True)), records)
+
+    """Test the timestamp samples narrow --since/--until to the same byte range"""
+    def test_find_window(self):
+        index = LogIndex.open(self.path)
+        bounds = [('2025-07-30 00:17', None), (None, '2025-07-30 00:34:07'), ('2025-07-30 00:00:00', '2025-07-30 00'),
+                  ('2025-07-29', '2025-07-29'), ('2025-07-31', None), ('2025-07-30 00:51:11', '2025-07-30 00:51:11')]
+        for since, until in bounds:
+            self.assertEqual(find_window(self.path, since, until, index), find_window(self.path, since, until))
+
+    """Test open() rebuilds the index once the file changes"""
+    def test_rebuild(self):
+        errors = len(LogIndex.open(self.path).level_offsets['ERROR'])
+        write_log(self.path, 8, first=3 * TIME_STEP)
+        self.assertEqual(len(LogIndex.open(self.path).level_offsets['ERROR']), errors + 2)
+
+    """Test a file that is not an index raises ValueError"""
+    def test_not_an_index(self):
+        with self.assertRaises(ValueError):
+            LogIndex.load(self.path)
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import gzip
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from log_analyzer.parser import MAX_RECORD_LINES
+from log_analyzer.merge import iter_records, merge_lines, merge_records # Import the merge to test
+
+ENTRY = "2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query failed\n"
+NEXT = "2025-07-30 21:00:01,000 INFO [main] com.example.App - Retrying\n"
+TRACE = ["java.lang.IllegalStateException: closed\n", "\tat com.example.Db.query(Db.java:42)\n",
+         "\tat com.example.App.run(App.java:7)\n"]
+
+def entry(second, host, trace=False):
+    return (f"2025-07-30 21:00:{second:02d},000 INFO [main] com.example.App - from {host}\n"
+            + (''.join(TRACE) if trace else ''))
+
+class TestMerge(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test the merge keys records by their first line, standalone lines by the record before"""
+    def test_merge_keys(self):
+        lines = ["banner\n", ENTRY] + TRACE + [NEXT]
+        self.assertEqual([key for key, _ in iter_records(lines)],
+                         ['', '2025-07-30 21:00:00,000', '2025-07-30 21:00:01,000'])
+
+    """Test records interleave by timestamp, traces stay whole and ties keep source order"""
+    def test_merge_records(self):
+        first = [entry(0, 'a'), entry(2, 'a', trace=True), entry(5, 'a')]
+        second = [entry(1, 'b', trace=True), entry(2, 'b'), entry(4, 'b')]
+        for read_ahead in (1, 2, 1024):
+            records = [record for _, record in merge_records([iter(''.join(first).splitlines(True)),
+                                                              iter(''.join(second).splitlines(True))], read_ahead)]
+            self.assertEqual(records, [first[0], second[0], first[1], second[1], second[2], first[2]])
+
+    """Test a trace past MAX_RECORD_LINES is cut and its lines follow their entry"""
+    def test_record_cap(self):
+        trace = [f"\tat frame{i}\n" for i in range(MAX_RECORD_LINES + 5)]
+        lines = [ENTRY] + trace + [NEXT]
+        records = list(iter_records(lines))
+        self.assertEqual(records[0], ('2025-07-30 21:00:00,000', ENTRY + ''.join(trace[:MAX_RECORD_LINES])))
+        self.assertEqual(records[1:6], [('2025-07-30 21:00:00,000', line) for line in trace[MAX_RECORD_LINES:]])
+        merged = [record for _, record in merge_records([iter(lines), iter([entry(0, 'b')])])]
+        # The cut lines keep their entry's key, so they stay ahead of a tie from a later source
+        self.assertEqual(merged, [ENTRY + ''.join(trace[:MAX_RECORD_LINES])] + trace[MAX_RECORD_LINES:]
+                         + [entry(0, 'b'), NEXT])
+
+    """Test files, compressed or not, merge into their lines in timestamp order"""
+    def test_merge_lines(self):
+        first = os.path.join(self.directory, 'a.log')
+        second = os.path.join(self.directory, 'b.log.gz')
+        with open(first, 'w', encoding='utf-8') as file:
+            file.write(entry(0, 'a') + entry(3, 'a', trace=True) + entry(4, 'a').rstrip('\n'))
+        with gzip.open(second, 'wt', encoding='utf-8') as file:
+            file.write(entry(1, 'b') + entry(3, 'b'))
+        lines = list(merge_lines([first, second]))
+        self.assertEqual(lines, entry(0, 'a').splitlines(True) + entry(1, 'b').splitlines(True)
+                         + entry(3, 'a', trace=True).splitlines(True) + entry(3, 'b').splitlines(True)
+                         + [entry(4, 'a').rstrip('\n')])
+        output = subprocess.run([sys.executable, '-m', 'log_analyzer', os.path.join(self.directory, '*.log*'),
+                                 '--merge', '--search', 'from', 'a', '--level_log', 'INFO', '--no-cache'],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output, "from : 5\na : 3\n")
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
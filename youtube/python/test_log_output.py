@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from log_analyzer.parser import LogEntry
+from log_analyzer.output import OutputBuffer, write_log_entries, write_results # Import the output writers to test
+
+RESULTS = [('timeout', 3), ('straße', 2), ('say "hi"', 1)]
+ENTRIES = [LogEntry('2025-07-30 21:00:00,000', 'ERROR', 'worker-1', 'com.example.Db'),
+           LogEntry('2025-07-30 21:00:01,000', 'ERROR', None, None),
+           LogEntry('2025-07-30 21:00:02,000', 'ERROR', 'pool "a", 1', 'com.example.App')]
+
+def written(function, *args):
+    stream = io.StringIO()
+    function(*args, stream=stream)
+    return stream.getvalue()
+
+def entry_dict(entry):
+    return {'timestamp': entry.timestamp, 'loglevel': entry.loglevel, 'thread': entry.thread, 'logger': entry.logger}
+
+class TestOutput(unittest.TestCase):
+    """Test word counts in every format"""
+    def test_results(self):
+        self.assertEqual(written(write_results, RESULTS, 'text', "Top 3 words:"),
+                         "Top 3 words:\ntimeout : 3\nstraße : 2\nsay \"hi\" : 1\n")
+        self.assertEqual(json.loads(written(write_results, RESULTS, 'json')),
+                         [{'word': word, 'count': count} for word, count in RESULTS])
+        self.assertEqual([json.loads(line) for line in written(write_results, RESULTS, 'ndjson').splitlines()],
+                         [{'word': word, 'count': count} for word, count in RESULTS])
+        rows = list(csv.reader(io.StringIO(written(write_results, RESULTS, 'csv'))))
+        self.assertEqual(rows, [['word', 'count']] + [[word, str(count)] for word, count in RESULTS])
+
+    """Test empty results are still valid in every format"""
+    def test_empty(self):
+        self.assertEqual(written(write_results, [], 'text'), "No results found\n")
+        self.assertEqual(written(write_results, [], 'json'), "[]\n")
+        self.assertEqual(written(write_results, [], 'ndjson'), "")
+        self.assertEqual(written(write_results, [], 'csv'), "word,count\n")
+        self.assertEqual(written(write_log_entries, 'error', iter([]), 'text'),
+                         "Log entries for ERROR (Timestamp, Log Level):\nNo log level found for ERROR\n")
+        self.assertEqual(json.loads(written(write_log_entries, 'error', iter([]), 'json')), [])
+
+    """Test log entries in every format, with missing and quoted fields"""
+    def test_log_entries(self):
+        self.assertEqual(written(write_log_entries, 'error', iter(ENTRIES), 'text').splitlines()[1:],
+                         [f"{entry.timestamp} : ERROR" for entry in ENTRIES])
+        self.assertEqual(json.loads(written(write_log_entries, 'error', iter(ENTRIES), 'json')),
+                         [entry_dict(entry) for entry in ENTRIES])
+        self.assertEqual([json.loads(line) for line in
+                          written(write_log_entries, 'error', iter(ENTRIES), 'ndjson').splitlines()],
+                         [entry_dict(entry) for entry in ENTRIES])
+        rows = list(csv.DictReader(io.StringIO(written(write_log_entries, 'error', iter(ENTRIES), 'csv'))))
+        self.assertEqual(rows, [{key: value or '' for key, value in entry_dict(entry).items()} for entry in ENTRIES])
+
+    """Test chunks are written to the binary buffer, after text printed before them"""
+    def test_output_buffer(self):
+        binary = io.BytesIO()
+        stream = io.TextIOWrapper(binary, encoding='utf-8')
+        stream.write("before\n")
+        with OutputBuffer(stream) as out:
+            for i in range(20000):
+                out.write(f"{i}ß\n")
+        self.assertEqual(binary.getvalue().decode('utf-8'), "before\n" + ''.join(f"{i}ß\n" for i in range(20000)))
+
+    """Test --format on the command line, and its rejection where only text applies"""
+    def test_cli_format(self):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.log', delete=False) as tmp:
+            tmp.write("2025-07-30 21:00:00,000 ERROR [main] com.example.Db - timeout timeout timeout\n")
+        try:
+            def run(*args):
+                return subprocess.run([sys.executable, '-m', 'log_analyzer', tmp.name, *args, '--no-cache'],
+                                      capture_output=True, text=True,
+                                      cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+            self.assertEqual(json.loads(run('1', '--format', 'json')), [{'word': 'timeout', 'count': 3}])
+            self.assertEqual(run('--search', 'timeout', '--format', 'csv'), "word,count\ntimeout,3\n")
+            self.assertEqual(json.loads(run('--level_log', 'error', '--format', 'ndjson')),
+                             {'timestamp': '2025-07-30 21:00:00,000', 'loglevel': 'ERROR', 'thread': 'main',
+                              'logger': 'com.example.Db'})
+            self.assertIn("Invalid --format", run('1', '--format', 'xml'))
+            self.assertIn("not supported with --histogram", run('--histogram', '1m', '--format', 'json'))
+        finally:
+            os.unlink(tmp.name)
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import log_analyzer # Import the package to test
+
+# Modules that only some commands need; a plain word count or search loads none of them
+LAZY_MODULES = ('log_analyzer.index', 'log_analyzer.templates', 'log_analyzer.sampling', 'log_analyzer.query',
+                'log_analyzer.profiling', 'multiprocessing', 'gzip', 'bz2', 'lzma', 'json', 'csv', 'numpy')
+
+def run_python(code, *args):
+    """Run code in a fresh interpreter next to the package and return its stdout"""
+    return subprocess.run([sys.executable, '-c', code, *args], capture_output=True, text=True, check=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+
+class TestPackage(unittest.TestCase):
+    """Test importing the package loads no submodule until one is used"""
+    def test_lazy_submodules(self):
+        loaded = run_python("import sys, log_analyzer\n"
+                            "print(sorted(name for name in sys.modules if name.startswith('log_analyzer.')))\n"
+                            "log_analyzer.parser\n"
+                            "print(sorted(name for name in sys.modules if name.startswith('log_analyzer.')))")
+        self.assertEqual(loaded.splitlines(), ["[]", "['log_analyzer.parser']"])
+        self.assertEqual(log_analyzer.parser.LogParser.__name__, 'LogParser')
+        self.assertEqual(log_analyzer.__version__, "1.0.0")
+        with self.assertRaises(AttributeError):
+            log_analyzer.no_such_module
+
+    """Test a plain count and search through python -m log_analyzer load none of the lazy modules"""
+    def test_command_imports(self):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.log', delete=False) as tmp:
+            tmp.write("2025-07-30 21:00:00,000 ERROR [main] com.example.Db - timeout\n")
+        code = ("import runpy, sys\n"
+                "runpy.run_module('log_analyzer', run_name='__main__')\n"
+                f"print(sorted(name for name in {LAZY_MODULES!r} if name in sys.modules))")
+        try:
+            for args in (['1'], ['--search', 'timeout'], ['--level_log', 'ERROR']):
+                output = run_python(code, tmp.name, *args, '--no-cache')
+                self.assertEqual(output.splitlines()[-1], "[]", args)
+        finally:
+            os.unlink(tmp.name)
+
+    """Test python -m log_analyzer prints its usage without arguments"""
+    def test_main_usage(self):
+        process = subprocess.run([sys.executable, '-m', 'log_analyzer'], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(process.returncode, 1)
+        self.assertTrue(process.stdout.startswith("Usage: python3 main.py <file_path>"))
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
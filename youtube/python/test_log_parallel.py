@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from log_analyzer.parser import LogParser
+from log_analyzer.counter import WordCounter
+from log_analyzer.parallel import ParallelWordCounter, split_ranges # Import the parallel counter to test
+
+TEXT = ("2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query timeout for user_1 Straße\n"
+        "\tat com.example.Db.query(Db.java:42) STRASSE straße naïve café_au_lait\n"
+        "2025-07-30 21:00:01,000 INFO [worker-2] com.example.App - Retry #2 of query-timeout, TIMEOUT x2\n")
+
+class TestParallelWordCounter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            for i in range(300):
+                file.write(TEXT.replace('user_1', f"user_{i % 11}"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test ranges start on line boundaries and cover the file"""
+    def test_split_ranges(self):
+        size = os.path.getsize(self.path)
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        for parts in (1, 2, 7, 1000):
+            ranges = split_ranges(self.path, parts)
+            self.assertLessEqual(len(ranges), parts)
+            self.assertEqual(ranges[0][0], 0)
+            self.assertEqual(ranges[-1][1], size)
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(end, start)
+                self.assertEqual(data[start - 1:start], b'\n')
+
+    """Test counts split across byte ranges and workers equal a single pass, ties included"""
+    def test_parallel_counts(self):
+        expected = WordCounter(LogParser.iter_lines(self.path)).count_words()
+        for workers in (1, 2, 3):
+            for backend in ('regex', 'mmap'):
+                counter = ParallelWordCounter(self.path, workers, backend)
+                self.assertEqual(counter.count_words(), expected)
+                self.assertEqual(ParallelWordCounter(self.path, workers, backend).count_top_words(20),
+                                 expected.most_common(20))
+
+    """Test byte-range counts equal a scan of the same lines"""
+    def test_parallel_range(self):
+        size = os.path.getsize(self.path)
+        start, end = size // 3, 2 * size // 3
+        with open(self.path, 'rb') as file:
+            file.seek(start)
+            file.readline()
+            start = file.tell()
+            file.seek(end)
+            file.readline()
+            end = file.tell()
+        expected = WordCounter(LogParser.iter_lines(self.path, start, end)).count_words()
+        self.assertEqual(ParallelWordCounter(self.path, 2, 'regex', start, end).count_words(), expected)
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
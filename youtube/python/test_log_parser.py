@@ -0,0 +1,104 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from log_analyzer.parser import LogParser, LogEntry, LAYOUT_RE, RECORD_RE # Import the streaming readers and parsers to test
+from log_analyzer.counter import WordCounter
+from log_analyzer.processor import LogProcessor
+
+LINES = [f"2025-07-30 21:00:{i % 60:02d},000 {('INFO', 'ERROR')[i % 2]} [main] com.example.App - Handled request {i} straße\n"
+         for i in range(200)]
+
+def offset_of(index):
+    """Byte offset of LINES[index] in the file"""
+    return sum(len(line.encode('utf-8')) for line in LINES[:index])
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.writelines(LINES)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test iter_lines yields the lines of the file lazily"""
+    def test_iter_lines(self):
+        lines = LogParser.iter_lines(self.path)
+        self.assertEqual(next(lines), LINES[0])
+        self.assertEqual(list(lines), LINES[1:])
+
+    """Test byte ranges yield the lines starting in them"""
+    def test_iter_lines_range(self):
+        self.assertEqual(list(LogParser.iter_lines(self.path, offset_of(10), offset_of(15))), LINES[10:15])
+
+    """Test blocks hold whole lines and together equal the file"""
+    def test_read_blocks(self):
+        for block_size in (1, 100, 1000, 1 << 20):
+            blocks = list(LogParser.read_blocks(self.path, block_size))
+            self.assertEqual(''.join(blocks), ''.join(LINES))
+            self.assertTrue(all(block.endswith('\n') for block in blocks))
+        self.assertEqual(''.join(LogParser.read_blocks(self.path, 500, offset_of(3))), ''.join(LINES[3:]))
+
+    """Test compressed files stream like plain ones"""
+    def test_compressed(self):
+        compressed = self.path + '.gz'
+        with gzip.open(compressed, 'wt', encoding='utf-8') as file:
+            file.writelines(LINES)
+        self.assertTrue(LogParser.is_compressed(compressed))
+        self.assertFalse(LogParser.is_compressed(self.path))
+        self.assertEqual(list(LogParser.iter_lines(compressed)), LINES)
+        self.assertEqual(''.join(LogParser.read_blocks(compressed, 300)), ''.join(LINES))
+
+    """Test counts over streamed blocks equal counts over the whole text"""
+    def test_word_counts(self):
+        expected = Counter(LogParser.extract_words(''.join(LINES)))
+        self.assertEqual(WordCounter(LogParser.read_blocks(self.path, 700)).count_words(), expected)
+        self.assertEqual(WordCounter(LogParser.read_blocks(self.path, 700)).count_top_words(3), expected.most_common(3))
+
+    """Test level listings read from a lazy line iterator"""
+    def test_level_entries(self):
+        entries = list(LogProcessor(LogParser.iter_lines(self.path)).iter_log_entries_by_level('error'))
+        self.assertEqual(len(entries), 100)
+        self.assertTrue(all(entry.loglevel == 'ERROR' for entry in entries))
+
+class TestParseRecord(unittest.TestCase):
+    """Test the fixed layout parses to the same fields as the general pattern"""
+    def test_layout_matches_record_pattern(self):
+        for line in LINES[:5] + ["2025-07-30 21:00:00,000 WARN  [pool-1 thread-2] a.b.C -   padded message\n",
+                                 "2025-07-30 21:00:00,000 info [main] a.b.C - \n"]:
+            self.assertIsNotNone(LAYOUT_RE.match(line))
+            self.assertEqual(LAYOUT_RE.match(line).groups(), RECORD_RE.match(line).groups())
+
+    """Test lines off the fixed layout fall back to the general pattern"""
+    def test_parse_log_record(self):
+        self.assertEqual(LogParser.parse_log_record("2025-07-30 21:00:00,000 error [main] a.b.C - boom\n"),
+                         LogEntry('2025-07-30 21:00:00,000', 'ERROR', 'main', 'a.b.C', 'boom'))
+        self.assertEqual(LogParser.parse_log_record("2025-07-30 21:00:00,000\tDEBUG\t[main]\ta.b.C\tboom\n"),
+                         LogEntry('2025-07-30 21:00:00,000', 'DEBUG', 'main', 'a.b.C', 'boom'))
+        self.assertEqual(LogParser.parse_log_record("2025-07-30 21:00:00,000 INFO plain message\n"),
+                         LogEntry('2025-07-30 21:00:00,000', 'INFO', None, None, 'plain message'))
+        self.assertIsNone(LogParser.parse_log_record("\tat com.example.App.run(App.java:7)\n"))
+
+    """Test a multiline record keeps its continuation lines in the message"""
+    def test_record_message(self):
+        record = "2025-07-30 21:00:00,000 ERROR [main] a.b.C - boom\njava.lang.Exception: x\n\tat a.b.C.run\n"
+        self.assertEqual(LogParser.parse_log_record(record).message, "boom\njava.lang.Exception: x\n\tat a.b.C.run")
+
+    """Test parse_many returns the columns of parse_log_record, skipping untimestamped lines"""
+    def test_parse_many(self):
+        lines = ["banner\n"] + LINES[:20] + ["2025-07-30 21:00:00,000 INFO plain message\n"]
+        columns = LogParser.parse_many(lines)
+        entries = [LogParser.parse_log_record(line) for line in lines[1:]]
+        self.assertEqual(columns['timestamp'], [entry.timestamp for entry in entries])
+        self.assertEqual(columns['loglevel'], [entry.loglevel for entry in entries])
+        self.assertEqual(columns['thread'], [entry.thread for entry in entries])
+        self.assertEqual(columns['logger'], [entry.logger for entry in entries])
+        self.assertEqual(columns['message'], [entry.message for entry in entries])
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
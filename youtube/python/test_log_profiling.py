@@ -0,0 +1,50 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+def run_cli(*args):
+    """Run python -m log_analyzer and return its stderr, where the profile goes"""
+    return subprocess.run([sys.executable, '-m', 'log_analyzer', *args], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            for i in range(8000):
+                file.write(f"2025-07-30 21:00:00,000 INFO [main] com.example.App - user{i} session{i}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test the stage table charges reading and counting separately"""
+    def test_stages(self):
+        report = run_cli(self.path, '3', '--profile')
+        stages = [line.split()[0] for line in report.splitlines() if line and line[0].isalpha()]
+        self.assertEqual(stages[:1], ['Profile'])
+        for stage in ('Stage', 'read', 'count', 'total'):
+            self.assertIn(stage, stages)
+
+    """Test the memory report lists what grew during the stages, not startup allocations"""
+    def test_memory_since_first_stage(self):
+        report = run_cli(self.path, '3', '--profile_memory')
+        self.assertIn("by growth since the first stage", report)
+        sites = report.split("by growth since the first stage")[1]
+        self.assertIn('parser.py', sites)
+        # The hooks installed before the first stage are startup allocations
+        self.assertNotIn('functools.py', sites)
+
+    """Test a peak too small to attribute is reported as such"""
+    def test_small_peak(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write("2025-07-30 21:00:00,000 ERROR [main] com.example.App - failed\n")
+        self.assertIn("too little to attribute to allocation sites", run_cli(self.path, '--level_log', 'ERROR',
+                                                                            '--profile_memory'))
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+from log_analyzer.parser import LogParser
+from log_analyzer.counter import WordCounter
+from log_analyzer.processor import LogProcessor
+from log_analyzer.query import QueryPlan # Import the query plan to test
+
+TEXT = ("startup banner with a timeout\n"
+        "2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query timeout for user_1\n"
+        "java.lang.RuntimeException: failed\n"
+        "\tat com.example.Db.query(Db.java:42) timeout\n"
+        "2025-07-30 21:00:01,000 INFO [worker-2] com.example.App - Retry of query-timeout, TIMEOUT x2\n"
+        "2025-07-30 21:00:02,000 warn [worker-2] com.example.App - failed slowly\n"
+        "2025-07-30 21:00:03,000 Error [main] com.example.Db - failed again\n")
+
+class TestQueryPlan(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(TEXT * 200)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def sources(self):
+        """The same log as small blocks, large blocks and single lines"""
+        return [lambda: LogParser.read_blocks(self.path, block_size=100),
+                lambda: LogParser.read_blocks(self.path),
+                lambda: LogParser.iter_lines(self.path)]
+
+    """Test every output equals the command that computes it alone"""
+    def test_matches_separate_commands(self):
+        for source in self.sources():
+            results = QueryPlan(5, ['Timeout', 'failed', 'absent'], 'error', ['ERROR', 'warn']).execute(source())
+            self.assertEqual(results['top_words'], WordCounter(LogParser.iter_lines(self.path)).count_top_words(5))
+            self.assertEqual(results['search'], WordCounter(LogParser.iter_lines(self.path)).search_specific_words(
+                ['Timeout', 'failed', 'absent'], 'ERROR'))
+            self.assertEqual(list(results['log_entries']), ['ERROR', 'WARN'])
+            for level, table in results['log_entries'].items():
+                expected = LogProcessor(LogParser.iter_lines(self.path)).get_log_table(level)
+                self.assertEqual(list(table), list(expected))
+                self.assertEqual(len(table), 400 if level == 'ERROR' else 200)
+
+    """Test searches without a level count every line, with or without top words"""
+    def test_unfiltered_search(self):
+        expected = WordCounter(LogParser.iter_lines(self.path)).search_specific_words(['timeout', 'failed'])
+        for source in self.sources():
+            self.assertEqual(QueryPlan(search_words=['timeout', 'failed']).execute(source())['search'], expected)
+            self.assertEqual(QueryPlan(3, ['timeout', 'failed']).execute(source())['search'], expected)
+
+    """Test outputs that were not requested are left out"""
+    def test_unrequested_outputs(self):
+        results = QueryPlan(levels=['ERROR']).execute(LogParser.read_blocks(self.path))
+        self.assertIsNone(results['top_words'])
+        self.assertIsNone(results['search'])
+        self.assertEqual(QueryPlan(2).execute(iter([]))['log_entries'], {})
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from log_analyzer.parser import LogParser # Import the record assembler to test
+from log_analyzer.counter import WordCounter
+
+ENTRY = "2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query failed\n"
+NEXT = "2025-07-30 21:00:01,000 INFO [main] com.example.App - Retrying\n"
+TRACE = ["java.lang.IllegalStateException: closed\n", "\tat com.example.Db.query(Db.java:42)\n",
+         "\tat com.example.App.run(App.java:7)\n"]
+
+class TestIterRecords(unittest.TestCase):
+    """Test continuation lines are joined to the entry before them"""
+    def test_joins_stack_trace(self):
+        lines = [ENTRY] + TRACE + [NEXT]
+        expected = [ENTRY + ''.join(TRACE), NEXT]
+        self.assertEqual(list(LogParser.iter_records(lines)), expected)
+
+    """Test lines before the first entry are yielded alone"""
+    def test_lines_before_first_entry(self):
+        lines = ["banner\n", "\n", ENTRY, NEXT]
+        self.assertEqual(list(LogParser.iter_records(lines)), lines)
+
+    """Test a record is cut after max_lines continuation lines, the rest passed on alone"""
+    def test_max_lines(self):
+        lines = [ENTRY] + TRACE + [NEXT]
+        expected = [ENTRY + ''.join(TRACE[:2]), TRACE[2], NEXT]
+        self.assertEqual(list(LogParser.iter_records(lines, max_lines=2)), expected)
+
+    """Test max_lines=1 keeps a single continuation line"""
+    def test_max_lines_one(self):
+        lines = [ENTRY] + TRACE + [NEXT]
+        expected = [ENTRY + TRACE[0], TRACE[1], TRACE[2], NEXT]
+        self.assertEqual(list(LogParser.iter_records(lines, max_lines=1)), expected)
+
+    """Test records spanning batch boundaries assemble the same as in one batch"""
+    def test_batch_boundaries(self):
+        lines = ["banner\n"] + ([ENTRY] + TRACE + [NEXT]) * 5 + [ENTRY] + TRACE[:1]
+        expected = list(LogParser.iter_records(lines))
+        for batch_size in (1, 2, 3, 7):
+            self.assertEqual(list(LogParser.iter_records(lines, batch_size=batch_size)), expected)
+        self.assertEqual(''.join(expected), ''.join(lines))
+
+    """Test level-filtered searches count the words of an entry's stack trace"""
+    def test_level_filter_includes_trace(self):
+        lines = [ENTRY] + TRACE + [NEXT]
+        self.assertEqual(WordCounter(lines).search_specific_words(['closed', 'retrying'], 'ERROR'),
+                         [('closed', 1), ('retrying', 0)])
+        self.assertEqual(WordCounter(lines).search_specific_words(['closed', 'retrying'], 'INFO'),
+                         [('closed', 0), ('retrying', 1)])
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
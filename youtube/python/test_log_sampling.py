@@ -0,0 +1,87 @@
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from log_analyzer.parser import LogParser
+from log_analyzer.sampling import LineSample, rate_sample, reservoir_sample, seek_sample # Import the samplers to test
+
+def log_lines(count):
+    """Entries of mixed levels and lengths, one in four an ERROR"""
+    levels = ['ERROR', 'INFO', 'INFO', 'WARN']
+    return [f"2025-07-30 21:00:{i % 60:02d},000 {levels[i % 4]} [main] com.example.App - request {'x' * (i % 50)}\n"
+            for i in range(count)]
+
+class TestSampling(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        self.lines = log_lines(2000)
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.writelines(self.lines)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test a sample of the whole population is exact, with no margin"""
+    def test_full_sample_is_exact(self):
+        for sample in (rate_sample(iter(self.lines), 1), reservoir_sample(iter(self.lines), 5000)):
+            self.assertEqual(len(sample.lines), 2000)
+            self.assertEqual(sample.level_counts(), {'ERROR': (500, 0), 'INFO': (1000, 0), 'WARN': (500, 0)})
+            exact = Counter(LogParser.extract_words(''.join(self.lines))).most_common(5)
+            self.assertEqual(sample.top_words(5), [(word, count, 0) for word, count in exact])
+        self.assertEqual(LineSample([], []).level_counts(), {})
+
+    """Test the reservoir keeps size lines, each about equally likely"""
+    def test_reservoir_uniform(self):
+        lines = list(range(100))
+        hits = Counter()
+        for seed in range(2000):
+            sample = reservoir_sample(iter(lines), 10, random.Random(seed))
+            self.assertEqual(len(sample.lines), 10)
+            self.assertEqual(len(set(sample.lines)), 10)
+            self.assertEqual(sample.scales, [100] * 10)
+            hits.update(sample.lines)
+        # 200 expected hits per line; 5 standard deviations is about 67
+        for line in lines:
+            self.assertLess(abs(hits[line] - 200), 67)
+
+    """Test the rate sample keeps about rate * N lines and the estimates cover the truth"""
+    def test_rate_sample(self):
+        sample = rate_sample(iter(self.lines), 0.1, random.Random(1))
+        self.assertLess(abs(len(sample.lines) - 200), 60)
+        self.assertEqual(sample.scales, [2000] * len(sample.lines))
+        estimate, margin = sample.level_counts()['ERROR']
+        self.assertLessEqual(abs(estimate - 500), 2 * margin)
+        for rate in (0, -0.5, 1.5):
+            with self.assertRaises(ValueError):
+                rate_sample(iter(self.lines), rate)
+
+    """Test seeks return whole lines and length weighting keeps the line count unbiased"""
+    def test_seek_sample(self):
+        totals = []
+        for seed in range(20):
+            sample = seek_sample(self.path, 200, rng=random.Random(seed))
+            self.assertTrue(set(sample.lines) <= set(self.lines))
+            totals.append(sum(estimate for estimate, _ in sample.level_counts().values()))
+        self.assertLess(abs(sum(totals) / len(totals) - 2000), 100)
+        size = os.path.getsize(self.path)
+        self.assertEqual(seek_sample(self.path, 5, size, size).lines, [])
+        with self.assertRaises(ValueError):
+            seek_sample(self.path, 0)
+
+    """Test the CLI prints estimates with their margins"""
+    def test_cli(self):
+        output = subprocess.run([sys.executable, '-m', 'log_analyzer', self.path, '1', '--sample', '1', '--no-cache'],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output.splitlines(), ["Estimated from 2000 lines taken by a rate sample (95% confidence):",
+                                               "Top 1 words:", "07 : 2034 ± 0",
+                                               "Entries per log level:", "ERROR : 500 ± 0", "INFO : 1000 ± 0",
+                                               "WARN : 500 ± 0"])
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from log_analyzer.sketch import SpaceSaving, HyperLogLog # Import the sketches to test
+
+def zipf_words(count, seed):
+    """A skewed stream of words, a few frequent and many rare"""
+    rng = random.Random(seed)
+    return [f"w{int(rng.paretovariate(1.1))}" for _ in range(count)]
+
+def run_cli(*args):
+    """Run python -m log_analyzer without the result cache and return its output"""
+    return subprocess.run([sys.executable, '-m', 'log_analyzer', *args, '--no-cache'], capture_output=True,
+                          text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+
+class TestSpaceSaving(unittest.TestCase):
+    """Test every stored estimate satisfies true <= estimate <= true + error"""
+    def assert_bounds(self, sketch, exact):
+        for word, estimate in sketch.counts.items():
+            self.assertLessEqual(exact[word], estimate)
+            self.assertLessEqual(estimate, exact[word] + sketch.errors[word])
+        for word, count in exact.items():
+            if word not in sketch.counts:
+                self.assertLessEqual(count, sketch.floor())
+        self.assertLessEqual(sketch.error_bound(), sketch.total / sketch.capacity)
+
+    """Test the guarantee for a stream added in batches"""
+    def test_update_bounds(self):
+        words = zipf_words(20000, seed=1)
+        sketch = SpaceSaving(50)
+        for i in range(0, len(words), 1000):
+            sketch.update(Counter(words[i:i + 1000]))
+        exact = Counter(words)
+        self.assertEqual(sketch.total, len(words))
+        self.assert_bounds(sketch, exact)
+        # Words above N / capacity are always kept
+        for word, count in exact.items():
+            if count > len(words) / sketch.capacity:
+                self.assertIn(word, sketch.counts)
+
+    """Test merged summaries keep the guarantee for the combined stream"""
+    def test_merge_bounds(self):
+        left, right = zipf_words(10000, seed=2), zipf_words(10000, seed=3)
+        merged = SpaceSaving(40)
+        merged.update(Counter(left))
+        other = SpaceSaving(40)
+        other.update(Counter(right))
+        merged.merge(other)
+        self.assert_bounds(merged, Counter(left + right))
+
+    """Test small streams are counted exactly"""
+    def test_exact_below_capacity(self):
+        sketch = SpaceSaving(10)
+        sketch.update(Counter("a b a c a b".split()))
+        self.assertEqual(sketch.most_common(2), [('a', 3), ('b', 2)])
+        self.assertEqual(sketch.error_bound(), 0)
+
+    """Test a saved sketch loads back unchanged"""
+    def test_save_load(self):
+        sketch = SpaceSaving(5)
+        sketch.update(Counter(zipf_words(1000, seed=4)))
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as tmp:
+            pass
+        try:
+            sketch.save(tmp.name)
+            loaded = SpaceSaving.load(tmp.name)
+            self.assertEqual(loaded.to_dict(), sketch.to_dict())
+        finally:
+            os.unlink(tmp.name)
+
+    """Test invalid capacities and foreign sketches raise ValueError"""
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+        with self.assertRaises(ValueError):
+            SpaceSaving.from_dict(HyperLogLog(4).to_dict())
+
+class TestApproxCommand(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+        for day, words in (('monday', 'timeout timeout retry'), ('tuesday', 'timeout failed')):
+            path = os.path.join(self.directory, f"{day}.log")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(f"{words}\n")
+            self.paths.append(path)
+        self.sketch = os.path.join(self.directory, 'monday.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test a saved sketch merged into the next file's counts covers both files"""
+    def test_save_and_merge(self):
+        output = run_cli(self.paths[0], '2', '--approx', '--save_sketch', self.sketch)
+        self.assertIn("timeout : 2", output)
+        self.assertEqual(SpaceSaving.load(self.sketch).total, 3)
+        output = run_cli(self.paths[1], '3', '--approx', '--merge_sketch', self.sketch)
+        lines = output.splitlines()
+        self.assertEqual(lines[1], "timeout : 3")
+        self.assertEqual(sorted(lines[2:]), ["failed : 1", "retry : 1"])
+
+    """Test distinct words and distinct pattern values, alone and merged across files"""
+    def test_distinct(self):
+        self.assertIn("Distinct words: ~2 ", run_cli(self.paths[0], '--distinct', '--save_sketch', self.sketch))
+        self.assertIn("Distinct words: ~3 ", run_cli(self.paths[1], '--distinct', '--merge_sketch', self.sketch))
+        self.assertIn("Distinct values matching t(\\w): ~2 ", run_cli(self.paths[0], '--distinct', '--pattern', r't(\w)'))
+
+class TestHyperLogLog(unittest.TestCase):
+    """Test the estimate is within four standard errors of the distinct count"""
+    def test_count(self):
+        for distinct in (10, 1000, 50000):
+            sketch = HyperLogLog(12)
+            sketch.update(f"user{i}" for i in range(distinct))
+            sketch.update(f"user{i}" for i in range(distinct))  # Repeats change nothing
+            self.assertLessEqual(abs(sketch.count() - distinct), 4 * sketch.relative_error() * distinct + 1)
+
+    """Test merging equals adding both streams to one sketch"""
+    def test_merge(self):
+        left, right, both = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+        left.update(f"a{i}" for i in range(3000))
+        right.update(f"b{i}" for i in range(2000))
+        both.update(f"a{i}" for i in range(3000))
+        both.update(f"b{i}" for i in range(2000))
+        left.merge(right)
+        self.assertEqual(left.registers, both.registers)
+        with self.assertRaises(ValueError):
+            left.merge(HyperLogLog(11))
+
+    """Test registers survive a round trip through to_dict"""
+    def test_round_trip(self):
+        sketch = HyperLogLog(6)
+        sketch.update(map(str, range(100)))
+        self.assertEqual(HyperLogLog.from_dict(sketch.to_dict()).registers, sketch.registers)
+        with self.assertRaises(ValueError):
+            HyperLogLog(3)
+        with self.assertRaises(ValueError):
+            HyperLogLog.from_dict(SpaceSaving(5).to_dict())
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
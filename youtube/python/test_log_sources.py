@@ -0,0 +1,90 @@
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from log_analyzer.parser import LogParser
+from log_analyzer.counter import WordCounter
+from log_analyzer.processor import LogProcessor
+from log_analyzer import sources # Import the multi-file sources to test
+
+TEXT = ("2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query timeout for user_1 Straße\n"
+        "\tat com.example.Db.query(Db.java:42) STRASSE straße naïve café_au_lait\n"
+        "2025-07-30 21:00:01,000 INFO [worker-2] com.example.App - Retry #2 of query-timeout, TIMEOUT x2\n")
+
+def rotated(text, hour):
+    """The same lines an hour apart, as an older rotated file would hold"""
+    return text.replace('2025-07-30 21:', f"2025-07-30 {hour:02d}:")
+
+class TestSources(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            for i in range(300):
+                file.write(TEXT.replace('user_1', f"user_{i % 11}"))
+        # Rotated files, compressed, the oldest with the highest number
+        with gzip.open(self.path + '.1.gz', 'wt', encoding='utf-8') as file:
+            file.write(rotated(TEXT, 20) * 5)
+        with bz2.open(self.path + '.2.bz2', 'wt', encoding='utf-8') as file:
+            file.write(rotated(TEXT, 19) * 3)
+        with lzma.open(self.path + '.3.xz', 'wt', encoding='utf-8') as file:
+            file.write("no entries here\n")
+        open(self.path + '.idx', 'wb').close()
+        self.paths = sources.expand_paths(os.path.join(self.directory, 'app.log*'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def all_lines(self, paths):
+        return [line for path in paths for line in LogParser.iter_lines(path)]
+
+    """Test globs and directories expand to sorted log files, leaving out index sidecars"""
+    def test_expand_paths(self):
+        expected = [self.path + suffix for suffix in ('', '.1.gz', '.2.bz2', '.3.xz')]
+        self.assertEqual(self.paths, expected)
+        self.assertEqual(sources.expand_paths(self.directory), expected)
+        self.assertEqual(sources.expand_paths(self.path), [self.path])
+        with self.assertRaises(ValueError):
+            sources.expand_paths(os.path.join(self.directory, '*.missing'))
+
+    """Test compressed files are read by their magic bytes and ordered by first entry"""
+    def test_order_by_time(self):
+        self.assertEqual(sources.first_timestamp(self.path + '.2.bz2'), '2025-07-30 19:00:00,000')
+        self.assertIsNone(sources.first_timestamp(self.path + '.3.xz'))
+        self.assertEqual(sources.order_by_time(self.paths),
+                         [self.path + '.2.bz2', self.path + '.1.gz', self.path, self.path + '.3.xz'])
+
+    """Test per-file worker processes equal counting the files one after another"""
+    def test_file_workers(self):
+        lines = self.all_lines(self.paths)
+        words = ['query', 'STRASSE', 'timeout', 'user_3']
+        for workers in (1, 2):
+            self.assertEqual(sources.count_words(self.paths, workers), WordCounter(lines).count_words())
+            self.assertEqual(sources.search_specific_words(self.paths, words, 'ERROR', workers),
+                             WordCounter(lines).search_specific_words(words, 'ERROR'))
+            self.assertEqual(sources.search_specific_words(self.paths, words, None, workers),
+                             WordCounter(lines).search_specific_words(words))
+
+    """Test one table per file, in the order of the paths"""
+    def test_iter_log_tables(self):
+        tables = list(sources.iter_log_tables(self.paths, 'ERROR', 2))
+        self.assertEqual([len(table) for table in tables], [300, 5, 3, 0])
+        self.assertEqual(list(tables[1]), list(LogProcessor(LogParser.iter_lines(self.paths[1])).get_log_table('ERROR')))
+
+    """Test a glob on the command line lists entries chronologically with --ordered"""
+    def test_cli_ordered(self):
+        output = subprocess.run([sys.executable, '-m', 'log_analyzer', os.path.join(self.directory, 'app.log*'),
+                                 '--level_log', 'ERROR', '--ordered', '--workers', '2', '--no-cache'],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        timestamps = [line.split(' : ')[0] for line in output.splitlines() if ' : ' in line]
+        self.assertEqual(len(timestamps), 308)
+        self.assertEqual(timestamps, sorted(timestamps))
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from log_analyzer.parser import LogEntry, LogParser
+from log_analyzer.processor import LogProcessor
+from log_analyzer.table import LogTable, timestamp_to_ms, ms_to_timestamp # Import the columnar table to test
+
+LINES = ["2025-07-30 21:00:00,001 INFO [main] com.example.App - started\n",
+         "2025-07-30 21:00:00,250 ERROR [worker-1] com.example.Db - failed\n",
+         "java.lang.Exception: boom\n",
+         "2024-02-29 23:59:59,999 WARN message without thread or logger\n",
+         "2025-07-30 21:00:01,000 ERROR [worker-1] com.example.Db - failed again\n"]
+
+class TestLogTable(unittest.TestCase):
+    """Test timestamps round-trip through epoch milliseconds"""
+    def test_timestamps(self):
+        for timestamp in ('1970-01-01 00:00:00,000', '2024-02-29 23:59:59,999', '2025-07-30 21:00:00,250'):
+            self.assertEqual(ms_to_timestamp(timestamp_to_ms(timestamp)), timestamp)
+        self.assertEqual(timestamp_to_ms('1970-01-02 00:00:01,002'), 86401002)
+
+    """Test rows read back as the entries appended"""
+    def test_rows(self):
+        table = LogTable()
+        entries = [LogParser.parse_log_record(line) for line in LINES if LogParser.parse_log_entry(line)]
+        for entry in entries:
+            table.append(LogEntry(entry.timestamp, entry.loglevel, entry.thread, entry.logger))
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table), [LogEntry(e.timestamp, e.loglevel, e.thread, e.logger) for e in entries])
+        self.assertEqual(table.row(2), LogEntry('2024-02-29 23:59:59,999', 'WARN'))
+        # Repeated names share one interned id
+        self.assertEqual(table.threads[1], table.threads[3])
+        self.assertEqual(table.names, [None, 'main', 'com.example.App', 'worker-1', 'com.example.Db'])
+        self.assertEqual(table.level_counts(), {'INFO': 1, 'ERROR': 2, 'WARN': 1})
+
+    """Test the processor collects one level's entries into a table"""
+    def test_get_log_table(self):
+        table = LogProcessor(iter(LINES)).get_log_table('error')
+        self.assertEqual([entry.timestamp for entry in table], ['2025-07-30 21:00:00,250', '2025-07-30 21:00:01,000'])
+        self.assertEqual(len(LogProcessor(iter(LINES)).get_log_table()), 4)
+
+    """Test more than 256 levels raise ValueError"""
+    def test_level_limit(self):
+        table = LogTable()
+        for i in range(256):
+            table.append(LogEntry('2025-07-30 21:00:00,000', f"L{i}"))
+        with self.assertRaises(ValueError):
+            table.append(LogEntry('2025-07-30 21:00:00,000', 'ONE_MORE'))
+
+    """Test the NumPy view shares the columns"""
+    def test_to_numpy(self):
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("NumPy is not installed")
+        table = LogProcessor(iter(LINES)).get_log_table()
+        columns = table.to_numpy()
+        self.assertEqual(columns['timestamps'].tolist(), table.timestamps.tolist())
+        self.assertEqual(columns['levels'].tolist(), [0, 1, 2, 1])
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from log_analyzer.filters import compile_filter
+from log_analyzer.templates import WILDCARD, TemplateMiner # Import the template miner to test
+
+LINES = ["2025-07-30 21:00:03,000 ERROR [main] com.example.Db - Failed to process record ID: 11. Reason: timeout 30s\n",
+         "java.lang.Exception: boom\n",
+         "2025-07-30 21:00:04,000 ERROR [main] com.example.Db - Failed to process record ID: 12. Reason: timeout 31s\n",
+         "2025-07-30 21:00:05,000 WARN [main] com.example.Db - Failed to process record ID: 13. Reason: refused 5s\n",
+         "2025-07-30 21:00:06,000 INFO [main] com.example.App - Connected to db-1 in 12ms\n"]
+
+class TestTemplateMiner(unittest.TestCase):
+    """Test tokens with digits are variables and differing tokens become wildcards"""
+    def test_templates(self):
+        miner = TemplateMiner()
+        first = miner.add("Connected to db-1 in 12ms", 'INFO')
+        self.assertEqual(first.pattern(), "Connected to <*> in <*>")
+        self.assertIs(miner.add("Connected to db-2 in 7ms", 'INFO'), first)
+        cluster = miner.add("Session opened for alice", 'INFO')
+        self.assertIs(miner.add("Session opened for bob", 'WARN'), cluster)
+        self.assertEqual(cluster.template, ['Session', 'opened', 'for', WILDCARD])
+        self.assertEqual(cluster.level_counts, {'INFO': 1, 'WARN': 1})
+        self.assertEqual(miner.levels(), ['INFO', 'WARN'])
+        with self.assertRaises(ValueError):
+            TemplateMiner(depth=2)
+
+    """Test examples line up with wildcards that appear after their message was added"""
+    def test_examples_follow_final_template(self):
+        miner = TemplateMiner()
+        miner.add("Failed to process record ID: 11. Reason: timeout 30s")
+        miner.add("Failed to process record ID: 12. Reason: timeout 31s")
+        cluster = miner.add("Failed to process record ID: 13. Reason: refused 5s")
+        self.assertEqual(cluster.pattern(), "Failed to process record ID: <*> Reason: <*> <*>")
+        self.assertEqual(cluster.examples(), [['11.', 'timeout', '30s'], ['12.', 'timeout', '31s'],
+                                              ['13.', 'refused', '5s']])
+
+    """Test examples keep distinct messages only, up to max_examples"""
+    def test_examples_bounded(self):
+        miner = TemplateMiner(max_examples=2)
+        for user in ('alice', 'alice', 'bob', 'carol', 'dave'):
+            cluster = miner.add(f"Session opened for {user}")
+        self.assertEqual(cluster.count, 5)
+        self.assertEqual(cluster.samples, [['Session', 'opened', 'for', 'alice'], ['Session', 'opened', 'for', 'bob']])
+        self.assertEqual(cluster.examples(), [['alice'], ['bob']])
+        # Messages that never differ have no variables to show
+        self.assertEqual(miner.add("Shutting down now").examples(), [])
+
+    """Test mining log lines, all levels, one level or a filter over whole records"""
+    def test_add_lines(self):
+        miner = TemplateMiner().add_lines(iter(LINES))
+        self.assertEqual([(cluster.count, cluster.pattern()) for cluster in miner.top_templates(5)],
+                         [(3, "Failed to process record ID: <*> Reason: <*> <*>"), (1, "Connected to <*> in <*>")])
+        self.assertEqual([cluster.level_counts['ERROR'] for cluster in miner.top_templates(5, 'error')], [2])
+        self.assertEqual(TemplateMiner().add_lines(iter(LINES), 'warn').clusters[0].level_counts, {'WARN': 1})
+        # A filter sees the stack trace joined to its entry
+        miner = TemplateMiner().add_lines(iter(LINES), compile_filter('msg ~ "boom"'))
+        self.assertEqual([cluster.examples() for cluster in miner.clusters], [[['11.', '30s']]])
+
+    """Test the CLI prints templates per level with their examples"""
+    def test_cli(self):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.log', delete=False) as tmp:
+            tmp.writelines(LINES)
+        try:
+            output = subprocess.run([sys.executable, '-m', 'log_analyzer', tmp.name, '2', '--templates',
+                                     '--level_log', 'ERROR', '--no-cache'], capture_output=True, text=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        finally:
+            os.unlink(tmp.name)
+        self.assertEqual(output.splitlines(), ["Top templates for ERROR:",
+                                               "2 : Failed to process record ID: <*> Reason: timeout <*>",
+                                               "    e.g. 11. 30s | 12. 31s"])
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from log_analyzer.timerange import find_window, normalize_bound # Import the time window search to test
+
+ENTRIES = [("2025-07-30 21:14:59,999", "INFO"), ("2025-07-30 21:15:00,000", "ERROR"),
+           ("2025-07-30 21:15:00,000", "INFO"), ("2025-07-30 21:20:30,500", "ERROR"),
+           ("2025-07-30 21:20:59,999", "WARN"), ("2025-07-30 21:21:00,000", "ERROR")]
+TRACE = "java.lang.RuntimeException: boom\n\tat com.example.App.run(App.java:7)\n"
+
+def run_cli(*args):
+    """Run python -m log_analyzer without the result cache and return its output"""
+    return subprocess.run([sys.executable, '-m', 'log_analyzer', *args, '--no-cache'], capture_output=True,
+                          text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+
+class TestTimeWindow(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        self.offsets = []
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write("startup banner\n")
+            for timestamp, level in ENTRIES:
+                self.offsets.append(file.tell())
+                file.write(f"{timestamp} {level} [main] com.example.App - request\n")
+                if level == 'ERROR':
+                    file.write(TRACE)
+            self.size = file.tell()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test bounds are normalized to timestamp prefixes"""
+    def test_normalize_bound(self):
+        self.assertEqual(normalize_bound('2025-07-30T21:15', self.path), '2025-07-30 21:15')
+        self.assertEqual(normalize_bound('21:15:00.000', self.path), '2025-07-30 21:15:00,000')
+        self.assertEqual(normalize_bound('2025-07-30', self.path), '2025-07-30')
+        for value in ('21', 'yesterday', '2025-07-30 21:15:00,0000'):
+            with self.assertRaises(ValueError):
+                normalize_bound(value, self.path)
+
+    """Test since is inclusive, and until includes everything it prefixes"""
+    def test_find_window(self):
+        self.assertEqual(find_window(self.path, '2025-07-30 21:15'), (self.offsets[1], self.size))
+        self.assertEqual(find_window(self.path, None, '2025-07-30 21:20'), (0, self.offsets[5]))
+        self.assertEqual(find_window(self.path, '2025-07-30 21:15:00,000', '2025-07-30 21:15:00,000'),
+                         (self.offsets[1], self.offsets[3]))
+        self.assertEqual(find_window(self.path, '2025-07-30 21:20:30', None), (self.offsets[3], self.size))
+
+    """Test windows outside the log are empty"""
+    def test_empty_window(self):
+        start, end = find_window(self.path, '2025-07-31')
+        self.assertEqual(start, end)
+        # Only the lines before the first entry come before any bound
+        self.assertEqual(find_window(self.path, None, '2025-07-29'), (0, self.offsets[0]))
+        start, end = find_window(self.path, '2025-07-30 21:16', '2025-07-30 21:17')
+        self.assertEqual(start, end)
+
+    """Test the time window applies wherever it appears on the command line"""
+    def test_cli_argument_order(self):
+        expected = run_cli(self.path, '--level_log', 'ERROR', '--since', '21:15', '--until', '21:20')
+        self.assertEqual(expected.count(': ERROR'), 2)
+        self.assertEqual(run_cli(self.path, '--since', '21:15', '--until', '21:20', '--level_log', 'ERROR'), expected)
+        search = run_cli(self.path, '--since', '21:20:30', '--search', 'boom', 'request', '--level_log', 'ERROR')
+        self.assertEqual(search, "boom : 2\nrequest : 2\n")
+
+    """Test options that do not apply to a search are reported, not searched for"""
+    def test_search_rejects_options(self):
+        self.assertIn("--workers is not supported with --search",
+                      run_cli(self.path, '--search', 'boom', '--workers', '2'))
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
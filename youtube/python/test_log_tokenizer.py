@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from log_analyzer.parser import LogParser
+from log_analyzer.tokenizer import iter_blocks, count_block, count_words_mmap # Import the mmap tokenizer to test
+from log_analyzer.tokenizer import TermMatcher, FIND_TERMS # Import the term matcher to test
+
+TEXT = ("2025-07-30 21:00:00,000 ERROR [main] com.example.Db - Query timeout for user_1 Straße\n"
+        "\tat com.example.Db.query(Db.java:42) STRASSE straße naïve café_au_lait\n"
+        "2025-07-30 21:00:01,000 INFO [worker-2] com.example.App - Retry #2 of query-timeout, TIMEOUT x2\n")
+
+class TestMmapTokenizer(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write(TEXT * 500)
+        with open(self.path, 'rb') as file:
+            self.data = file.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    """Test blocks end on newlines and together equal the file"""
+    def test_iter_blocks(self):
+        for block_size in (1, 64, 4096, 1 << 20):
+            blocks = list(iter_blocks(self.path, block_size=block_size))
+            self.assertEqual(b''.join(blocks), self.data)
+            self.assertTrue(all(block.endswith(b'\n') for block in blocks))
+
+    """Test byte ranges past the first pages, which are released as they are consumed"""
+    def test_iter_blocks_range(self):
+        start = self.data.index(b'\n', 10000) + 1
+        end = self.data.index(b'\n', 50000) + 1
+        self.assertEqual(b''.join(iter_blocks(self.path, start, end, block_size=5000)), self.data[start:end])
+        self.assertEqual(list(iter_blocks(self.path, end, start)), [])
+
+    """Test a line longer than the block size stays whole"""
+    def test_long_line(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('x' * 10000 + '\nshort\n')
+        self.assertEqual(list(iter_blocks(self.path, block_size=100)), [b'x' * 10000 + b'\n', b'short\n'])
+
+    """Test bytes counts equal the regex tokenizer on ASCII and non-ASCII text"""
+    def test_counts(self):
+        expected = Counter(LogParser.extract_words(TEXT * 500))
+        self.assertEqual(count_words_mmap(self.path), expected)
+        self.assertEqual(count_block(b'Hello HELLO x_1 x-1\n', Counter()), Counter({'hello': 2, 'x_1': 1, 'x': 1, '1': 1}))
+
+class TestTermMatcher(unittest.TestCase):
+    def expected(self, text, terms):
+        words = Counter(LogParser.extract_words(text))
+        return Counter({term.lower(): words[term.lower()] for term in terms if words[term.lower()]})
+
+    """Test str and bytes counts equal those of extract_words"""
+    def test_matches_extract_words(self):
+        terms = ['query', 'TIMEOUT', 'straße', 'user_1', 'db', 'x2', 'café', 'café_au_lait', 'query-timeout', 'missing']
+        matcher = TermMatcher(terms)
+        expected = self.expected(TEXT, terms)
+        self.assertEqual(matcher.count(TEXT, Counter()), expected)
+        self.assertEqual(matcher.count(TEXT.encode('utf-8'), Counter()), expected)
+        ascii_text = TEXT.encode('ascii', errors='ignore')
+        self.assertEqual(matcher.count(ascii_text, Counter()), self.expected(ascii_text.decode('ascii'), terms))
+
+    """Test the single regex used past FIND_TERMS terms counts the same"""
+    def test_many_terms(self):
+        terms = [f"user_{i}" for i in range(FIND_TERMS)] + ['query', 'timeout', 'straße', 'com']
+        text = ''.join(TEXT.replace('user_1', f"user_{i}") for i in range(FIND_TERMS + 3))
+        matcher = TermMatcher(terms)
+        expected = self.expected(text, terms)
+        self.assertEqual(matcher.count(text, Counter()), expected)
+        self.assertEqual(matcher.count(text.encode('utf-8'), Counter()), expected)
+        ascii_text = text.encode('ascii', errors='ignore')
+        self.assertEqual(matcher.count(ascii_text, Counter()), self.expected(ascii_text.decode('ascii'), terms))
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
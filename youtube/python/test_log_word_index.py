@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from log_analyzer.parser import LogParser
+from log_analyzer.counter import WordCounter
+from log_analyzer.word_index import WordIndex, encode_varint, decode_deltas # Import the .widx index to test
+
+LEVELS = ['INFO', 'DEBUG', 'ERROR', 'WARN']
+
+def write_log(path, entries, first=0):
+    """Write entries one second apart, every ERROR followed by a two-line stack trace"""
+    with open(path, 'a', encoding='utf-8') as file:
+        for i in range(first, first + entries):
+            level = LEVELS[i % len(LEVELS)]
+            hours, rest = divmod(i, 3600)
+            file.write(f"2025-07-30 {hours:02d}:{rest // 60:02d}:{rest % 60:02d},000 {level} [worker-{i % 3}] "
+                       f"com.example.Service - Handled request {i} for user{i % 7}\n")
+            if level == 'ERROR':
+                file.write(f"java.lang.RuntimeException: request {i} failed\n\tat com.example.Service.handle\n")
+
+class TestWordIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'app.log')
+        write_log(self.path, 500)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def scan(self, words, log_level=None):
+        return WordCounter(LogParser.iter_lines(self.path)).search_specific_words(words, log_level)
+
+    """Test varints round-trip through delta decoding"""
+    def test_varints(self):
+        values = [0, 1, 127, 128, 300, 16384, 2 ** 40]
+        data = bytearray()
+        previous = 0
+        for value in values:
+            encode_varint(value - previous, data)
+            previous = value
+        self.assertEqual(decode_deltas(data), values)
+
+    """Test searches answered from the index equal a full scan, stack traces included"""
+    def test_search(self):
+        words = ['user3', 'request', 'RuntimeException', 'handle', 'missing']
+        index = WordIndex.open(self.path)
+        self.assertEqual(index.search_specific_words(self.path, words), self.scan(words))
+        for level in ('ERROR', 'info'):
+            self.assertEqual(index.search_specific_words(self.path, words, level), self.scan(words, level))
+
+    """Test appended lines are indexed on the next open, also when loaded from disk"""
+    def test_append(self):
+        words = ['user5', 'failed']
+        WordIndex.open(self.path)
+        write_log(self.path, 40, first=500)
+        self.assertEqual(WordIndex.open(self.path).search_specific_words(self.path, words, 'ERROR'),
+                         self.scan(words, 'ERROR'))
+        loaded = WordIndex.load(WordIndex.index_path(self.path))
+        self.assertEqual(loaded.search_specific_words(self.path, words), self.scan(words))
+
+    """Test unindexed lines continuing the last indexed record keep the level of its entry"""
+    def test_tail_continues_record(self):
+        words = ['failed', 'handle', 'frame', 'user1', 'partial']
+        WordIndex.open(self.path)
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write("\tat com.example.Service.frame one\n\tat com.example.Service.frame two\n")
+        loaded = WordIndex.load(WordIndex.index_path(self.path))
+        write_log(self.path, 3, first=501)
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write("\tat partial frame")
+        for level in (None, 'WARN', 'ERROR'):
+            self.assertEqual(loaded.search_specific_words(self.path, words, level), self.scan(words, level))
+            self.assertEqual(WordIndex.open(self.path).search_specific_words(self.path, words, level),
+                             self.scan(words, level))
+
+# Driver code
+if __name__ == '__main__':
+    unittest.main()
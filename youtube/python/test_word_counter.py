@@ -1,7 +1,9 @@
 import unittest
 from unittest.mock import patch, mock_open
 import io
+import os
 import sys
+import tempfile
 from word_counter import count_words # Import the function to test
 
 class TestCountWords(unittest.TestCase):
@@ -31,6 +33,26 @@ class TestCountWords(unittest.TestCase):
                 output = fake_out.getvalue().strip()
                 self.assertEqual(output, "Yo, we got an error: No such file")
 
+    """Test the mmap backend gives the same result as the regex backend"""
+    def test_mmap_backend(self):
+        mock_text = "Hello hello WORLD word word count from command and code\nStraße STRASSE straße\n"
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt', delete=False) as tmp:
+            tmp.write(mock_text)
+        try:
+            expected = count_words(tmp.name, 5)
+            self.assertEqual(count_words(tmp.name, 5, backend='mmap'), expected)
+            self.assertEqual(expected[0], ('hello', 2))
+        finally:
+            os.unlink(tmp.name)
+
+    """Test importing word_counter leaves the log_analyzer package unloaded"""
+    def test_lazy_tokenizer_import(self):
+        import subprocess
+        code = "import sys, word_counter; print('log_analyzer' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        self.assertEqual(output.strip(), 'False')
+
 # Driver code
 if __name__ == '__main__':
     unittest.main()
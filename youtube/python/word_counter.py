@@ -2,9 +2,13 @@ import re
 import sys
 from collections import Counter
 
-def count_words(file_path, top_n_input=''):
+def count_words(file_path, top_n_input='', backend='regex'):
     try:
         top_n = int(top_n_input) if top_n_input else 5
+        if backend == 'mmap':
+            # Tokenize the memory-mapped bytes, decoding only distinct words
+            from log_analyzer.tokenizer import count_words_mmap
+            return count_words_mmap(file_path).most_common(top_n)
         with open(file_path, 'r', encoding='utf-8') as file:
             text = file.read().lower()
             words = re.findall(r'\b\w+\b', text)